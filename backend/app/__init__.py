@@ -11,6 +11,8 @@ from .config.development import DevConfig
 from .api import register_api
 from .common.errors import register_error_handlers
 from .cli.db_commands import init_db_commands
+from .common.query_instrumentation import init_query_instrumentation
+from .common.cache import init_cache, get_cache
 import os
 
 
@@ -51,6 +53,8 @@ def create_app(config_object=DevConfig) -> Flask:
     bcrypt.init_app(app)
     mail.init_app(app)
     limiter.init_app(app)
+    init_query_instrumentation(app)
+    init_cache(app)
     # Enable/disable rate limiting
     # - In tests: enable if explicitly turned on OR a default is provided by the test
     # - Otherwise: follow RATELIMIT_ENABLED
@@ -107,29 +111,46 @@ def create_app(config_object=DevConfig) -> Flask:
         if not user_id or not token_iat or not jti:
             return True
         try:
-            # Check per-token revocation
+            # Check per-token revocation; never cached, so a logout holds on every worker at once
             revoked = db.session.get(RevokedToken, jti)
-            if revoked:
+            if revoked and revoked.is_expired():
                 # Opportunistic cleanup if expired
-                if revoked.is_expired():
-                    db.session.delete(revoked)
-                    db.session.commit()
-                else:
-                    return True
-            user = db.session.execute(select(User).where(User.id == int(user_id))).scalar_one_or_none()
-            if user is None:
+                db.session.delete(revoked)
+                db.session.commit()
+                revoked = None
+            if revoked is not None:
+                return True
+
+            def load_user():
+                row = db.session.execute(
+                    select(User.id, User.last_logout_at).where(User.id == int(user_id))
+                ).one_or_none()
+                if row is None:
+                    return {"exists": False, "last_logout_ts": None}
+                if row.last_logout_at is None:
+                    return {"exists": True, "last_logout_ts": None}
+                # Compare integer seconds to avoid microsecond mismatches
+                from datetime import timezone
+                last_dt = row.last_logout_at
+                if last_dt.tzinfo is None:
+                    last_dt = last_dt.replace(tzinfo=timezone.utc)
+                return {"exists": True, "last_logout_ts": int(last_dt.timestamp())}
+
+            # The user lookup runs on every authenticated request. It is cached only where
+            # all workers share the cache; a per-worker copy would outlive changes made elsewhere
+            cache = get_cache()
+            if cache.backend.shared:
+                state = cache.get_or_set(f"auth:user:{int(user_id)}", load_user,
+                                         ttl=app.config.get('AUTH_CACHE_TTL_SECONDS', 30))
+            else:
+                state = load_user()
+            if not state["exists"]:
                 return True
-            if user.last_logout_at is None:
+            if state["last_logout_ts"] is None:
                 return False
-            # Compare integer seconds to avoid microsecond mismatches
-            from datetime import timezone
-            last_dt = user.last_logout_at
-            if last_dt.tzinfo is None:
-                last_dt = last_dt.replace(tzinfo=timezone.utc)
-            last_ts = int(last_dt.timestamp())
             token_ts = int(float(token_iat))
             # Invalidate tokens issued strictly before last logout
-            return token_ts < last_ts
+            return token_ts < state["last_logout_ts"]
         except Exception:
             return True
 
@@ -180,7 +201,6 @@ def create_app(config_object=DevConfig) -> Flask:
         admin_password = os.getenv("ADMIN_PASSWORD")
         admin_username = os.getenv("ADMIN_USERNAME", "admin")
         if admin_email and admin_password:
-            from .models.user import User
             from .models.user_role import UserRole
             from .common.security import hash_password
             with app.app_context():
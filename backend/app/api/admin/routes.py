@@ -1,4 +1,4 @@
-from flask import request, jsonify
+from flask import request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from . import admin_bp
 from ...services.recruiter_request_service import RecruiterRequestService
@@ -10,8 +10,9 @@ from ...extensions import db
 from sqlalchemy import select, func
 from ...models.user_role import UserRole
 from ...models.user import User
-from ...models.job import Job
+from ...models.job import Job, JOB_STATUS_ACTIVE
 from hashlib import sha1
+from ...common.cache import get_cache
 from datetime import datetime, UTC
 
 # Initialize schemas
@@ -110,19 +111,14 @@ def cleanup_completed_requests():
     }), 200
 
 
-@admin_bp.get('/metrics')
-@jwt_required()
-@admin_required
-def metrics():
-    """Admin metrics for dashboard (no hardcoding)."""
+def _compute_metrics():
     # Counts
     total_users = db.session.execute(select(func.count(User.id))).scalar() or 0
     total_recruiters = db.session.execute(
         select(func.count(UserRole.id)).where(UserRole.role == 'recruiter')
     ).scalar() or 0
-    today = datetime.now(UTC).date()
     active_jobs = db.session.execute(
-        select(func.count(Job.id)).where((Job.application_deadline == None) | (Job.application_deadline >= today))  # noqa: E711
+        select(func.count(Job.id)).where(Job.status == JOB_STATUS_ACTIVE, Job.deleted_at.is_(None))
     ).scalar() or 0
 
     # Pending recruiter requests (if model/table exists)
@@ -135,13 +131,27 @@ def metrics():
     except Exception:
         pass
 
-    payload = {
+    return {
         'pending_recruiter_requests': pending_requests,
         'total_users': total_users,
         'total_recruiters': total_recruiters,
         'active_jobs': active_jobs,
     }
 
+
+@admin_bp.get('/metrics')
+@jwt_required()
+@admin_required
+def metrics():
+    """Admin metrics for dashboard (no hardcoding)."""
+    payload = get_cache().get_or_set(
+        'admin:metrics', _compute_metrics, ttl=current_app.config.get('ADMIN_METRICS_CACHE_TTL', 30)
+    )
+    pending_requests = payload['pending_recruiter_requests']
+    total_users = payload['total_users']
+    total_recruiters = payload['total_recruiters']
+    active_jobs = payload['active_jobs']
+
     # Simple ETag based on payload values for efficient frontend caching
     etag_seed = f"{pending_requests}:{total_users}:{total_recruiters}:{active_jobs}".encode()
     etag = 'W/"' + sha1(etag_seed).hexdigest() + '"'
@@ -308,4 +318,56 @@ def update_user_detail(user_id):
     if not updated:
         return jsonify(msg='no changes'), 200
     db.session.commit()
-    return jsonify(msg='user updated'), 200
\ No newline at end of file
+    return jsonify(msg='user updated'), 200
+
+@admin_bp.get('/cache')
+@jwt_required()
+@admin_required
+def cache_stats():
+    """Hit/miss counters of this worker's cache, per key namespace"""
+    cache = get_cache()
+    return jsonify(backend=cache.backend.name, namespaces=cache.stats()), 200
+
+
+@admin_bp.get('/storage')
+@jwt_required()
+@admin_required
+def storage_stats():
+    """Document storage usage from the storage ledger"""
+    from ...services.file_cleanup_service import FileCleanupService
+    return jsonify(FileCleanupService().get_storage_stats()), 200
+
+
+@admin_bp.post('/storage/reconcile')
+@jwt_required()
+@admin_required
+def reconcile_storage():
+    """Rebuild the storage ledger from disk in the background"""
+    from ...common.background import run_in_background
+    from ...services.storage_ledger_service import StorageLedger
+    run_in_background(StorageLedger().reconcile)
+    return jsonify(msg='storage reconciliation started'), 202
+
+
+@admin_bp.get('/storage/top-consumers')
+@jwt_required()
+@admin_required
+def storage_top_consumers():
+    """Users or jobs using the most document storage"""
+    from ...services.storage_ledger_service import StorageLedger, SCOPE_USER, SCOPE_JOB
+    scope = request.args.get('scope', SCOPE_USER)
+    if scope not in (SCOPE_USER, SCOPE_JOB):
+        return jsonify(error="scope must be 'user' or 'job'"), 400
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+
+    consumers = StorageLedger().top_consumers(scope, limit)
+    ids = [c['id'] for c in consumers]
+    if scope == SCOPE_USER:
+        names = dict(db.session.execute(select(User.id, User.username).where(User.id.in_(ids))).all())
+        for c in consumers:
+            c['username'] = names.get(c['id'])
+    else:
+        titles = dict(db.session.execute(select(Job.id, Job.title).where(Job.id.in_(ids))).all())
+        for c in consumers:
+            c['title'] = titles.get(c['id'])
+    return jsonify(scope=scope, consumers=consumers), 200
@@ -4,7 +4,8 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from marshmallow import ValidationError
 from ...services.application_service import ApplicationService
-from ...common.exceptions import BusinessLogicError, ConflictError, AuthorizationError
+from ...services.storage_ledger_service import StorageLedger
+from ...common.exceptions import BusinessLogicError, ConflictError, AuthorizationError, QuotaExceededError
 from ...common.security_utils import (
     validate_and_process_upload, 
     cleanup_temp_file, 
@@ -16,6 +17,7 @@ from ...extensions import db, limiter
 from ...schemas.application_schema import (
     ApplicationSubmitSchema,
     ApplicationListSchema,
+    JobApplicationListSchema,
     ApplicationUpdateSchema
 )
 from marshmallow import ValidationError as MarshmallowValidationError
@@ -30,9 +32,20 @@ application_bp = Blueprint('applications', __name__)
 # Initialize schemas
 _submit_schema = ApplicationSubmitSchema()
 _list_schema = ApplicationListSchema()
+_job_list_schema = JobApplicationListSchema()
 _update_schema = ApplicationUpdateSchema()
 
 
+def _upload_size(file) -> int:
+    """Size of an uploaded file without reading it (werkzeug has already spooled it)"""
+    stream = file.stream
+    position = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(position)
+    return size
+
+
 @application_bp.post("/jobs/<int:job_id>/apply")
 @jwt_required()
 @limiter.limit("5 per hour")  # Rate limit job applications
@@ -140,6 +153,14 @@ def apply_for_job(job_id):
         if not cover_letter_file or not cover_letter_file.filename:
             return jsonify(error="Cover letter is required"), 400
         
+        # Enforce storage quotas before any bytes are written
+        try:
+            StorageLedger().check_quota(
+                user_id, job_id, _upload_size(resume_file) + _upload_size(cover_letter_file)
+            )
+        except QuotaExceededError as e:
+            return jsonify(error=str(e)), e.status_code
+        
         # Validate and process files
         try:
             # Get allowed file types from config
@@ -181,6 +202,8 @@ def apply_for_job(job_id):
         return jsonify(error=str(e)), 400
     except ConflictError as e:
         return jsonify(error=str(e)), 409
+    except QuotaExceededError as e:
+        return jsonify(error=str(e)), e.status_code
     except BusinessLogicError as e:
         return jsonify(error=str(e)), 400
     except Exception as e:
@@ -235,7 +258,7 @@ def get_job_applications(job_id):
         
         # Validate query parameters
         try:
-            query_params = _list_schema.load(request.args)
+            query_params = _job_list_schema.load(request.args)
         except ValidationError as e:
             return jsonify(error="Invalid query parameters", details=e.messages), 400
         
@@ -244,7 +267,8 @@ def get_job_applications(job_id):
             job_id, 
             user_id, 
             page=query_params['page'], 
-            per_page=query_params['per_page']
+            per_page=query_params['per_page'],
+            order=query_params['order']
         )
         
         return jsonify(result), 200
@@ -295,7 +319,7 @@ def get_application_detail(application_id):
         
         # Check if job exists and user owns it
         job = db.session.execute(
-            select(Job).where(Job.id == application.job_id, Job.user_id == user_id)
+            select(Job).where(Job.id == application.job_id, Job.user_id == user_id, Job.deleted_at.is_(None))
         ).scalar_one_or_none()
         
         if not job:
@@ -384,7 +408,7 @@ def update_application_status(application_id):
         
         # Check if job exists and user owns it
         job = db.session.execute(
-            select(Job).where(Job.id == application.job_id, Job.user_id == user_id)
+            select(Job).where(Job.id == application.job_id, Job.user_id == user_id, Job.deleted_at.is_(None))
         ).scalar_one_or_none()
         
         if not job:
@@ -452,7 +476,7 @@ def download_resume(application_id):
         
         # Check if job exists and user owns it
         job = db.session.execute(
-            select(Job).where(Job.id == application.job_id, Job.user_id == user_id)
+            select(Job).where(Job.id == application.job_id, Job.user_id == user_id, Job.deleted_at.is_(None))
         ).scalar_one_or_none()
         
         if not job:
@@ -520,7 +544,7 @@ def download_cover_letter(application_id):
         
         # Check if job exists and user owns it
         job = db.session.execute(
-            select(Job).where(Job.id == application.job_id, Job.user_id == user_id)
+            select(Job).where(Job.id == application.job_id, Job.user_id == user_id, Job.deleted_at.is_(None))
         ).scalar_one_or_none()
         
         if not job:
@@ -574,7 +598,7 @@ def view_resume_online(application_id):
         
         # Check if job exists and user owns it
         job = db.session.execute(
-            select(Job).where(Job.id == application.job_id, Job.user_id == user_id)
+            select(Job).where(Job.id == application.job_id, Job.user_id == user_id, Job.deleted_at.is_(None))
         ).scalar_one_or_none()
         
         if not job:
@@ -632,7 +656,7 @@ def view_cover_letter_online(application_id):
         
         # Check if job exists and user owns it
         job = db.session.execute(
-            select(Job).where(Job.id == application.job_id, Job.user_id == user_id)
+            select(Job).where(Job.id == application.job_id, Job.user_id == user_id, Job.deleted_at.is_(None))
         ).scalar_one_or_none()
         
         if not job:
@@ -2,6 +2,7 @@ from . import candidate_bp
 from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from ...services.saved_job_service import SavedJobService
+from ...services.job_service import JobService
 
 
 @candidate_bp.get('/saved-jobs')
@@ -10,10 +11,34 @@ def list_saved_jobs():
     user_id = int(get_jwt_identity())
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
-    data = SavedJobService().list(user_id, page=page, per_page=per_page)
+    cursor = request.args.get('cursor')
+    try:
+        data = SavedJobService().list(user_id, page=page, per_page=per_page, cursor=cursor)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify(data), 200
 
 
+# Upper bound on ids per batch status lookup or bulk update
+MAX_STATUS_JOB_IDS = 100
+
+
+@candidate_bp.get('/saved-jobs/status')
+@jwt_required()
+def saved_statuses():
+    """Saved flags for many jobs: ?job_ids=1,2,3 (or repeated job_ids)"""
+    user_id = int(get_jwt_identity())
+    raw = ','.join(request.args.getlist('job_ids'))
+    try:
+        job_ids = list(dict.fromkeys(int(part) for part in raw.split(',') if part.strip()))
+    except ValueError:
+        return jsonify({"error": "job_ids must be a comma-separated list of integers"}), 400
+    if len(job_ids) > MAX_STATUS_JOB_IDS:
+        return jsonify({"error": f"At most {MAX_STATUS_JOB_IDS} job_ids per request"}), 400
+    statuses = SavedJobService().saved_statuses(user_id, job_ids)
+    return jsonify({"saved": {str(job_id): saved for job_id, saved in statuses.items()}}), 200
+
+
 @candidate_bp.get('/saved-jobs/status/<int:job_id>')
 @jwt_required()
 def saved_status(job_id):
@@ -22,6 +47,24 @@ def saved_status(job_id):
     return jsonify({"saved": saved}), 200
 
 
+@candidate_bp.post('/saved-jobs/bulk')
+@jwt_required()
+def bulk_update_saved_jobs():
+    """Save and unsave many jobs at once: {"save": [ids], "unsave": [ids]}"""
+    user_id = int(get_jwt_identity())
+    payload = request.get_json(silent=True) or {}
+    id_lists = {}
+    for key in ('save', 'unsave'):
+        values = payload.get(key) or []
+        if not isinstance(values, list) or not all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+            return jsonify({"error": f"'{key}' must be a list of job ids"}), 400
+        id_lists[key] = list(dict.fromkeys(values))
+    if len(id_lists['save']) + len(id_lists['unsave']) > MAX_STATUS_JOB_IDS:
+        return jsonify({"error": f"At most {MAX_STATUS_JOB_IDS} job ids per request"}), 400
+    result = SavedJobService().bulk_update(user_id, id_lists['save'], id_lists['unsave'])
+    return jsonify({**result, "saved": {str(k): v for k, v in result["saved"].items()}}), 200
+
+
 @candidate_bp.post('/saved-jobs/<int:job_id>')
 @jwt_required()
 def save_job(job_id):
@@ -38,3 +81,18 @@ def unsave_job(job_id):
     return jsonify(result), 200
 
 
+
+
+# Upper bound on recommendations per request
+MAX_RECOMMENDED_JOBS = 50
+
+
+@candidate_bp.get('/recommended-jobs')
+@jwt_required()
+def recommended_jobs():
+    """Active jobs matching the skills on the candidate's past applications, best first"""
+    user_id = int(get_jwt_identity())
+    limit = request.args.get('limit', 10, type=int)
+    if not 1 <= limit <= MAX_RECOMMENDED_JOBS:
+        return jsonify({"error": f"limit must be between 1 and {MAX_RECOMMENDED_JOBS}"}), 400
+    return jsonify(JobService().recommended_jobs(user_id, limit=limit)), 200
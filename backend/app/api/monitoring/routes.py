@@ -4,7 +4,7 @@ Health check and monitoring API endpoints
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
-from app.services.monitoring_service import get_database_health, get_health_summary, db_monitor
+from app.services.monitoring_service import get_database_health, get_health_summary, get_database_activity, db_monitor
 from app.models.user_role import UserRole
 
 monitoring_bp = Blueprint('monitoring', __name__, url_prefix='/monitoring')
@@ -61,12 +61,14 @@ def health_history():
             return jsonify(error="Admin access required"), 403
         
         hours = request.args.get('hours', 24, type=int)
-        history = db_monitor.get_health_history(hours=hours)
+        max_points = request.args.get('max_points', type=int)
+        history = db_monitor.get_health_history(hours=hours, max_points=max_points)
         
         return jsonify({
             'history': history,
             'hours_requested': hours,
-            'total_checks': len(history)
+            'points': len(history),
+            'total_checks': sum(point['total_checks'] for point in history)
         }), 200
         
     except Exception as e:
@@ -93,3 +95,22 @@ def trigger_health_check():
         
     except Exception as e:
         return jsonify(error=str(e)), 500
+
+
+@monitoring_bp.get("/database/activity")
+@jwt_required()
+def database_activity():
+    """Long-running queries, lock chains, bloat and cache hit ratio (requires admin authentication)"""
+    try:
+        # Check if user is admin
+        user_id = int(get_jwt_identity())
+        user_role = UserRole.query.filter_by(user_id=user_id).first()
+        
+        if not user_role or user_role.role != 'admin':
+            return jsonify(error="Admin access required"), 403
+        
+        refresh = request.args.get('refresh', '').lower() in ('1', 'true', 'yes')
+        return jsonify(get_database_activity(refresh=refresh)), 200
+        
+    except Exception as e:
+        return jsonify(error=str(e)), 500
@@ -1,12 +1,14 @@
 from . import recruiter_bp
 from ...extensions import limiter
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from flask import jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
+from flask import current_app, jsonify, request
 from marshmallow import ValidationError
 from ...services.job_service import JobService
 from ...common.exceptions import BusinessLogicError
 from ...schemas.recruiter_schema import RecruiterPostJobSchema
 from ...schemas.recruiter_schema import RecruiterJobUpdateSchema
+from ...schemas.recruiter_schema import PublicJobSearchSchema, SuggestQuerySchema
+from ...services import suggest_service
 
 @recruiter_bp.get("/my-jobs")
 @jwt_required()
@@ -143,19 +145,56 @@ def update_job(job_id):
     return jsonify(result), 200
 
 
+def _optional_user_id():
+    """Caller's user id if a valid access token was sent, else None"""
+    try:
+        verify_jwt_in_request(optional=True)
+    except Exception:
+        # An expired or malformed token shouldn't break a public page
+        return None
+    identity = get_jwt_identity()
+    return int(identity) if identity else None
+
+
 @recruiter_bp.get("/jobs")
 def public_jobs():
-    q = request.args.get('q')
-    page = int((request.args.get('page') or 1))
-    per_page = int((request.args.get('per_page') or 20))
-    data = JobService().search_public_jobs(q, page=page, per_page=per_page)
+    try:
+        args = PublicJobSearchSchema().load(request.args.to_dict())
+    except ValidationError as e:
+        return jsonify(error="Invalid query", details=e.messages), 400
+    # include=saved annotates each job for a signed-in user (ignored for anonymous callers);
+    # include=facets adds per-value counts for the filters
+    includes = set(args.pop('include'))
+    saved_by = _optional_user_id() if 'saved' in includes else None
+    q, page, per_page = args.pop('q'), args.pop('page'), args.pop('per_page')
+    data = JobService().search_public_jobs(
+        q, page=page, per_page=per_page, saved_by=saved_by, filters=args, facets='facets' in includes
+    )
     return jsonify(data), 200
 
 
+@recruiter_bp.get("/jobs/suggest")
+def suggest_jobs():
+    """Typeahead for the search box: titles, skills and locations starting with ``prefix``"""
+    try:
+        args = SuggestQuerySchema().load(request.args.to_dict())
+    except ValidationError as e:
+        return jsonify(error="Invalid query", details=e.messages), 400
+    suggestions = suggest_service.suggest(args['prefix'], limit=args['limit'], kinds=args['kind'])
+    return jsonify(suggestions=suggestions), 200
+
+
 @recruiter_bp.get("/jobs/<int:job_id>")
 def public_job_detail(job_id):
-    data = JobService().get_public_job(job_id)
-    if not data:
+    entry = JobService().get_public_job_entry(job_id)
+    if not entry:
         return jsonify({"error": "not found"}), 404
-    return jsonify(data), 200
+    resp = jsonify(entry["payload"])
+    resp.set_etag(entry["etag"])
+    resp.last_modified = entry["last_modified"]
+    # Shared caches (nginx proxy_cache, CDNs) may keep it briefly; after that they revalidate
+    resp.cache_control.public = True
+    resp.cache_control.max_age = current_app.config.get('JOB_DETAIL_CACHE_MAX_AGE', 60)
+    # Answers If-None-Match / If-Modified-Since with 304 Not Modified
+    return resp.make_conditional(request)
 
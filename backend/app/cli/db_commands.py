@@ -2,10 +2,16 @@
 Flask CLI commands for database management
 """
 from flask.cli import AppGroup
+from app.services.file_cleanup_service import sweep_orphans_command, reconcile_storage_command
+from app.services.job_purge_service import purge_deleted_jobs_command
+from app.services.job_service import transition_job_status_command
+from app.services.skill_index_service import reindex_job_skills_command
 from app.services.backup_service import (
     create_backup_command, 
     restore_backup_command, 
-    list_backups_command
+    list_backups_command,
+    prune_snapshots_command,
+    benchmark_compression_command,
 )
 
 # Create CLI group for backup operations (avoid clashing with Flask-Migrate 'db')
@@ -15,7 +21,22 @@ backup_cli = AppGroup('backup')
 backup_cli.command('create')(create_backup_command())
 backup_cli.command('restore')(restore_backup_command())
 backup_cli.command('list')(list_backups_command())
+backup_cli.command('prune')(prune_snapshots_command())
+backup_cli.command('benchmark')(benchmark_compression_command())
+
+# Maintenance of uploaded documents under static/
+files_cli = AppGroup('files')
+files_cli.command('sweep-orphans')(sweep_orphans_command())
+files_cli.command('reconcile-storage')(reconcile_storage_command())
+
+# Job maintenance
+jobs_cli = AppGroup('jobs')
+jobs_cli.command('purge-deleted')(purge_deleted_jobs_command())
+jobs_cli.command('transition-status')(transition_job_status_command())
+jobs_cli.command('reindex-skills')(reindex_job_skills_command())
 
 def init_db_commands(app):
     """Initialize backup CLI commands and keep Flask-Migrate 'db' group intact"""
     app.cli.add_command(backup_cli)
+    app.cli.add_command(files_cli)
+    app.cli.add_command(jobs_cli)
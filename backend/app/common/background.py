@@ -0,0 +1,41 @@
+"""
+Fire-and-forget background work that needs the application context.
+
+Tasks run on a daemon thread with their own app context and database
+session. When ``BACKGROUND_TASKS_SYNC`` is set (it defaults to the app's
+TESTING flag) they run inline instead, so tests see their effects.
+"""
+import logging
+import threading
+
+from flask import current_app
+
+from ..extensions import db
+
+logger = logging.getLogger(__name__)
+
+
+def run_in_background(func, *args, **kwargs):
+    """Run ``func(*args, **kwargs)`` off the request thread.
+
+    Returns the started thread, or None when the task ran synchronously.
+    Exceptions are logged, never raised to the caller.
+    """
+    app = current_app._get_current_object()
+
+    def runner():
+        with app.app_context():
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                logger.exception(f"Background task {func.__name__} failed")
+            finally:
+                db.session.remove()
+
+    if app.config.get('BACKGROUND_TASKS_SYNC', app.testing):
+        runner()
+        return None
+
+    thread = threading.Thread(target=runner, name=f"bg-{func.__name__}", daemon=True)
+    thread.start()
+    return thread
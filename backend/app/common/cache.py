@@ -0,0 +1,593 @@
+"""
+Shared cache with interchangeable backends.
+
+Services talk to ``Cache``: JSON values under namespaced keys, ``get_or_set``
+with single-flight recomputation, and per-namespace hit/miss counters. The
+storage behind it is picked by ``CACHE_BACKEND``:
+
+- ``memory``: in-process LRU with TTL; every gunicorn worker has its own
+- ``sqlite``: a SQLite file that all workers on one host open
+  (``CACHE_SQLITE_PATH``, default ``instance/cache.sqlite3``)
+- ``redis``: any server speaking the Redis protocol at ``CACHE_REDIS_URL``
+
+Backend errors are logged and treated as misses, so a cache outage makes
+requests slower instead of failing them.
+"""
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from contextlib import contextmanager
+from urllib.parse import unquote, urlparse
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackendError(Exception):
+    """The cache backend could not serve a request"""
+
+
+class CacheBackend:
+    """Byte storage with per-key expiry; ``ttl`` is in seconds, None = no expiry"""
+
+    name = "base"
+    # Whether every worker process sees the same entries
+    shared = True
+
+    def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        raise NotImplementedError
+
+    def add(self, key: str, value: bytes, ttl: float | None = None) -> bool:
+        """Store ``value`` only if ``key`` is absent; True if it was stored"""
+        raise NotImplementedError
+
+    def get_many(self, keys: list[str]) -> list[bytes | None]:
+        return [self.get(key) for key in keys]
+
+    def incr(self, key: str) -> int:
+        """Add one to the integer at ``key`` (0 if absent) and return it"""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Remove every key starting with ``prefix``; returns how many"""
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU; the least recently used key goes once ``max_entries`` is reached"""
+
+    name = "memory"
+    shared = False
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        # key -> (expires_at or None, value), least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _live(self, key: str, now: float):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] is not None and entry[0] <= now:
+            del self._entries[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key, time.monotonic())
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _store(self, key, value, ttl):
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def add(self, key, value, ttl=None):
+        with self._lock:
+            if self._live(key, time.monotonic()) is not None:
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def incr(self, key):
+        with self._lock:
+            entry = self._live(key, time.monotonic())
+            value = int(entry[1]) + 1 if entry else 1
+            # The counter keeps its expiry, like Redis INCR
+            self._entries[key] = (entry[0] if entry else None, str(value).encode())
+            self._entries.move_to_end(key)
+            return value
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+
+class SQLiteBackend(CacheBackend):
+    """Cache table in a SQLite file shared by every process on the host.
+
+    WAL mode lets readers proceed while one worker writes. Expired rows are
+    removed lazily on read and in a sweep every ``PRUNE_EVERY`` writes,
+    which also trims the table back to ``max_entries``.
+    """
+
+    name = "sqlite"
+    PRUNE_EVERY = 256
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections must stay on the thread that opened them
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _execute(self, sql, params=()):
+        try:
+            return self._conn().execute(sql, params)
+        except sqlite3.Error as e:
+            raise CacheBackendError(str(e)) from e
+
+    def get(self, key):
+        row = self._execute("SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] is not None and row[1] <= time.time():
+            self._execute("DELETE FROM cache_entries WHERE key = ? AND expires_at <= ?", (key, time.time()))
+            return None
+        return row[0]
+
+    def _after_write(self):
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY:
+            return
+        self._execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        excess = self._execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0] - self.max_entries
+        if excess > 0:
+            # Oldest inserted first; an approximation of LRU that needs no bookkeeping on reads
+            self._execute(
+                "DELETE FROM cache_entries WHERE rowid IN "
+                "(SELECT rowid FROM cache_entries ORDER BY rowid LIMIT ?)", (excess,)
+            )
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl else None
+        self._execute(
+            "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+            (key, value, expires_at),
+        )
+        self._after_write()
+
+    def add(self, key, value, ttl=None):
+        now = time.time()
+        # Replace an expired row, keep a live one
+        cursor = self._execute(
+            "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+            "WHERE cache_entries.expires_at IS NOT NULL AND cache_entries.expires_at <= ?",
+            (key, value, now + ttl if ttl else None, now),
+        )
+        self._after_write()
+        return cursor.rowcount == 1
+
+    def get_many(self, keys):
+        if not keys:
+            return []
+        rows = self._execute(
+            f"SELECT key, value FROM cache_entries WHERE key IN ({', '.join('?' * len(keys))}) "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            (*keys, time.time()),
+        ).fetchall()
+        found = dict(rows)
+        return [found.get(key) for key in keys]
+
+    def incr(self, key):
+        conn = self._conn()
+        try:
+            # Take the write lock before reading so concurrent increments serialize
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchone()
+            value = int(row[0]) + 1 if row else 1
+            conn.execute(
+                "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, ?, NULL) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, str(value).encode()),
+            )
+            conn.execute("COMMIT")
+            return value
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise CacheBackendError(str(e)) from e
+
+    def delete(self, key):
+        self._execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix):
+        # A range on the primary key instead of LIKE, which would need escaping;
+        # it is exact under SQLite's default BINARY collation
+        return self._execute(
+            "DELETE FROM cache_entries WHERE key >= ? AND key < ?", (prefix, prefix + "\U0010ffff")
+        ).rowcount
+
+
+class RedisBackend(CacheBackend):
+    """Minimal client for the Redis protocol (RESP2); one connection per thread.
+
+    Only GET, MGET, SET, INCR, DEL and SCAN are used, so Redis, Valkey, KeyDB or any
+    other RESP server works, and no client library is needed.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, timeout: float = 1.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            conn = (sock, sock.makefile("rb"))
+            self._local.conn = conn
+            if self.password:
+                auth = (self.username, self.password) if self.username else (self.password,)
+                self._command("AUTH", *auth)
+            if self.db:
+                self._command("SELECT", self.db)
+        return conn
+
+    def _disconnect(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn[1].close()
+                conn[0].close()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    def _read_reply(self, reader):
+        line = reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by cache server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise CacheBackendError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(body)
+            if length < 0:
+                return None
+            return [self._read_reply(reader) for _ in range(length)]
+        raise CacheBackendError(f"Unexpected reply from cache server: {line!r}")
+
+    def _command(self, *args):
+        sock, reader = self._connection()
+        try:
+            sock.sendall(self._encode(args))
+            return self._read_reply(reader)
+        except OSError as e:
+            # A half-read reply leaves the stream unusable
+            self._disconnect()
+            raise CacheBackendError(str(e)) from e
+
+    def get(self, key):
+        return self._command("GET", key)
+
+    def set(self, key, value, ttl=None):
+        if ttl:
+            self._command("SET", key, value, "PX", int(ttl * 1000))
+        else:
+            self._command("SET", key, value)
+
+    def add(self, key, value, ttl=None):
+        args = ["SET", key, value, "NX"]
+        if ttl:
+            args += ["PX", int(ttl * 1000)]
+        return self._command(*args) == "OK"
+
+    def get_many(self, keys):
+        return self._command("MGET", *keys) if keys else []
+
+    def incr(self, key):
+        return self._command("INCR", key)
+
+    def delete(self, key):
+        self._command("DEL", key)
+
+    def delete_prefix(self, prefix):
+        pattern = "".join(f"\\{c}" if c in "*?[]\\" else c for c in prefix) + "*"
+        cursor, removed = "0", 0
+        while True:
+            cursor, keys = self._command("SCAN", cursor, "MATCH", pattern, "COUNT", 500)
+            cursor = cursor.decode() if isinstance(cursor, bytes) else cursor
+            if keys:
+                removed += self._command("DEL", *keys)
+            if cursor == "0":
+                return removed
+
+
+class Cache:
+    """JSON values on top of a backend, with single-flight fills and metrics.
+
+    Keys look like ``<namespace>:<rest>``; the namespace groups the stats.
+    A ``ttl`` of None means ``default_ttl``; 0 keeps the value until evicted.
+    """
+
+    POLL_SECONDS = 0.05
+
+    def __init__(self, backend: CacheBackend, prefix: str = "", default_ttl: float | None = 300,
+                 lock_timeout: float = 10.0):
+        self.backend = backend
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self.lock_timeout = lock_timeout
+        self._stats = defaultdict(Counter)
+        self._stats_lock = threading.Lock()
+        # key -> [lock, holders]; a lock per key being computed in this process
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+
+    def _record(self, key: str, event: str) -> None:
+        with self._stats_lock:
+            self._stats[key.split(":", 1)[0]][event] += 1
+
+    def _ttl(self, ttl):
+        return self.default_ttl if ttl is None else ttl
+
+    def _load(self, key: str):
+        """(found, value) for ``key``; backend errors count as a miss"""
+        try:
+            raw = self.backend.get(self.prefix + key)
+        except Exception as e:
+            self._record(key, "errors")
+            logger.warning(f"Cache get failed for {key}: {str(e)}")
+            return False, None
+        if raw is None:
+            return False, None
+        return True, json.loads(raw)
+
+    def get(self, key: str, default=None):
+        found, value = self._load(key)
+        self._record(key, "hits" if found else "misses")
+        return value if found else default
+
+    def get_many(self, keys: list[str]) -> dict:
+        """Values of the ``keys`` that are cached; missing keys are left out"""
+        try:
+            raws = self.backend.get_many([self.prefix + key for key in keys])
+        except Exception as e:
+            for key in keys:
+                self._record(key, "errors")
+            logger.warning(f"Cache get failed for {len(keys)} keys: {str(e)}")
+            return {}
+        found = {}
+        for key, raw in zip(keys, raws):
+            self._record(key, "misses" if raw is None else "hits")
+            if raw is not None:
+                found[key] = json.loads(raw)
+        return found
+
+    def incr(self, key: str) -> int | None:
+        """Increment the counter at ``key``; None if the backend failed"""
+        try:
+            return self.backend.incr(self.prefix + key)
+        except Exception as e:
+            self._record(key, "errors")
+            logger.warning(f"Cache incr failed for {key}: {str(e)}")
+            return None
+
+    def set(self, key: str, value, ttl: float | None = None) -> None:
+        try:
+            self.backend.set(self.prefix + key, json.dumps(value).encode(), self._ttl(ttl))
+        except Exception as e:
+            self._record(key, "errors")
+            logger.warning(f"Cache set failed for {key}: {str(e)}")
+
+    def add(self, key: str, value, ttl: float | None = None) -> bool:
+        """Store ``value`` unless ``key`` is already cached; True if it was stored"""
+        try:
+            return self.backend.add(self.prefix + key, json.dumps(value).encode(), self._ttl(ttl))
+        except Exception as e:
+            self._record(key, "errors")
+            logger.warning(f"Cache add failed for {key}: {str(e)}")
+            return False
+
+    def delete(self, key: str) -> None:
+        try:
+            self.backend.delete(self.prefix + key)
+        except Exception as e:
+            self._record(key, "errors")
+            logger.warning(f"Cache delete failed for {key}: {str(e)}")
+
+    def delete_prefix(self, prefix: str) -> int:
+        try:
+            return self.backend.delete_prefix(self.prefix + prefix)
+        except Exception as e:
+            self._record(prefix, "errors")
+            logger.warning(f"Cache delete failed for {prefix}*: {str(e)}")
+            return 0
+
+    def clear(self) -> None:
+        """Drop every key under this cache's prefix and reset the counters"""
+        self.delete_prefix("")
+        with self._stats_lock:
+            self._stats.clear()
+
+    @contextmanager
+    def _flight(self, key: str):
+        with self._flights_lock:
+            flight = self._flights.setdefault(key, [threading.Lock(), 0])
+            flight[1] += 1
+        flight[0].acquire()
+        try:
+            yield
+        finally:
+            flight[0].release()
+            with self._flights_lock:
+                flight[1] -= 1
+                if not flight[1]:
+                    self._flights.pop(key, None)
+
+    def get_or_set(self, key: str, compute, ttl: float | None = None, accept=None):
+        """Cached value for ``key``, computing and storing it on a miss.
+
+        Only one caller recomputes a missing key at a time: other threads
+        in this process wait on a per-key lock, and other processes sharing
+        the backend wait (up to ``lock_timeout``) on a lock key, then read
+        the fresh value instead of hitting the database too. ``accept``
+        rejects a cached value that is stale, which counts as a miss.
+        """
+        found, value = self._load(key)
+        if found and (accept is None or accept(value)):
+            self._record(key, "hits")
+            return value
+
+        with self._flight(key):
+            found, value = self._load(key)
+            if found and (accept is None or accept(value)):
+                self._record(key, "waits")
+                return value
+            self._record(key, "misses")
+
+            lock_key = self.prefix + key + ":lock"
+            try:
+                locked = self.backend.add(lock_key, b"1", self.lock_timeout)
+            except Exception:
+                locked = False
+            if not locked:
+                deadline = time.monotonic() + self.lock_timeout
+                while time.monotonic() < deadline:
+                    time.sleep(self.POLL_SECONDS)
+                    found, value = self._load(key)
+                    if found and (accept is None or accept(value)):
+                        self._record(key, "waits")
+                        return value
+            try:
+                value = compute()
+                self.set(key, value, ttl)
+                return value
+            finally:
+                if locked:
+                    try:
+                        self.backend.delete(lock_key)
+                    except Exception:
+                        pass
+
+    def stats(self) -> dict:
+        """Counters per namespace for this process, with the hit ratio"""
+        with self._stats_lock:
+            snapshot = {
+                namespace: {event: counts[event] for event in ("hits", "waits", "misses", "errors")}
+                for namespace, counts in self._stats.items()
+            }
+        for counts in snapshot.values():
+            # A wait was served from the cache too, just not on the first read
+            served = counts["hits"] + counts["waits"]
+            lookups = served + counts["misses"]
+            counts["hit_ratio"] = round(served / lookups, 4) if lookups else None
+        return snapshot
+
+
+def create_backend(config, instance_path: str) -> CacheBackend:
+    """Backend named by ``CACHE_BACKEND``"""
+    kind = (config.get("CACHE_BACKEND") or "memory").lower()
+    max_entries = config.get("CACHE_MAX_ENTRIES", 10000)
+    if kind == "memory":
+        return MemoryBackend(max_entries=max_entries)
+    if kind == "sqlite":
+        path = config.get("CACHE_SQLITE_PATH") or os.path.join(instance_path, "cache.sqlite3")
+        return SQLiteBackend(path, max_entries=max_entries)
+    if kind == "redis":
+        return RedisBackend(config.get("CACHE_REDIS_URL", "redis://localhost:6379/0"),
+                            timeout=config.get("CACHE_REDIS_TIMEOUT_SECONDS", 1.0))
+    raise ValueError(f"Unknown cache backend: {kind}")
+
+
+def init_cache(app) -> None:
+    """Attach the configured cache to the app as ``app.extensions['cache']``"""
+    app.extensions["cache"] = Cache(
+        create_backend(app.config, app.instance_path),
+        prefix=app.config.get("CACHE_KEY_PREFIX", "jobboard:"),
+        default_ttl=app.config.get("CACHE_DEFAULT_TTL_SECONDS", 300),
+        lock_timeout=app.config.get("CACHE_LOCK_TIMEOUT_SECONDS", 10.0),
+    )
+
+
+def get_cache() -> Cache:
+    """The current app's cache"""
+    return current_app.extensions["cache"]
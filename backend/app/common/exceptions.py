@@ -26,6 +26,11 @@ class ResourceNotFoundError(BusinessLogicError):
     def __init__(self, message: str):
         super().__init__(message, 404)
 
+class QuotaExceededError(BusinessLogicError):
+    """Upload would take a user or job past its storage quota"""
+    def __init__(self, message: str):
+        super().__init__(message, 413)
+
 class ConflictError(BusinessLogicError):
     """Custom conflict error (e.g., email already exists)"""
     def __init__(self, message: str):
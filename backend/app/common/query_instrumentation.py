@@ -0,0 +1,162 @@
+"""
+Per-request SQL instrumentation built on SQLAlchemy cursor events.
+
+Every statement executed while a request is being handled is timed and
+recorded on ``flask.g``. At the end of the request we:
+
+- emit a ``Server-Timing`` header with the query count and total DB time
+- write a structured slow-query log entry for statements above the threshold
+- flag likely N+1 patterns (the same statement shape repeated many times)
+"""
+import json
+import logging
+import re
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request, current_app
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+_listeners_installed = False
+
+# Patterns used to reduce a statement to its "shape" for N+1 detection
+_WHITESPACE_RE = re.compile(r"\s+")
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*(?:\?|%\(\w+\)s|:\w+|__\[POSTCOMPILE_\w+\])\s*,?)+\)", re.IGNORECASE)
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to a parameter-independent shape."""
+    shape = _WHITESPACE_RE.sub(" ", statement or "").strip()
+    shape = _STRING_LITERAL_RE.sub("?", shape)
+    shape = _NUMBER_LITERAL_RE.sub("?", shape)
+    shape = _IN_LIST_RE.sub("IN (?)", shape)
+    return shape
+
+
+class RequestQueryStats:
+    """Query statistics collected for a single request."""
+
+    def __init__(self, top_n: int = 5):
+        self.top_n = top_n
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes: Counter = Counter()
+        self.slowest: list[tuple[float, str]] = []
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.shapes[normalize_statement(statement)] += 1
+        # Keep only the N slowest statements (list stays tiny, so a sort is fine)
+        self.slowest.append((duration_ms, statement))
+        self.slowest.sort(key=lambda item: item[0], reverse=True)
+        del self.slowest[self.top_n:]
+
+    def repeated_shapes(self, threshold: int) -> list[dict]:
+        """Statement shapes executed more than ``threshold`` times."""
+        return [
+            {"statement": shape, "count": count}
+            for shape, count in self.shapes.most_common()
+            if count > threshold
+        ]
+
+    def to_dict(self) -> dict:
+        return {
+            "query_count": self.count,
+            "total_db_ms": round(self.total_ms, 2),
+            "slowest": [
+                {"duration_ms": round(duration, 2), "statement": statement}
+                for duration, statement in self.slowest
+            ],
+        }
+
+
+def get_request_query_stats() -> RequestQueryStats | None:
+    """Return stats for the current request, if instrumentation is active."""
+    if not has_request_context():
+        return None
+    return g.get("_query_stats")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is None or not has_request_context() or g.get("_query_stats") is None:
+        return
+    # Kept on the execution context rather than the connection, so a statement
+    # that raises leaves nothing behind for the next one to pick up
+    context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_time = getattr(context, "_query_start_time", None)
+    if start_time is None:
+        return
+    duration_ms = (time.perf_counter() - start_time) * 1000
+    stats = get_request_query_stats()
+    if stats is None:
+        return
+    stats.record(statement, duration_ms)
+
+    threshold_ms = current_app.config.get("SQL_SLOW_QUERY_MS", 200)
+    if threshold_ms is not None and duration_ms >= threshold_ms:
+        slow_query_logger.warning(json.dumps({
+            "event": "slow_query",
+            "duration_ms": round(duration_ms, 2),
+            "threshold_ms": threshold_ms,
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "statement": _WHITESPACE_RE.sub(" ", statement).strip(),
+        }))
+
+
+def _install_engine_listeners() -> None:
+    """Attach cursor listeners to every Engine (idempotent)."""
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _listeners_installed = True
+
+
+def init_query_instrumentation(app) -> None:
+    """Enable per-request SQL instrumentation for ``app``."""
+    if not app.config.get("SQL_INSTRUMENTATION_ENABLED", True):
+        return
+
+    _install_engine_listeners()
+
+    @app.before_request
+    def _start_query_stats():
+        g._query_stats = RequestQueryStats(top_n=app.config.get("SQL_TOP_STATEMENTS", 5))
+
+    @app.after_request
+    def _finish_query_stats(response):
+        stats = g.pop("_query_stats", None)
+        if stats is None:
+            return response
+
+        if app.config.get("SQL_SERVER_TIMING_ENABLED", True):
+            timing = f'db;dur={stats.total_ms:.2f};desc="{stats.count} queries"'
+            existing = response.headers.get("Server-Timing")
+            response.headers["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+        threshold = app.config.get("SQL_N_PLUS_ONE_THRESHOLD", 10)
+        repeated = stats.repeated_shapes(threshold)
+        if repeated:
+            logger.warning(json.dumps({
+                "event": "possible_n_plus_one",
+                "method": request.method,
+                "path": request.path,
+                "endpoint": request.endpoint,
+                "threshold": threshold,
+                "repeated": repeated,
+                **stats.to_dict(),
+            }))
+        return response
@@ -55,4 +55,80 @@ class BaseConfig:
     # Input Validation
     MAX_STRING_LENGTH = int(os.getenv("MAX_STRING_LENGTH", "1000"))
     MAX_EMAIL_LENGTH = int(os.getenv("MAX_EMAIL_LENGTH", "254"))
-    MAX_PASSWORD_LENGTH = int(os.getenv("MAX_PASSWORD_LENGTH", "128"))
\ No newline at end of file
+    MAX_PASSWORD_LENGTH = int(os.getenv("MAX_PASSWORD_LENGTH", "128"))
+
+    # SQL instrumentation (per-request query stats, Server-Timing, slow-query log)
+    SQL_INSTRUMENTATION_ENABLED = os.getenv("SQL_INSTRUMENTATION_ENABLED", "true").lower() == "true"
+    SQL_SERVER_TIMING_ENABLED = os.getenv("SQL_SERVER_TIMING_ENABLED", "true").lower() == "true"
+    SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "10"))
+    SQL_TOP_STATEMENTS = int(os.getenv("SQL_TOP_STATEMENTS", "5"))
+
+    # Cache: memory (per worker), sqlite (shared file per host) or redis (any RESP server)
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "jobboard:")
+    CACHE_DEFAULT_TTL_SECONDS = int(os.getenv("CACHE_DEFAULT_TTL_SECONDS", "300"))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH")  # unset = instance/cache.sqlite3
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_REDIS_TIMEOUT_SECONDS = float(os.getenv("CACHE_REDIS_TIMEOUT_SECONDS", "1"))
+    CACHE_LOCK_TIMEOUT_SECONDS = float(os.getenv("CACHE_LOCK_TIMEOUT_SECONDS", "10"))
+    JOB_SEARCH_CACHE_TTL = int(os.getenv("JOB_SEARCH_CACHE_TTL", "30"))
+    # Queries with fewer hits than this also get typo-tolerant (trigram) matches
+    JOB_SEARCH_FUZZY_MIN_HITS = int(os.getenv("JOB_SEARCH_FUZZY_MIN_HITS", "3"))
+    # pg_trgm rates a swapped pair of letters in a six-letter word ("pyhton") at 0.27
+    JOB_SEARCH_FUZZY_THRESHOLD = float(os.getenv("JOB_SEARCH_FUZZY_THRESHOLD", "0.25"))
+    JOB_SEARCH_FUZZY_LIMIT = int(os.getenv("JOB_SEARCH_FUZZY_LIMIT", "50"))
+    # In-process typeahead and recommendation indexes pick up other workers' job
+    # writes within SEARCH_INDEX_SYNC_SECONDS and are rebuilt after SEARCH_INDEX_MAX_AGE_SECONDS
+    SEARCH_INDEX_SYNC_SECONDS = float(os.getenv("SEARCH_INDEX_SYNC_SECONDS", "2"))
+    SEARCH_INDEX_MAX_AGE_SECONDS = float(os.getenv("SEARCH_INDEX_MAX_AGE_SECONDS", "600"))
+    JOB_DETAIL_CACHE_TTL = int(os.getenv("JOB_DETAIL_CACHE_TTL", "300"))
+    # Search result cards can't be checked against the row, so on the per-worker
+    # memory backend, where other workers' edits don't reach them, they expire sooner
+    JOB_CARD_LOCAL_CACHE_TTL = int(os.getenv("JOB_CARD_LOCAL_CACHE_TTL", "5"))
+    ADMIN_METRICS_CACHE_TTL = int(os.getenv("ADMIN_METRICS_CACHE_TTL", "30"))
+    # Users looked up for token checks are cached this long, on shared cache backends only
+    AUTH_CACHE_TTL_SECONDS = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+    # Public job detail Cache-Control max-age
+    JOB_DETAIL_CACHE_MAX_AGE = int(os.getenv("JOB_DETAIL_CACHE_MAX_AGE", "60"))
+
+    # Database monitoring
+    MONITORING_CACHE_TTL_SECONDS = int(os.getenv("MONITORING_CACHE_TTL_SECONDS", "30"))
+    LONG_QUERY_THRESHOLD_SECONDS = float(os.getenv("LONG_QUERY_THRESHOLD_SECONDS", "30"))
+    DATABASE_SIZE_WARNING_MB = int(os.getenv("DATABASE_SIZE_WARNING_MB", "100"))
+    CACHE_HIT_RATIO_MIN = float(os.getenv("CACHE_HIT_RATIO_MIN", "0.95"))
+    TABLE_BLOAT_RATIO_MAX = float(os.getenv("TABLE_BLOAT_RATIO_MAX", "0.2"))
+    # Shared health history ring buffer (default: 48h at 1-minute resolution)
+    HEALTH_HISTORY_RESOLUTION_SECONDS = int(os.getenv("HEALTH_HISTORY_RESOLUTION_SECONDS", "60"))
+    HEALTH_HISTORY_CAPACITY = int(os.getenv("HEALTH_HISTORY_CAPACITY", "2880"))
+    HEALTH_HISTORY_MAX_POINTS = int(os.getenv("HEALTH_HISTORY_MAX_POINTS", "288"))
+
+    # Backups
+    BACKUP_PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "1024"))
+    BACKUP_STEP_PAUSE_SECONDS = float(os.getenv("BACKUP_STEP_PAUSE_SECONDS", "0"))
+    BACKUP_PARALLEL_WORKERS = int(os.getenv("BACKUP_PARALLEL_WORKERS", "4"))
+    # Archive compressor: gzip, pgzip (parallel gzip), zstd or lz4
+    BACKUP_COMPRESSOR = os.getenv("BACKUP_COMPRESSOR", "pgzip")
+    BACKUP_COMPRESSION_LEVEL = os.getenv("BACKUP_COMPRESSION_LEVEL")  # unset = compressor default
+    BACKUP_COMPRESSION_THREADS = int(os.getenv("BACKUP_COMPRESSION_THREADS", "0"))  # 0 = one per CPU
+    # Incremental snapshots: content-defined chunk sizes and chunk compression
+    BACKUP_CHUNK_MIN_BYTES = int(os.getenv("BACKUP_CHUNK_MIN_BYTES", "2048"))
+    BACKUP_CHUNK_AVG_BYTES = int(os.getenv("BACKUP_CHUNK_AVG_BYTES", "8192"))
+    BACKUP_CHUNK_MAX_BYTES = int(os.getenv("BACKUP_CHUNK_MAX_BYTES", "65536"))
+    BACKUP_CHUNK_COMPRESSLEVEL = int(os.getenv("BACKUP_CHUNK_COMPRESSLEVEL", "6"))
+    BACKUP_INCLUDE_STATIC = os.getenv("BACKUP_INCLUDE_STATIC", "true").lower() == "true"
+
+    # Orphaned document sweep
+    ORPHAN_SWEEP_BATCH_SIZE = int(os.getenv("ORPHAN_SWEEP_BATCH_SIZE", "500"))
+    ORPHAN_SWEEP_MIN_AGE_SECONDS = int(os.getenv("ORPHAN_SWEEP_MIN_AGE_SECONDS", "3600"))
+    # Documents removed per ledger commit after a job is deleted
+    FILE_CLEANUP_BATCH_SIZE = int(os.getenv("FILE_CLEANUP_BATCH_SIZE", "200"))
+
+    # Background purge of deleted jobs: rows per batch and pause between full batches
+    JOB_PURGE_BATCH_SIZE = int(os.getenv("JOB_PURGE_BATCH_SIZE", "200"))
+    JOB_PURGE_PAUSE_SECONDS = float(os.getenv("JOB_PURGE_PAUSE_SECONDS", "0.2"))
+
+    # Document storage quotas in bytes (0 = unlimited)
+    STORAGE_QUOTA_PER_USER_BYTES = int(os.getenv("STORAGE_QUOTA_PER_USER_BYTES", str(50 * 1024 * 1024)))
+    STORAGE_QUOTA_PER_JOB_BYTES = int(os.getenv("STORAGE_QUOTA_PER_JOB_BYTES", str(2 * 1024 * 1024 * 1024)))
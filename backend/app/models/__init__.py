@@ -3,7 +3,10 @@ from .user import User  # noqa: F401
 from .user_role import UserRole  # noqa: F401
 from .recruiter_request import RecruiterRequest  # noqa: F401
 from .saved_job import SavedJob  # noqa: F401
+from .job_skill import JobSkill  # noqa: F401
 from .application import Application  # noqa: F401
 
 
 from .verification_code import VerificationCode  # noqa: F401
+from .health_check_sample import HealthCheckSample  # noqa: F401
+from .storage_usage import StorageUsage  # noqa: F401
@@ -42,6 +42,11 @@ class Application(db.Model):
     
     # Application Status
     status: Mapped[str] = mapped_column(db.String(50), default='submitted', nullable=False)
+
+    # Match against the job, cached by ApplicantRankingService; valid while the
+    # job's updated_at still equals match_score_version
+    match_score: Mapped[float] = mapped_column(db.Float, nullable=True)
+    match_score_version: Mapped[datetime] = mapped_column(db.DateTime, nullable=True)
     
     created_at: Mapped[datetime] = mapped_column(db.DateTime, default=lambda: datetime.now(UTC), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(db.DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC), nullable=False)
@@ -60,6 +65,13 @@ class Application(db.Model):
         db.Index('idx_applications_user_status_created', 'user_id', 'status', 'created_at'),
         db.Index('idx_applications_user_created', 'user_id', 'created_at'),
         db.Index('idx_applications_job_created', 'job_id', 'created_at'),
+        # Applicants of a job by match score (order=score). PostgreSQL sorts NULLs
+        # first in a backward scan, so spell out the order the query uses there
+        db.Index('idx_applications_job_score', 'job_id', 'match_score', 'created_at',
+                 postgresql_ops={'match_score': 'DESC NULLS LAST', 'created_at': 'DESC'}),
+        # Lookups by stored document path (orphaned file sweep)
+        db.Index('idx_applications_resume_path', 'resume_path'),
+        db.Index('idx_applications_cover_letter_path', 'cover_letter_path'),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,23 @@
+from datetime import datetime
+from sqlalchemy.types import JSON
+from ..extensions import db
+
+
+class HealthCheckSample(db.Model):
+    """One time bucket of the fixed-capacity health check ring buffer.
+
+    ``slot`` cycles through ``0..capacity-1``; a row whose ``bucket_start`` is
+    older than the requested window is simply a stale slot waiting to be reused.
+    """
+    __tablename__ = "health_check_samples"
+
+    slot = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    bucket_start = db.Column(db.DateTime, nullable=False, index=True)
+    total_checks = db.Column(db.Integer, nullable=False, default=0)
+    healthy_checks = db.Column(db.Integer, nullable=False, default=0)
+    last_status = db.Column(db.String(16), nullable=False)
+    last_checked_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_result = db.Column(JSON, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<HealthCheckSample slot={self.slot} bucket_start={self.bucket_start} total={self.total_checks}>"
@@ -1,10 +1,22 @@
-from datetime import datetime
-from sqlalchemy import ForeignKey, UniqueConstraint
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from datetime import UTC, date, datetime
+from sqlalchemy import ForeignKey, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from sqlalchemy.types import JSON
 from ..extensions import db
 
 
+JOB_STATUS_ACTIVE = 'active'
+JOB_STATUS_DEPRECATED = 'deprecated'
+
+
+def status_for_deadline(deadline, today: date | None = None) -> str:
+    """Status a job with this application deadline should have on ``today``"""
+    today = today or datetime.now(UTC).date()
+    if isinstance(deadline, date) and deadline < today:
+        return JOB_STATUS_DEPRECATED
+    return JOB_STATUS_ACTIVE
+
+
 class Job(db.Model):
     __tablename__ = 'jobs'
 
@@ -22,6 +34,11 @@ class Job(db.Model):
     skills: Mapped[list] = mapped_column(JSON, nullable=False)
 
     application_deadline: Mapped[datetime] = mapped_column(db.Date, nullable=False)
+    # Materialised from application_deadline: set whenever the deadline is
+    # assigned, and flipped to 'deprecated' by the daily transition once it passes
+    status: Mapped[str] = mapped_column(
+        db.String(16), nullable=False, default=JOB_STATUS_ACTIVE, server_default=JOB_STATUS_ACTIVE
+    )
 
     # Extended fields
     employment_type: Mapped[str] = mapped_column(db.String(32), nullable=True)  # full_time, part_time, contract, internship, temporary
@@ -34,15 +51,71 @@ class Job(db.Model):
 
     created_at: Mapped[datetime] = mapped_column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Set when the recruiter deletes the job; rows are purged in the background
+    deleted_at: Mapped[datetime] = mapped_column(db.DateTime, nullable=True)
 
     user = relationship('User', backref=db.backref('jobs', lazy='dynamic'))
 
     __table_args__ = (
-        UniqueConstraint('user_id', 'title', name='uq_jobs_user_title'),
+        # Titles only need to be unique among live jobs, so a deleted job
+        # awaiting purge doesn't block re-posting under the same title
+        db.Index(
+            'uq_jobs_user_title', 'user_id', 'title', unique=True,
+            sqlite_where=text('deleted_at IS NULL'),
+            postgresql_where=text('deleted_at IS NULL'),
+        ),
         # Composite indexes for common query patterns
         db.Index('idx_jobs_user_created', 'user_id', 'created_at'),
+        # Jobs changed since a point in time (live_job_index sync)
+        db.Index('idx_jobs_updated', 'updated_at'),
         db.Index('idx_jobs_deadline_created', 'application_deadline', 'created_at'),
         db.Index('idx_jobs_user_title', 'user_id', 'title'),
+        db.Index('idx_jobs_user_status_created', 'user_id', 'status', 'created_at'),
+        # Daily transition: active jobs whose deadline has passed
+        db.Index(
+            'idx_jobs_active_deadline', 'application_deadline',
+            sqlite_where=text("status = 'active'"),
+            postgresql_where=text("status = 'active'"),
+        ),
+        # Purger backlog; live jobs (the vast majority) stay out of the index
+        db.Index(
+            'idx_jobs_deleted_at', 'deleted_at',
+            sqlite_where=text('deleted_at IS NOT NULL'),
+            postgresql_where=text('deleted_at IS NOT NULL'),
+        ),
+        # Public listings only ever read live, active jobs, newest first
+        db.Index(
+            'idx_jobs_active_created', 'created_at',
+            sqlite_where=text("status = 'active' AND deleted_at IS NULL"),
+            postgresql_where=text("status = 'active' AND deleted_at IS NULL"),
+        ),
+        # Faceted search: filter on one facet and read newest first, or group by it for counts
+        db.Index(
+            'idx_jobs_active_employment_type_created', 'employment_type', 'created_at',
+            sqlite_where=text("status = 'active' AND deleted_at IS NULL"),
+            postgresql_where=text("status = 'active' AND deleted_at IS NULL"),
+        ),
+        db.Index(
+            'idx_jobs_active_seniority_created', 'seniority', 'created_at',
+            sqlite_where=text("status = 'active' AND deleted_at IS NULL"),
+            postgresql_where=text("status = 'active' AND deleted_at IS NULL"),
+        ),
+        db.Index(
+            'idx_jobs_active_work_mode_created', 'work_mode', 'created_at',
+            sqlite_where=text("status = 'active' AND deleted_at IS NULL"),
+            postgresql_where=text("status = 'active' AND deleted_at IS NULL"),
+        ),
+        # Salary range overlap: salary_max >= wanted minimum AND salary_min <= wanted maximum
+        db.Index(
+            'idx_jobs_active_salary', 'salary_max', 'salary_min',
+            sqlite_where=text("status = 'active' AND deleted_at IS NULL"),
+            postgresql_where=text("status = 'active' AND deleted_at IS NULL"),
+        ),
     )
 
+    @validates('application_deadline')
+    def _sync_status(self, key, deadline):
+        self.status = status_for_deadline(deadline)
+        return deadline
+
 
@@ -0,0 +1,23 @@
+from ..extensions import db
+
+
+class JobSkill(db.Model):
+    """One row per normalized skill of a job: the inverted index behind skill search.
+
+    ``Job.skills`` stays the source of truth for display; these rows are
+    rewritten whenever it changes (see SkillIndexService).
+    """
+    __tablename__ = "job_skills"
+
+    job_id = db.Column(db.Integer, db.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    skill_norm = db.Column(db.String(100), primary_key=True)
+
+    __table_args__ = (
+        # Exact and prefix lookups by skill, yielding job ids without touching jobs.
+        # text_pattern_ops lets PostgreSQL serve LIKE 'prefix%' whatever the collation
+        db.Index("idx_job_skills_skill_job", "skill_norm", "job_id",
+                 postgresql_ops={"skill_norm": "text_pattern_ops"}),
+    )
+
+    def __repr__(self) -> str:
+        return f"<JobSkill job_id={self.job_id} skill={self.skill_norm}>"
@@ -12,7 +12,8 @@ class SavedJob(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("user_id", "job_id", name="uq_saved_jobs_user_job"),
-        db.Index("idx_saved_jobs_user", "user_id"),
+        # Newest-first listing and its keyset cursor: (created_at, id) per user
+        db.Index("idx_saved_jobs_user_created", "user_id", "created_at", "id"),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,26 @@
+from datetime import datetime
+from ..extensions import db
+
+
+class StorageUsage(db.Model):
+    """Running byte and file totals for uploaded documents.
+
+    One row per (scope, scope_key): ``user``/<user_id>, ``job``/<job_id>,
+    ``doc_type``/<resume|cover_letter>, ``total``/``all`` and, as of the last
+    reconciliation, ``unreferenced``/``all`` for files no application points at.
+    """
+    __tablename__ = "storage_usage"
+
+    scope = db.Column(db.String(16), primary_key=True)
+    scope_key = db.Column(db.String(64), primary_key=True)
+    bytes = db.Column(db.BigInteger, nullable=False, default=0)
+    files = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Top consumers within a scope
+        db.Index('idx_storage_usage_scope_bytes', 'scope', 'bytes'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<StorageUsage {self.scope}:{self.scope_key} bytes={self.bytes} files={self.files}>"
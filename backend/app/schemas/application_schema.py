@@ -80,6 +80,12 @@ class ApplicationListSchema(Schema):
     )
 
 
+class JobApplicationListSchema(ApplicationListSchema):
+    """Query parameters of a job's application list (job owner)"""
+
+    order = fields.String(validate=validate.OneOf(['created', 'score']), load_default='created')
+
+
 class ApplicationUpdateSchema(Schema):
     """Schema for updating application status (admin/recruiter use)"""
     
@@ -1,4 +1,8 @@
-from marshmallow import Schema, fields, validate, ValidationError, validates_schema
+from marshmallow import Schema, fields, validate, ValidationError, validates_schema, pre_load, EXCLUDE
+
+EMPLOYMENT_TYPES = ['full_time', 'part_time', 'contract', 'internship', 'temporary']
+SENIORITIES = ['intern', 'junior', 'mid', 'senior', 'lead']
+WORK_MODES = ['onsite', 'remote', 'hybrid']
 
 
 class RecruiterPostJobSchema(Schema):
@@ -20,9 +24,9 @@ class RecruiterPostJobSchema(Schema):
             raise ValidationError('salary_min must be less than or equal to salary_max', field_name='salary')
 
     # Optional extended fields (validated with choices where sensible)
-    employment_type = fields.String(validate=validate.OneOf(['full_time','part_time','contract','internship','temporary']))
-    seniority = fields.String(validate=validate.OneOf(['intern','junior','mid','senior','lead']))
-    work_mode = fields.String(validate=validate.OneOf(['onsite','remote','hybrid']))
+    employment_type = fields.String(validate=validate.OneOf(EMPLOYMENT_TYPES))
+    seniority = fields.String(validate=validate.OneOf(SENIORITIES))
+    work_mode = fields.String(validate=validate.OneOf(WORK_MODES))
     visa_sponsorship = fields.Boolean()
     work_authorization = fields.String(allow_none=True)
     nice_to_haves = fields.String(allow_none=True)
@@ -39,10 +43,65 @@ class RecruiterJobUpdateSchema(Schema):
     responsibilities = fields.String()
     skills = fields.List(fields.String(validate=validate.Length(min=1)))
     application_deadline = fields.Date()
-    employment_type = fields.String(validate=validate.OneOf(['full_time','part_time','contract','internship','temporary']))
-    seniority = fields.String(validate=validate.OneOf(['intern','junior','mid','senior','lead']))
-    work_mode = fields.String(validate=validate.OneOf(['onsite','remote','hybrid']))
+    employment_type = fields.String(validate=validate.OneOf(EMPLOYMENT_TYPES))
+    seniority = fields.String(validate=validate.OneOf(SENIORITIES))
+    work_mode = fields.String(validate=validate.OneOf(WORK_MODES))
     visa_sponsorship = fields.Boolean()
     work_authorization = fields.String()
     nice_to_haves = fields.String()
-    about_team = fields.String()
\ No newline at end of file
+    about_team = fields.String()
+
+
+class PublicJobSearchSchema(Schema):
+    """Query string of the public job search; list filters take comma-separated values"""
+
+    class Meta:
+        unknown = EXCLUDE
+
+    q = fields.String(load_default=None)
+    page = fields.Integer(load_default=1, validate=validate.Range(min=1))
+    per_page = fields.Integer(load_default=20, validate=validate.Range(min=1, max=100))
+    employment_type = fields.List(fields.String(validate=validate.OneOf(EMPLOYMENT_TYPES)))
+    seniority = fields.List(fields.String(validate=validate.OneOf(SENIORITIES)))
+    work_mode = fields.List(fields.String(validate=validate.OneOf(WORK_MODES)))
+    visa_sponsorship = fields.Boolean()
+    location = fields.String(validate=validate.Length(min=1, max=255))
+    salary_min = fields.Float(validate=validate.Range(min=0))
+    salary_max = fields.Float(validate=validate.Range(min=0))
+    skills = fields.List(fields.String(validate=validate.Length(min=1, max=100)), validate=validate.Length(max=10))
+    skills_match = fields.String(validate=validate.OneOf(['all', 'any']))
+    include = fields.List(fields.String(), load_default=list)
+
+    @pre_load
+    def split_lists(self, data, **kwargs):
+        data = dict(data)
+        for name in ('employment_type', 'seniority', 'work_mode', 'skills', 'include'):
+            if isinstance(data.get(name), str):
+                data[name] = [part.strip() for part in data[name].split(',') if part.strip()]
+        return data
+
+    @validates_schema
+    def validate_salary_range(self, data, **kwargs):
+        min_val = data.get('salary_min')
+        max_val = data.get('salary_max')
+        if min_val is not None and max_val is not None and min_val > max_val:
+            raise ValidationError('salary_min must be less than or equal to salary_max', field_name='salary')
+
+
+class SuggestQuerySchema(Schema):
+    """Query string of the typeahead endpoint"""
+
+    class Meta:
+        unknown = EXCLUDE
+
+    prefix = fields.String(required=True, validate=validate.Length(min=1, max=100))
+    limit = fields.Integer(load_default=10, validate=validate.Range(min=1, max=20))
+    kind = fields.List(fields.String(validate=validate.OneOf(['title', 'skill', 'location'])),
+                       load_default=lambda: ['title', 'skill', 'location'])
+
+    @pre_load
+    def split_kinds(self, data, **kwargs):
+        data = dict(data)
+        if isinstance(data.get('kind'), str):
+            data['kind'] = [part.strip() for part in data['kind'].split(',') if part.strip()]
+        return data
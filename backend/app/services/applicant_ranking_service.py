@@ -0,0 +1,130 @@
+"""
+Applicant ranking: how well each application fits its job.
+
+A score in [0, 1] blends three parts, weighted by SCORE_WEIGHTS:
+
+``skills``      share of the job's skills, and at half weight of its
+                requirement words, named in the applicant's skills text
+``experience``  closeness of the applicant's experience bucket to the years
+                the job's seniority implies; falling short costs more than
+                exceeding it
+``education``   whether the applicant's degree reaches the one the
+                requirements mention
+
+A blank experience or education, or a part the job gives nothing to
+compare against, counts as UNKNOWN_SCORE; blank skills match nothing.
+The features of the whole pool are laid out as NumPy arrays and scored
+in one pass. Scores are cached on the application rows with the job
+``updated_at`` they were computed for, so only new applications, and all
+of them after the job is edited, are scored again.
+"""
+import numpy as np
+from sqlalchemy import or_, select, update
+
+from ..extensions import db
+from ..models.application import Application
+from .matching_service import tokenize
+
+SCORE_WEIGHTS = {"skills": 0.6, "experience": 0.25, "education": 0.15}
+# Weight of a requirement word relative to a listed skill
+REQUIREMENT_WEIGHT = 0.5
+UNKNOWN_SCORE = 0.5
+
+# Midpoints of the experience buckets of ApplicationSubmitSchema, in years
+EXPERIENCE_YEARS = {
+    '0-1 years': 0.5, '1-2 years': 1.5, '2-3 years': 2.5,
+    '3-5 years': 4.0, '5-10 years': 7.5, '10+ years': 12.0,
+}
+# Years of experience each job seniority expects
+SENIORITY_YEARS = {'intern': 0.0, 'junior': 1.0, 'mid': 3.0, 'senior': 6.0, 'lead': 9.0}
+EDUCATION_LEVELS = {'high-school': 1, 'associate': 2, 'other': 2, 'bachelor': 3, 'master': 4, 'phd': 5}
+# Requirement words naming a minimum degree
+DEGREE_WORDS = {
+    'phd': 5, 'doctorate': 5, 'master': 4, 'masters': 4, 'msc': 4,
+    'bachelor': 3, 'bachelors': 3, 'bsc': 3, 'degree': 3,
+}
+
+
+def _job_terms(skills, requirements) -> list[tuple[tuple, float]]:
+    """(words, weight) of each skill and requirement word of a job"""
+    terms = {}
+    for skill in skills or []:
+        words = tuple(tokenize(skill))
+        if words:
+            terms[words] = 1.0
+    for requirement in requirements or []:
+        for word in tokenize(requirement):
+            # "3+" and other numbers say nothing about skills
+            if not word[0].isdigit():
+                terms.setdefault((word,), REQUIREMENT_WEIGHT)
+    return list(terms.items())
+
+
+def _skill_scores(terms, skill_texts) -> np.ndarray:
+    columns = {}
+    for words, _ in terms:
+        for word in words:
+            columns.setdefault(word, len(columns))
+    named = np.zeros((len(skill_texts), len(columns)), dtype=bool)
+    for row, text in enumerate(skill_texts):
+        named[row, [columns[word] for word in set(tokenize(text)) if word in columns]] = True
+    # A skill of several words counts when the applicant names all of them
+    matched = np.column_stack([named[:, [columns[word] for word in words]].all(axis=1) for words, _ in terms])
+    weights = np.array([weight for _, weight in terms])
+    return matched @ weights / weights.sum()
+
+
+def score_applications(skills, requirements, seniority, applications) -> np.ndarray:
+    """Scores of ``applications`` (rows with experience, education and skills) for a job"""
+    count = len(applications)
+    unknown = np.full(count, UNKNOWN_SCORE)
+
+    terms = _job_terms(skills, requirements)
+    skill_part = _skill_scores(terms, [row.skills for row in applications]) if terms else unknown
+
+    years = np.array([EXPERIENCE_YEARS.get(row.experience, np.nan) for row in applications])
+    target = SENIORITY_YEARS.get(seniority)
+    if target is None:
+        experience_part = unknown
+    else:
+        gap = years - target
+        # A missing year costs as much as two extra ones
+        shortfall = np.where(gap < 0, -gap, gap / 2) / max(target, 1.0)
+        experience_part = np.where(np.isnan(years), UNKNOWN_SCORE, 1 / (1 + shortfall))
+
+    levels = np.array([EDUCATION_LEVELS.get(row.education, np.nan) for row in applications])
+    required = max((DEGREE_WORDS.get(word, 0) for text in requirements or [] for word in tokenize(text)), default=0)
+    if not required:
+        education_part = unknown
+    else:
+        # Half the credit for each level short of the degree asked for
+        education_part = np.where(np.isnan(levels), UNKNOWN_SCORE, 0.5 ** np.clip(required - levels, 0, None))
+
+    scores = (SCORE_WEIGHTS["skills"] * skill_part
+              + SCORE_WEIGHTS["experience"] * experience_part
+              + SCORE_WEIGHTS["education"] * education_part)
+    return np.round(scores, 4)
+
+
+class ApplicantRankingService:
+    """Keep the cached match scores of a job's applications current"""
+
+    def refresh_scores(self, job) -> int:
+        """Score the applications of ``job`` with a missing or stale score; returns how many"""
+        stale = db.session.execute(
+            select(Application.id, Application.experience, Application.education, Application.skills,
+                   Application.updated_at)
+            .where(Application.job_id == job.id,
+                   or_(Application.match_score_version.is_(None), Application.match_score_version != job.updated_at))
+        ).all()
+        if not stale:
+            return 0
+        scores = score_applications(job.skills, job.requirements, job.seniority, stale)
+        # updated_at is written back unchanged: scoring isn't an edit of the application
+        db.session.execute(update(Application), [
+            {"id": row.id, "match_score": float(score), "match_score_version": job.updated_at,
+             "updated_at": row.updated_at}
+            for row, score in zip(stale, scores)
+        ])
+        db.session.commit()
+        return len(stale)
@@ -10,6 +10,11 @@ from ..models.application import Application
 from ..models.job import Job
 from ..models.user import User
 from ..common.exceptions import ConflictError, ValidationError
+from .storage_ledger_service import StorageLedger, file_size
+from .applicant_ranking_service import ApplicantRankingService
+
+ORDER_CREATED = 'created'
+ORDER_SCORE = 'score'
 
 
 class ApplicationService:
@@ -76,7 +81,7 @@ class ApplicationService:
         
         # Check if job exists
         job = db.session.execute(
-            select(Job).where(Job.id == job_id)
+            select(Job).where(Job.id == job_id, Job.deleted_at.is_(None))
         ).scalar_one_or_none()
         
         if not job:
@@ -121,9 +126,10 @@ class ApplicationService:
         db.session.add(application)
         db.session.flush()  # Get the application ID without committing
         
-        # Handle file uploads
+        # Handle file uploads; usage counters commit together with the application
         resume_path = None
         cover_letter_path = None
+        ledger = StorageLedger()
         
         try:
             # Save resume file
@@ -133,6 +139,7 @@ class ApplicationService:
                 if self._save_file(resume_file, file_path):
                     resume_path = str(file_path.relative_to(self.static_folder))
                     application.resume_path = resume_path
+                    ledger.record_upload(user_id, job_id, 'resume', file_size(file_path))
             
             # Save cover letter file
             if cover_letter_file:
@@ -141,6 +148,10 @@ class ApplicationService:
                 if self._save_file(cover_letter_file, file_path):
                     cover_letter_path = str(file_path.relative_to(self.static_folder))
                     application.cover_letter_path = cover_letter_path
+                    ledger.record_upload(user_id, job_id, 'cover_letter', file_size(file_path))
+            
+            # Re-check with the counters bumped: catches concurrent uploads
+            ledger.check_quota(user_id, job_id)
             
             # Commit the transaction
             db.session.commit()
@@ -177,7 +188,9 @@ class ApplicationService:
         offset = (page - 1) * per_page
         
         # Build query with optional status filter
-        query = select(Application, Job).join(Job, Application.job_id == Job.id).where(Application.user_id == user_id)
+        query = select(Application, Job).join(Job, Application.job_id == Job.id).where(
+            Application.user_id == user_id, Job.deleted_at.is_(None)
+        )
         
         if status:
             query = query.where(Application.status == status)
@@ -227,7 +240,9 @@ class ApplicationService:
             })
         
         # Get total count with status filter
-        count_query = select(db.func.count(Application.id)).where(Application.user_id == user_id)
+        count_query = select(db.func.count(Application.id)).join(Job, Application.job_id == Job.id).where(
+            Application.user_id == user_id, Job.deleted_at.is_(None)
+        )
         if status:
             count_query = count_query.where(Application.status == status)
             
@@ -243,8 +258,14 @@ class ApplicationService:
             }
         }
     
-    def get_job_applications(self, job_id: int, user_id: int, page: int = 1, per_page: int = 20) -> dict:
-        """Get applications for a specific job (only for job owner)"""
+    def get_job_applications(self, job_id: int, user_id: int, page: int = 1, per_page: int = 20,
+                             order: str = ORDER_CREATED) -> dict:
+        """Get applications for a specific job (only for job owner)
+
+        ``order`` is 'created' (newest first) or 'score' (best match first,
+        see ApplicantRankingService); scores missing or stale for the current
+        job are computed for the whole pool before the page is read.
+        """
         if page < 1:
             page = 1
         if per_page < 1:
@@ -252,7 +273,7 @@ class ApplicationService:
         
         # Verify user owns the job
         job = db.session.execute(
-            select(Job).where(Job.id == job_id, Job.user_id == user_id)
+            select(Job).where(Job.id == job_id, Job.user_id == user_id, Job.deleted_at.is_(None))
         ).scalar_one_or_none()
         
         if not job:
@@ -260,13 +281,18 @@ class ApplicationService:
             raise AuthorizationError("Job not found or access denied")
         
         offset = (page - 1) * per_page
+        if order == ORDER_SCORE:
+            ApplicantRankingService().refresh_scores(job)
+            ordering = (Application.match_score.desc().nulls_last(), Application.created_at.desc(), Application.id.desc())
+        else:
+            ordering = (Application.created_at.desc(),)
         
         # Get applications with user details
         applications = db.session.execute(
             select(Application, User)
             .join(User, Application.user_id == User.id)
             .where(Application.job_id == job_id)
-            .order_by(Application.created_at.desc())
+            .order_by(*ordering)
             .offset(offset)
             .limit(per_page)
         ).all()
@@ -299,6 +325,7 @@ class ApplicationService:
                 "relocation": application.relocation,
                 "additional_info": application.additional_info,
                 "status": application.status,
+                "match_score": application.match_score if application.match_score_version == job.updated_at else None,
                 "created_at": application.created_at.isoformat(),
                 "updated_at": application.updated_at.isoformat(),
                 "resume_path": application.resume_path,
@@ -3,11 +3,23 @@ Database backup and recovery service
 """
 import os
 import shutil
-import gzip
 import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 from flask import current_app
+from sqlalchemy.engine import make_url
+from app.extensions import db
+from app.services.backup_compression import (
+    COMPRESSED_SUFFIXES,
+    available_compressors,
+    get_compressor,
+    measure_compressor,
+    open_compressed,
+)
+from app.services.postgres_backup import PostgresBackupEngine, ARCHIVE_SUFFIX as PG_ARCHIVE_SUFFIX
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,43 +27,172 @@ logger = logging.getLogger(__name__)
 class DatabaseBackupService:
     """Service for database backup and recovery operations"""
     
+    # Size of the slices written into the compressor
+    STREAM_CHUNK_SIZE = 1024 * 1024
+    # Archive suffixes produced by the SQLite and PostgreSQL engines
+    BACKUP_SUFFIXES = tuple(f".db{suffix}" for suffix in COMPRESSED_SUFFIXES) + (PG_ARCHIVE_SUFFIX,)
+    BACKUP_PATTERNS = tuple(f"*{suffix}" for suffix in BACKUP_SUFFIXES)
+    
     def __init__(self):
         self.backup_dir = Path(current_app.instance_path) / "backups"
-        self.backup_dir.mkdir(exist_ok=True)
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self.last_backup_stats = None
+    
+    def _dialect(self):
+        """Backend name of the configured database (sqlite, postgresql, ...)"""
+        return make_url(current_app.config['SQLALCHEMY_DATABASE_URI']).get_backend_name()
+    
+    def _postgres_engine(self, compressor=None):
+        return PostgresBackupEngine(
+            db.engine,
+            db.metadata,
+            workers=current_app.config.get('BACKUP_PARALLEL_WORKERS', 4),
+            compressor=compressor or get_compressor(),
+        )
+    
+    def _backup_files(self):
+        for pattern in self.BACKUP_PATTERNS:
+            yield from self.backup_dir.glob(pattern)
+    
+    @staticmethod
+    def _backup_name(backup_file):
+        name = backup_file.name
+        for suffix in DatabaseBackupService.BACKUP_SUFFIXES:
+            if name.endswith(suffix):
+                return name[:-len(suffix)]
+        return backup_file.stem
+    
+    def _sqlite_db_path(self, operation):
+        """Resolve the SQLite database file from the configured URI"""
+        db_uri = current_app.config['SQLALCHEMY_DATABASE_URI']
+        if not db_uri.startswith('sqlite:///'):
+            raise ValueError(f"{operation} only supported for SQLite and PostgreSQL databases")
+        db_path = db_uri.replace('sqlite:///', '')
+        if not os.path.isabs(db_path):
+            db_path = os.path.join(current_app.instance_path, db_path)
+        return db_path
+    
+    def _step_progress(self):
+        """Progress callback for Connection.backup that yields between page batches"""
+        pause = current_app.config.get('BACKUP_STEP_PAUSE_SECONDS', 0)
+        steps = {'count': 0}
+        
+        def progress(status, remaining, total):
+            steps['count'] += 1
+            # The source lock is released between steps; pausing lets writers in
+            if pause and remaining:
+                time.sleep(pause)
+        
+        return progress, steps
     
-    def create_backup(self, backup_name=None):
-        """Create a backup of the database"""
+    @contextmanager
+    def _scratch_file(self, suffix):
+        """Path of an empty temporary file under backup_dir, removed on exit"""
+        fd, path = tempfile.mkstemp(prefix='.', suffix=suffix, dir=self.backup_dir)
+        os.close(fd)
+        path = Path(path)
         try:
-            # Get database path
-            db_uri = current_app.config['SQLALCHEMY_DATABASE_URI']
-            if db_uri.startswith('sqlite:///'):
-                db_path = db_uri.replace('sqlite:///', '')
-                if not os.path.isabs(db_path):
-                    db_path = os.path.join(current_app.instance_path, db_path)
-            else:
-                raise ValueError("Backup only supported for SQLite databases")
-            
-            if not os.path.exists(db_path):
-                raise FileNotFoundError(f"Database file not found: {db_path}")
-            
+            yield path
+        finally:
+            path.unlink(missing_ok=True)
+            path.with_name(f"{path.name}-journal").unlink(missing_ok=True)
+    
+    @contextmanager
+    def _snapshot_sqlite(self, db_path):
+        """Copy a live SQLite database into a temporary file with the online backup API.
+        
+        Pages are copied in batches of BACKUP_PAGES_PER_STEP so concurrent
+        writers are only blocked for one batch at a time. Yields the path of
+        the snapshot and the number of backup steps taken; the file is
+        removed on exit.
+        
+        The snapshot is an uncompressed copy of the database on disk, so a
+        backup needs that much free space under backup_dir and reads the data
+        twice: once from the live database and once more to compress it. The
+        backup API only writes to another database, and the alternatives
+        (serialize, an in-memory target) hold the whole image in RAM.
+        """
+        pages_per_step = current_app.config.get('BACKUP_PAGES_PER_STEP', 1024)
+        progress, steps = self._step_progress()
+        with self._scratch_file('.snapshot') as snapshot_path:
+            source = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+            snapshot = sqlite3.connect(snapshot_path)
+            try:
+                source.backup(snapshot, pages=pages_per_step, progress=progress)
+                integrity = snapshot.execute("PRAGMA integrity_check").fetchone()[0]
+                if integrity != 'ok':
+                    raise RuntimeError(f"Backup snapshot failed integrity check: {integrity}")
+            finally:
+                snapshot.close()
+                source.close()
+            yield snapshot_path, steps['count']
+    
+    def _restore_sqlite_file(self, db_path, image_path):
+        """Copy an SQLite image file over the live database with the backup API"""
+        restored = sqlite3.connect(f"{Path(image_path).resolve().as_uri()}?mode=ro", uri=True)
+        target = sqlite3.connect(db_path)
+        try:
+            integrity = restored.execute("PRAGMA integrity_check").fetchone()[0]
+            if integrity != 'ok':
+                raise RuntimeError(f"Backup failed integrity check: {integrity}")
+            restored.backup(target, pages=current_app.config.get('BACKUP_PAGES_PER_STEP', 1024))
+        finally:
+            target.close()
+            restored.close()
+    
+    def create_backup(self, backup_name=None, compressor=None):
+        """Create an online backup of the database.
+        
+        SQLite databases are first snapshotted to a scratch file (see
+        _snapshot_sqlite), which is then compressed; PostgreSQL tables are
+        compressed as COPY streams them out.
+        """
+        try:
+            compressor = compressor or get_compressor()
             # Generate backup filename
             if not backup_name:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 backup_name = f"backup_{timestamp}"
             
-            backup_path = self.backup_dir / f"{backup_name}.db"
-            compressed_path = self.backup_dir / f"{backup_name}.db.gz"
+            if self._dialect() == 'postgresql':
+                archive_path = self.backup_dir / f"{backup_name}{PG_ARCHIVE_SUFFIX}"
+                self.last_backup_stats = self._postgres_engine(compressor).dump(archive_path)
+                self.last_backup_stats.update(compressor=compressor.name, threads=compressor.threads)
+                logger.info(f"Database backup created: {archive_path}")
+                return str(archive_path)
+            
+            db_path = self._sqlite_db_path("Backup")
+            
+            if not os.path.exists(db_path):
+                raise FileNotFoundError(f"Database file not found: {db_path}")
             
-            # Create backup
-            shutil.copy2(db_path, backup_path)
+            compressed_path = self.backup_dir / f"{backup_name}.db{compressor.suffix}"
+            partial_path = self.backup_dir / f"{backup_name}.db{compressor.suffix}.partial"
             
-            # Compress backup
-            with open(backup_path, 'rb') as f_in:
-                with gzip.open(compressed_path, 'wb') as f_out:
-                    shutil.copyfileobj(f_in, f_out)
+            started = time.perf_counter()
+            # Second pass: compress the uncompressed snapshot a block at a time
+            with self._snapshot_sqlite(db_path) as (snapshot_path, steps):
+                database_bytes = snapshot_path.stat().st_size
+                try:
+                    with open(snapshot_path, 'rb') as f_in, compressor.open(partial_path) as f_out:
+                        shutil.copyfileobj(f_in, f_out, self.STREAM_CHUNK_SIZE)
+                    os.replace(partial_path, compressed_path)
+                finally:
+                    if partial_path.exists():
+                        partial_path.unlink()
             
-            # Remove uncompressed backup
-            backup_path.unlink()
+            elapsed = time.perf_counter() - started
+            self.last_backup_stats = {
+                'path': str(compressed_path),
+                'database_bytes': database_bytes,
+                'compressed_bytes': compressed_path.stat().st_size,
+                'seconds': round(elapsed, 3),
+                'throughput_mb_s': round(database_bytes / (1024 * 1024) / elapsed, 2) if elapsed else None,
+                'steps': steps,
+                'integrity_check': 'ok',
+                'compressor': compressor.name,
+                'threads': compressor.threads,
+            }
             
             logger.info(f"Database backup created: {compressed_path}")
             return str(compressed_path)
@@ -63,31 +204,34 @@ class DatabaseBackupService:
     def restore_backup(self, backup_path):
         """Restore database from backup"""
         try:
-            # Get database path
-            db_uri = current_app.config['SQLALCHEMY_DATABASE_URI']
-            if db_uri.startswith('sqlite:///'):
-                db_path = db_uri.replace('sqlite:///', '')
-                if not os.path.isabs(db_path):
-                    db_path = os.path.join(current_app.instance_path, db_path)
-            else:
-                raise ValueError("Restore only supported for SQLite databases")
-            
             backup_path = Path(backup_path)
             if not backup_path.exists():
                 raise FileNotFoundError(f"Backup file not found: {backup_path}")
             
+            if self._dialect() == 'postgresql':
+                if not backup_path.name.endswith(PG_ARCHIVE_SUFFIX):
+                    raise ValueError(f"PostgreSQL restore expects a {PG_ARCHIVE_SUFFIX} archive")
+                current_backup = self.create_backup(f"pre_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+                logger.info(f"Created pre-restore backup: {current_backup}")
+                # Release pooled connections so tables can be dropped
+                db.session.remove()
+                stats = self._postgres_engine().restore(backup_path)
+                logger.info(f"Database restored from: {backup_path} ({stats['tables']} tables, {stats['rows']} rows)")
+                return True
+            
+            db_path = self._sqlite_db_path("Restore")
+            
             # Create backup of current database before restore
             if os.path.exists(db_path):
                 current_backup = self.create_backup(f"pre_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
                 logger.info(f"Created pre-restore backup: {current_backup}")
             
-            # Decompress and restore
-            if backup_path.suffix == '.gz':
-                with gzip.open(backup_path, 'rb') as f_in:
-                    with open(db_path, 'wb') as f_out:
-                        shutil.copyfileobj(f_in, f_out)
-            else:
-                shutil.copy2(backup_path, db_path)
+            # Decompress into a temporary file and copy it over the live database
+            # with the backup API so open connections see a consistent file
+            with self._scratch_file('.restore') as image_path:
+                with open_compressed(backup_path) as f_in, open(image_path, 'wb') as f_out:
+                    shutil.copyfileobj(f_in, f_out, self.STREAM_CHUNK_SIZE)
+                self._restore_sqlite_file(db_path, image_path)
             
             logger.info(f"Database restored from: {backup_path}")
             return True
@@ -99,10 +243,10 @@ class DatabaseBackupService:
     def list_backups(self):
         """List all available backups"""
         backups = []
-        for backup_file in self.backup_dir.glob("*.db.gz"):
+        for backup_file in self._backup_files():
             stat = backup_file.stat()
             backups.append({
-                'name': backup_file.stem.replace('.db', ''),
+                'name': self._backup_name(backup_file),
                 'path': str(backup_file),
                 'size': stat.st_size,
                 'created': datetime.fromtimestamp(stat.st_ctime),
@@ -116,7 +260,7 @@ class DatabaseBackupService:
         cutoff_date = datetime.now() - timedelta(days=days_to_keep)
         removed_count = 0
         
-        for backup_file in self.backup_dir.glob("*.db.gz"):
+        for backup_file in self._backup_files():
             if datetime.fromtimestamp(backup_file.stat().st_ctime) < cutoff_date:
                 backup_file.unlink()
                 removed_count += 1
@@ -132,35 +276,90 @@ class DatabaseBackupService:
             if not backup_path.exists():
                 return False, "Backup file not found"
             
-            # Try to open and read the backup
-            if backup_path.suffix == '.gz':
-                with gzip.open(backup_path, 'rb') as f:
-                    # Read first few bytes to check if it's a valid SQLite file
-                    header = f.read(16)
-                    if not header.startswith(b'SQLite format 3'):
-                        return False, "Invalid SQLite backup file"
-            else:
-                with open(backup_path, 'rb') as f:
-                    header = f.read(16)
-                    if not header.startswith(b'SQLite format 3'):
-                        return False, "Invalid SQLite backup file"
+            if backup_path.name.endswith(PG_ARCHIVE_SUFFIX):
+                manifest = PostgresBackupEngine.read_manifest(backup_path)
+                if manifest.get('format') != 'jobboard-pgcopy':
+                    return False, "Invalid PostgreSQL backup archive"
+                return True, f"Backup archive is valid ({len(manifest['tables'])} tables)"
+            
+            # Read first few bytes to check if it's a valid SQLite file
+            with open_compressed(backup_path) as f:
+                header = f.read(16)
+                if not header.startswith(b'SQLite format 3'):
+                    return False, "Invalid SQLite backup file"
             
             return True, "Backup file is valid"
             
         except Exception as e:
             return False, f"Error verifying backup: {e}"
+    
+    def _sample_database(self, sample_bytes):
+        """Uncompressed bytes of the live database, as a backup would see them.
+        
+        Reading stops after ``sample_bytes`` when given.
+        """
+        if self._dialect() == 'postgresql':
+            return self._postgres_engine().sample(sample_bytes)
+        
+        # A compression benchmark only needs data shaped like the database, so
+        # the file is read directly rather than through a consistent snapshot
+        with open(self._sqlite_db_path("Benchmark"), 'rb') as f:
+            return f.read(sample_bytes) if sample_bytes else f.read()
+    
+    def benchmark_compression(self, compressors=None, levels=None, threads=None, sample_bytes=None):
+        """Compress the live database in memory with each compressor.
+        
+        Nothing is written to disk. Returns one result per compressor/level,
+        sorted by throughput.
+        """
+        data = self._sample_database(sample_bytes)
+        results = []
+        for name in compressors or available_compressors():
+            for level in levels or [None]:
+                compressor = get_compressor(name, level=level, threads=threads)
+                results.append(measure_compressor(compressor, data))
+        return sorted(results, key=lambda r: r['throughput_mb_s'] or 0, reverse=True)
 
 def create_backup_command():
     """Flask CLI command to create backup"""
     from flask.cli import with_appcontext
+    import click
     
     @with_appcontext
-    def create_backup():
+    @click.option('--incremental', is_flag=True, help='Take a deduplicated snapshot including static/ documents')
+    @click.option('--name', default=None, help='Backup or snapshot name')
+    @click.option('--compressor', default=None, help='gzip, pgzip, zstd or lz4 (default: BACKUP_COMPRESSOR)')
+    def create_backup(incremental, name, compressor):
         """Create a database backup"""
         try:
+            if incremental:
+                from app.services.incremental_backup_service import IncrementalBackupService
+                snapshot_service = IncrementalBackupService()
+                snapshot_name = snapshot_service.create_snapshot(name)
+                stats = snapshot_service.last_snapshot_stats
+                print(f"✅ Snapshot created successfully: {snapshot_name}")
+                print(
+                    f"   {stats['logical_bytes'] / (1024 * 1024):.2f}MB in {stats['chunks']} chunks, "
+                    f"{stats['new_chunks']} new ({stats['new_bytes'] / (1024 * 1024):.2f}MB written), "
+                    f"{stats['files_changed']} changed / {stats['files_reused']} unchanged files "
+                    f"in {stats['seconds']}s"
+                )
+                return
+            
             backup_service = DatabaseBackupService()
-            backup_path = backup_service.create_backup()
+            backup_path = backup_service.create_backup(name, get_compressor(compressor) if compressor else None)
+            stats = backup_service.last_backup_stats
             print(f"✅ Backup created successfully: {backup_path}")
+            details = [f"{stats['throughput_mb_s']} MB/s", f"{stats['compressor']} x{stats['threads']}"]
+            if 'tables' in stats:
+                details.append(f"{stats['tables']} tables, {stats['rows']} rows")
+            if 'steps' in stats:
+                details.append(f"{stats['steps']} steps, integrity {stats['integrity_check']}")
+            print(
+                f"   {stats['database_bytes'] / (1024 * 1024):.2f}MB -> "
+                f"{stats['compressed_bytes'] / (1024 * 1024):.2f}MB in {stats['seconds']}s "
+                f"({', '.join(details)})"
+            )
         except Exception as e:
             print(f"❌ Failed to create backup: {e}")
             return 1
@@ -173,13 +372,36 @@ def restore_backup_command():
     import click
     
     @with_appcontext
-    @click.argument('backup_path')
-    def restore_backup(backup_path):
+    @click.argument('backup_path', required=False)
+    @click.option('--snapshot', default=None, help='Restore an incremental snapshot by name')
+    @click.option('--no-database', is_flag=True, help='Snapshot restore: leave the database alone')
+    @click.option('--no-files', is_flag=True, help='Snapshot restore: leave static/ documents alone')
+    @click.option('--prune-files', is_flag=True, help='Snapshot restore: delete documents not in the snapshot')
+    def restore_backup(backup_path, snapshot, no_database, no_files, prune_files):
         """Restore database from backup"""
         try:
+            if snapshot:
+                from app.services.incremental_backup_service import IncrementalBackupService
+                summary = IncrementalBackupService().restore_snapshot(
+                    snapshot,
+                    restore_database=not no_database,
+                    restore_files=not no_files,
+                    prune_files=prune_files,
+                )
+                print(f"✅ Snapshot restored successfully: {snapshot}")
+                print(
+                    f"   {summary['files_written']} files written, {summary['files_unchanged']} unchanged, "
+                    f"{summary['files_removed']} removed (pre-restore snapshot: {summary['pre_restore_snapshot']})"
+                )
+                return
+            if not backup_path:
+                raise click.UsageError("Pass a BACKUP_PATH or --snapshot NAME")
+            
             backup_service = DatabaseBackupService()
             backup_service.restore_backup(backup_path)
             print(f"✅ Database restored successfully from: {backup_path}")
+        except click.UsageError:
+            raise
         except Exception as e:
             print(f"❌ Failed to restore backup: {e}")
             return 1
@@ -194,21 +416,101 @@ def list_backups_command():
     def list_backups():
         """List all available backups"""
         try:
+            from app.services.incremental_backup_service import IncrementalBackupService
             backup_service = DatabaseBackupService()
             backups = backup_service.list_backups()
+            snapshots = IncrementalBackupService().list_snapshots()
             
-            if not backups:
+            if not backups and not snapshots:
                 print("No backups found")
                 return
             
-            print(f"{'Name':<30} {'Size':<10} {'Created':<20}")
-            print("-" * 60)
-            for backup in backups:
-                size_mb = backup['size'] / (1024 * 1024)
-                print(f"{backup['name']:<30} {size_mb:.2f}MB {backup['created'].strftime('%Y-%m-%d %H:%M:%S')}")
+            if backups:
+                print(f"{'Name':<30} {'Size':<10} {'Created':<20}")
+                print("-" * 60)
+                for backup in backups:
+                    size_mb = backup['size'] / (1024 * 1024)
+                    print(f"{backup['name']:<30} {size_mb:.2f}MB {backup['created'].strftime('%Y-%m-%d %H:%M:%S')}")
+            
+            if snapshots:
+                if backups:
+                    print()
+                print(f"{'Snapshot':<30} {'Files':<8} {'Written':<10} {'Created':<20}")
+                print("-" * 70)
+                for snapshot in snapshots:
+                    written_mb = snapshot['new_bytes'] / (1024 * 1024)
+                    print(
+                        f"{snapshot['name']:<30} {snapshot['files']:<8} {written_mb:.2f}MB "
+                        f"{snapshot['created'].strftime('%Y-%m-%d %H:%M:%S')}"
+                    )
                 
         except Exception as e:
             print(f"❌ Failed to list backups: {e}")
             return 1
     
     return list_backups
+
+def prune_snapshots_command():
+    """Flask CLI command to delete snapshots and unreferenced chunks"""
+    from flask.cli import with_appcontext
+    import click
+    
+    @with_appcontext
+    @click.argument('names', nargs=-1)
+    def prune_snapshots(names):
+        """Delete the named snapshots, then remove chunks no snapshot uses"""
+        try:
+            from app.services.incremental_backup_service import IncrementalBackupService
+            snapshot_service = IncrementalBackupService()
+            for name in names:
+                snapshot_service.delete_snapshot(name)
+                print(f"Deleted snapshot {name}")
+            result = snapshot_service.collect_garbage()
+            print(
+                f"✅ Removed {result['chunks_removed']} unreferenced chunks "
+                f"({result['bytes_freed'] / (1024 * 1024):.2f}MB)"
+            )
+        except Exception as e:
+            print(f"❌ Failed to prune snapshots: {e}")
+            return 1
+    
+    return prune_snapshots
+
+def benchmark_compression_command():
+    """Flask CLI command to compare backup compressors on the live database"""
+    from flask.cli import with_appcontext
+    import click
+    
+    @with_appcontext
+    @click.option('--compressor', 'compressors', multiple=True, help='Compressor to include (repeatable; default: all installed)')
+    @click.option('--level', 'levels', multiple=True, type=int, help='Compression level to try (repeatable)')
+    @click.option('--threads', type=int, default=None, help='Threads for parallel compressors')
+    @click.option('--sample-mb', type=float, default=None, help='Only compress the first N MB of the database')
+    def benchmark_compression(compressors, levels, threads, sample_mb):
+        """Compare compression ratio and throughput on the live database"""
+        try:
+            backup_service = DatabaseBackupService()
+            sample_bytes = int(sample_mb * 1024 * 1024) if sample_mb else None
+            results = backup_service.benchmark_compression(
+                compressors=list(compressors) or None,
+                levels=list(levels) or None,
+                threads=threads,
+                sample_bytes=sample_bytes,
+            )
+            if not results:
+                print("No compressors available")
+                return
+            
+            print(f"Input: {results[0]['input_bytes'] / (1024 * 1024):.2f}MB")
+            print(f"{'Compressor':<12} {'Level':<6} {'Threads':<8} {'Ratio':<8} {'MB/s':<10} {'Output':<10}")
+            print("-" * 60)
+            for r in results:
+                print(
+                    f"{r['compressor']:<12} {r['level']:<6} {r['threads']:<8} {r['ratio']:<8} "
+                    f"{r['throughput_mb_s']:<10} {r['output_bytes'] / (1024 * 1024):.2f}MB"
+                )
+        except Exception as e:
+            print(f"❌ Failed to run compression benchmark: {e}")
+            return 1
+    
+    return benchmark_compression
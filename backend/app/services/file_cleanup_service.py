@@ -1,5 +1,6 @@
 import os
 import shutil
+import time
 from pathlib import Path
 from typing import List, Optional
 from flask import current_app
@@ -8,6 +9,7 @@ from ..models.application import Application
 from ..models.job import Job
 from ..models.saved_job import SavedJob
 from sqlalchemy import select
+from .storage_ledger_service import StorageLedger, file_size
 
 
 class FileCleanupService:
@@ -21,116 +23,51 @@ class FileCleanupService:
             # Fallback for testing or when instance_path is not set
             self.static_folder = Path(__file__).parent.parent.parent / 'static'
     
-    def cleanup_job_files(self, job_id: int) -> dict:
+    def remove_documents(self, documents: List[tuple], batch_size: Optional[int] = None) -> dict:
         """
-        Clean up all files and folders associated with a job deletion.
-        This includes:
-        - All application files (resumes, cover letters)
-        - User-specific folders if empty
-        - Job-specific folders
-        
-        Returns:
-            dict: Cleanup summary with counts and paths
-        """
-        cleanup_summary = {
-            'files_deleted': 0,
-            'folders_deleted': 0,
-            'errors': [],
-            'deleted_paths': []
-        }
-        
-        try:
-            # Get all applications for this job
-            applications = db.session.execute(
-                select(Application).where(Application.job_id == job_id)
-            ).scalars().all()
-            
-            # Track user folders to potentially clean up
-            user_folders_to_check = set()
-            
-            # Delete application files
-            for application in applications:
-                user_folders_to_check.add(application.user_id)
-                
-                # Delete resume file
-                if application.resume_path:
-                    resume_path = self.static_folder / application.resume_path
-                    if self._delete_file(resume_path):
-                        cleanup_summary['files_deleted'] += 1
-                        cleanup_summary['deleted_paths'].append(str(resume_path))
-                
-                # Delete cover letter file
-                if application.cover_letter_path:
-                    cover_letter_path = self.static_folder / application.cover_letter_path
-                    if self._delete_file(cover_letter_path):
-                        cleanup_summary['files_deleted'] += 1
-                        cleanup_summary['deleted_paths'].append(str(cover_letter_path))
-            
-            # Clean up empty user folders
-            for user_id in user_folders_to_check:
-                user_folder = self.static_folder / 'applications' / str(user_id)
-                if self._cleanup_empty_folder(user_folder):
-                    cleanup_summary['folders_deleted'] += 1
-                    cleanup_summary['deleted_paths'].append(str(user_folder))
-            
-            # Clean up job-specific folder if it exists
-            job_folder = self.static_folder / 'jobs' / str(job_id)
-            if self._cleanup_empty_folder(job_folder):
-                cleanup_summary['folders_deleted'] += 1
-                cleanup_summary['deleted_paths'].append(str(job_folder))
-            
-        except Exception as e:
-            cleanup_summary['errors'].append(f"Error during cleanup: {str(e)}")
-            current_app.logger.error(f"File cleanup error for job {job_id}: {str(e)}")
-        
-        return cleanup_summary
-    
-    def cleanup_user_files(self, user_id: int) -> dict:
-        """
-        Clean up all files associated with a user deletion.
-        This includes all their application files and folders.
+        Delete documents whose application rows are already gone.
+
+        ``documents`` holds (user_id, job_id, doc_type, stored_path) tuples.
+        Files are removed in batches; each batch's ledger decrements are
+        committed together, then emptied folders are pruned. Meant to run
+        after the deleting transaction commits, off the request thread.
         """
+        batch_size = batch_size or current_app.config.get('FILE_CLEANUP_BATCH_SIZE', 200)
         cleanup_summary = {
             'files_deleted': 0,
             'folders_deleted': 0,
             'errors': [],
             'deleted_paths': []
         }
-        
-        try:
-            # Get all applications for this user
-            applications = db.session.execute(
-                select(Application).where(Application.user_id == user_id)
-            ).scalars().all()
-            
-            # Delete all application files
-            for application in applications:
-                # Delete resume file
-                if application.resume_path:
-                    resume_path = self.static_folder / application.resume_path
-                    if self._delete_file(resume_path):
-                        cleanup_summary['files_deleted'] += 1
-                        cleanup_summary['deleted_paths'].append(str(resume_path))
-                
-                # Delete cover letter file
-                if application.cover_letter_path:
-                    cover_letter_path = self.static_folder / application.cover_letter_path
-                    if self._delete_file(cover_letter_path):
+        ledger = StorageLedger()
+
+        for start in range(0, len(documents), batch_size):
+            touched_dirs = set()
+            try:
+                for user_id, job_id, doc_type, stored_path in documents[start:start + batch_size]:
+                    path = self.static_folder / stored_path
+                    size = file_size(path)
+                    if self._delete_file(path):
                         cleanup_summary['files_deleted'] += 1
-                        cleanup_summary['deleted_paths'].append(str(cover_letter_path))
-            
-            # Clean up user folder
-            user_folder = self.static_folder / 'applications' / str(user_id)
-            if self._cleanup_empty_folder(user_folder):
-                cleanup_summary['folders_deleted'] += 1
-                cleanup_summary['deleted_paths'].append(str(user_folder))
-            
-        except Exception as e:
-            cleanup_summary['errors'].append(f"Error during user cleanup: {str(e)}")
-            current_app.logger.error(f"User file cleanup error for user {user_id}: {str(e)}")
-        
+                        if len(cleanup_summary['deleted_paths']) < self.MAX_REPORTED_PATHS:
+                            cleanup_summary['deleted_paths'].append(str(path))
+                        ledger.record_delete(user_id, job_id, doc_type, size)
+                        touched_dirs.add(path.parent)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                cleanup_summary['errors'].append(f"Error during document removal: {str(e)}")
+                current_app.logger.error(f"Document removal error: {str(e)}")
+            for directory in touched_dirs:
+                self._prune_empty_parents(directory, cleanup_summary)
+
+        if documents:
+            current_app.logger.info(
+                f"Removed {cleanup_summary['files_deleted']} of {len(documents)} documents, "
+                f"{cleanup_summary['folders_deleted']} folders"
+            )
         return cleanup_summary
-    
+
     def _delete_file(self, file_path: Path) -> bool:
         """Safely delete a file if it exists"""
         try:
@@ -157,44 +94,110 @@ class FileCleanupService:
             current_app.logger.error(f"Failed to delete folder {folder_path}: {str(e)}")
             return False
     
-    def cleanup_orphaned_files(self) -> dict:
+    # Top-level folders under static/ that hold application documents:
+    # users/<uid>/applications/<app_id>/... (current) and applications/<uid>/... (legacy)
+    DOCUMENT_ROOTS = ('users', 'applications')
+    # Cap on paths echoed back in a sweep summary
+    MAX_REPORTED_PATHS = 1000
+    
+    def _iter_document_files(self):
+        """Yield (relative path, DirEntry) for every file in the document roots.
+        
+        Walks with os.scandir and an explicit stack, so memory is bounded by
+        the directory depth rather than the number of files.
+        """
+        for root_name in self.DOCUMENT_ROOTS:
+            stack = [self.static_folder / root_name]
+            while stack:
+                directory = stack.pop()
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                yield str(Path(entry.path).relative_to(self.static_folder)), entry
+                except (FileNotFoundError, NotADirectoryError):
+                    continue
+    
+    def _referenced_paths(self, candidates: List[str]) -> set:
+        """Subset of ``candidates`` referenced by an application"""
+        found = set(db.session.execute(
+            select(Application.resume_path).where(Application.resume_path.in_(candidates))
+        ).scalars())
+        found.update(db.session.execute(
+            select(Application.cover_letter_path).where(Application.cover_letter_path.in_(candidates))
+        ).scalars())
+        return found
+    
+    def _prune_empty_parents(self, directory: Path, summary: dict) -> None:
+        """Remove ``directory`` and its parents while empty, stopping at the document roots"""
+        roots = {self.static_folder / name for name in self.DOCUMENT_ROOTS}
+        while directory not in roots and self.static_folder in directory.parents:
+            if not self._cleanup_empty_folder(directory):
+                return
+            summary['folders_deleted'] += 1
+            if len(summary['deleted_paths']) < self.MAX_REPORTED_PATHS:
+                summary['deleted_paths'].append(str(directory))
+            directory = directory.parent
+    
+    def cleanup_orphaned_files(self, dry_run: bool = False, batch_size: Optional[int] = None,
+                               min_age_seconds: Optional[int] = None) -> dict:
         """
         Clean up orphaned files that don't have corresponding database records.
         This is useful for maintenance tasks.
+        
+        Files are streamed from disk and checked against the database in
+        batches, so memory stays flat however many documents there are.
+        Files younger than ``min_age_seconds`` are skipped: uploads are
+        written before their application row is committed. With
+        ``dry_run`` nothing is deleted and the summary lists what would be.
         """
+        config = current_app.config
+        batch_size = batch_size or config.get('ORPHAN_SWEEP_BATCH_SIZE', 500)
+        if min_age_seconds is None:
+            min_age_seconds = config.get('ORPHAN_SWEEP_MIN_AGE_SECONDS', 3600)
+        cutoff = time.time() - min_age_seconds
+        
         cleanup_summary = {
+            'dry_run': dry_run,
+            'files_scanned': 0,
             'files_deleted': 0,
+            'bytes_reclaimed': 0,
             'folders_deleted': 0,
             'errors': [],
             'deleted_paths': []
         }
         
+        def process(batch):
+            referenced = self._referenced_paths([rel for rel, _, _ in batch])
+            touched_dirs = set()
+            for rel, path, size in batch:
+                if rel in referenced:
+                    continue
+                if dry_run or self._delete_file(path):
+                    cleanup_summary['files_deleted'] += 1
+                    cleanup_summary['bytes_reclaimed'] += size
+                    if len(cleanup_summary['deleted_paths']) < self.MAX_REPORTED_PATHS:
+                        cleanup_summary['deleted_paths'].append(str(path))
+                    touched_dirs.add(path.parent)
+            if not dry_run:
+                for directory in touched_dirs:
+                    self._prune_empty_parents(directory, cleanup_summary)
+        
         try:
-            # Get all application file paths from database
-            applications = db.session.execute(select(Application)).scalars().all()
-            valid_paths = set()
-            
-            for app in applications:
-                if app.resume_path:
-                    valid_paths.add(self.static_folder / app.resume_path)
-                if app.cover_letter_path:
-                    valid_paths.add(self.static_folder / app.cover_letter_path)
-            
-            # Scan applications folder for orphaned files
-            applications_folder = self.static_folder / 'applications'
-            if applications_folder.exists():
-                for user_folder in applications_folder.iterdir():
-                    if user_folder.is_dir():
-                        for file_path in user_folder.rglob('*'):
-                            if file_path.is_file() and file_path not in valid_paths:
-                                if self._delete_file(file_path):
-                                    cleanup_summary['files_deleted'] += 1
-                                    cleanup_summary['deleted_paths'].append(str(file_path))
-                        
-                        # Clean up empty user folders
-                        if self._cleanup_empty_folder(user_folder):
-                            cleanup_summary['folders_deleted'] += 1
-                            cleanup_summary['deleted_paths'].append(str(user_folder))
+            batch = []
+            for rel, entry in self._iter_document_files():
+                cleanup_summary['files_scanned'] += 1
+                st = entry.stat(follow_symlinks=False)
+                if st.st_mtime > cutoff:
+                    continue
+                batch.append((rel, Path(entry.path), st.st_size))
+                if len(batch) >= batch_size:
+                    process(batch)
+                    batch = []
+            if batch:
+                process(batch)
             
         except Exception as e:
             cleanup_summary['errors'].append(f"Error during orphaned file cleanup: {str(e)}")
@@ -203,7 +206,11 @@ class FileCleanupService:
         return cleanup_summary
     
     def get_storage_stats(self) -> dict:
-        """Get storage statistics for the static folder"""
+        """Get storage statistics for uploaded documents.
+        
+        Read from the storage ledger, so this is a constant-time query; the
+        unreferenced figures are as of the last reconciliation.
+        """
         stats = {
             'total_files': 0,
             'total_size_bytes': 0,
@@ -213,23 +220,63 @@ class FileCleanupService:
         }
         
         try:
-            if self.static_folder.exists():
-                for file_path in self.static_folder.rglob('*'):
-                    if file_path.is_file():
-                        file_size = file_path.stat().st_size
-                        stats['total_files'] += 1
-                        stats['total_size_bytes'] += file_size
-                        
-                        # Categorize by folder
-                        relative_path = file_path.relative_to(self.static_folder)
-                        if len(relative_path.parts) > 0 and relative_path.parts[0] == 'applications':
-                            stats['applications_folder_size'] += file_size
-                        elif len(relative_path.parts) > 0 and relative_path.parts[0] == 'jobs':
-                            stats['jobs_folder_size'] += file_size
-                        else:
-                            stats['other_files_size'] += file_size
+            ledger_stats = StorageLedger().stats()
+            stats.update(ledger_stats)
+            # Legacy folder breakdown: every tracked document is an application file
+            stats['applications_folder_size'] = ledger_stats['total_size_bytes']
+            stats['other_files_size'] = ledger_stats['unreferenced_size_bytes']
             
         except Exception as e:
             current_app.logger.error(f"Error getting storage stats: {str(e)}")
         
         return stats
+
+
+def sweep_orphans_command():
+    """Flask CLI command to remove documents no application references"""
+    from flask.cli import with_appcontext
+    import click
+    
+    @with_appcontext
+    @click.option('--dry-run', is_flag=True, help='Only report what would be deleted')
+    @click.option('--batch-size', type=int, default=None, help='Paths checked per database query')
+    @click.option('--min-age', 'min_age_seconds', type=int, default=None,
+                  help='Skip files modified within this many seconds')
+    def sweep_orphans(dry_run, batch_size, min_age_seconds):
+        """Delete uploaded documents that no application references"""
+        summary = FileCleanupService().cleanup_orphaned_files(
+            dry_run=dry_run, batch_size=batch_size, min_age_seconds=min_age_seconds
+        )
+        verb = "Would delete" if dry_run else "Deleted"
+        print(
+            f"Scanned {summary['files_scanned']} files. {verb} {summary['files_deleted']} orphans "
+            f"({summary['bytes_reclaimed'] / (1024 * 1024):.2f}MB), removed {summary['folders_deleted']} empty folders"
+        )
+        for path in summary['deleted_paths']:
+            print(f"  {path}")
+        for error in summary['errors']:
+            print(f"❌ {error}")
+        return 1 if summary['errors'] else None
+    
+    return sweep_orphans
+
+
+def reconcile_storage_command():
+    """Flask CLI command to rebuild the storage ledger from disk"""
+    from flask.cli import with_appcontext
+    
+    @with_appcontext
+    def reconcile_storage():
+        """Re-scan static/ and rebuild the storage usage counters"""
+        stats = StorageLedger().reconcile()
+        if stats is None:
+            print("A reconciliation is already running")
+            return 1
+        print(
+            f"✅ Storage ledger rebuilt: {stats['total_files']} documents "
+            f"({stats['total_size_bytes'] / (1024 * 1024):.2f}MB), "
+            f"{stats['unreferenced_files']} unreferenced files "
+            f"({stats['unreferenced_size_bytes'] / (1024 * 1024):.2f}MB)"
+        )
+    
+    return reconcile_storage
@@ -0,0 +1,167 @@
+"""
+Background purge of soft-deleted jobs.
+
+Deleting a job only sets ``Job.deleted_at``; this service then removes its
+applications, saved-job rows, documents and finally the job row itself.
+Rows go in fixed-size batches, each in its own short transaction, with a
+pause after every full batch so a job with thousands of applicants doesn't
+hold locks or saturate the disk while it is cleaned up.
+"""
+import time
+
+from flask import current_app
+from sqlalchemy import delete, select
+
+from ..extensions import db
+from ..models.application import Application
+from ..models.job import Job
+from ..models.job_skill import JobSkill
+from ..models.saved_job import SavedJob
+from .file_cleanup_service import FileCleanupService
+
+
+class JobPurgeService:
+    """Remove soft-deleted jobs and everything that belongs to them"""
+
+    def __init__(self, batch_size: int | None = None, pause_seconds: float | None = None):
+        config = current_app.config
+        self.batch_size = batch_size or config.get('JOB_PURGE_BATCH_SIZE', 200)
+        self.pause_seconds = config.get('JOB_PURGE_PAUSE_SECONDS', 0.2) if pause_seconds is None else pause_seconds
+        self.file_cleanup = FileCleanupService()
+
+    def _throttle(self, rows_in_batch: int) -> None:
+        # Only full batches mean more work is waiting
+        if rows_in_batch >= self.batch_size and self.pause_seconds:
+            time.sleep(self.pause_seconds)
+
+    def _purge_applications(self, job_id: int, summary: dict) -> None:
+        while True:
+            rows = db.session.execute(
+                select(Application.id, Application.user_id, Application.resume_path, Application.cover_letter_path)
+                .where(Application.job_id == job_id)
+                .order_by(Application.id)
+                .limit(self.batch_size)
+            ).all()
+            if not rows:
+                return
+            db.session.execute(
+                delete(Application).where(Application.id.in_([row.id for row in rows])),
+                execution_options={'synchronize_session': False},
+            )
+            db.session.commit()
+            summary['applications_deleted'] += len(rows)
+
+            documents = []
+            for row in rows:
+                if row.resume_path:
+                    documents.append((row.user_id, job_id, 'resume', row.resume_path))
+                if row.cover_letter_path:
+                    documents.append((row.user_id, job_id, 'cover_letter', row.cover_letter_path))
+            cleanup = self.file_cleanup.remove_documents(documents, batch_size=self.batch_size)
+            summary['files_deleted'] += cleanup['files_deleted']
+            summary['folders_deleted'] += cleanup['folders_deleted']
+            summary['errors'].extend(cleanup['errors'])
+            self._throttle(len(rows))
+
+    def _purge_saved_jobs(self, job_id: int, summary: dict) -> None:
+        while True:
+            ids = db.session.execute(
+                select(SavedJob.id).where(SavedJob.job_id == job_id).limit(self.batch_size)
+            ).scalars().all()
+            if not ids:
+                return
+            db.session.execute(
+                delete(SavedJob).where(SavedJob.id.in_(ids)),
+                execution_options={'synchronize_session': False},
+            )
+            db.session.commit()
+            summary['saved_jobs_deleted'] += len(ids)
+            self._throttle(len(ids))
+
+    def purge_job(self, job_id: int) -> dict:
+        """Purge one soft-deleted job; a no-op for live or already purged jobs.
+
+        Safe to re-run after a failure: each batch commits on its own and the
+        job row, which marks the purge as pending, goes last.
+        """
+        summary = {
+            'job_id': job_id,
+            'applications_deleted': 0,
+            'saved_jobs_deleted': 0,
+            'files_deleted': 0,
+            'folders_deleted': 0,
+            'errors': [],
+        }
+        deleted_at = db.session.execute(select(Job.deleted_at).where(Job.id == job_id)).scalar_one_or_none()
+        if deleted_at is None:
+            return summary
+
+        try:
+            self._purge_applications(job_id, summary)
+            self._purge_saved_jobs(job_id, summary)
+            db.session.execute(delete(JobSkill).where(JobSkill.job_id == job_id))
+            db.session.execute(
+                delete(Job).where(Job.id == job_id, Job.deleted_at.is_not(None)),
+                execution_options={'synchronize_session': False},
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Purge of job {job_id} failed: {str(e)}")
+            raise
+
+        current_app.logger.info(
+            f"Purged job {job_id}: {summary['applications_deleted']} applications, "
+            f"{summary['saved_jobs_deleted']} saved jobs, {summary['files_deleted']} files"
+        )
+        return summary
+
+    def purge_pending(self, limit: int | None = None) -> dict:
+        """Purge every soft-deleted job, oldest deletion first"""
+        query = select(Job.id).where(Job.deleted_at.is_not(None)).order_by(Job.deleted_at)
+        if limit:
+            query = query.limit(limit)
+        job_ids = db.session.execute(query).scalars().all()
+
+        totals = {
+            'jobs_purged': 0,
+            'applications_deleted': 0,
+            'saved_jobs_deleted': 0,
+            'files_deleted': 0,
+            'errors': [],
+        }
+        for job_id in job_ids:
+            try:
+                summary = self.purge_job(job_id)
+            except Exception as e:
+                totals['errors'].append(f"Job {job_id}: {str(e)}")
+                continue
+            totals['jobs_purged'] += 1
+            for key in ('applications_deleted', 'saved_jobs_deleted', 'files_deleted'):
+                totals[key] += summary[key]
+            totals['errors'].extend(summary['errors'])
+        return totals
+
+
+def purge_deleted_jobs_command():
+    """Flask CLI command to purge soft-deleted jobs"""
+    from flask.cli import with_appcontext
+    import click
+
+    @with_appcontext
+    @click.option('--limit', type=int, default=None, help='Purge at most this many jobs')
+    @click.option('--batch-size', type=int, default=None, help='Rows deleted per transaction')
+    @click.option('--pause', 'pause_seconds', type=float, default=None,
+                  help='Seconds to sleep after each full batch')
+    def purge_deleted(limit, batch_size, pause_seconds):
+        """Remove deleted jobs with their applications and documents"""
+        totals = JobPurgeService(batch_size=batch_size, pause_seconds=pause_seconds).purge_pending(limit=limit)
+        print(
+            f"Purged {totals['jobs_purged']} jobs: {totals['applications_deleted']} applications, "
+            f"{totals['saved_jobs_deleted']} saved jobs, {totals['files_deleted']} files"
+        )
+        for error in totals['errors']:
+            print(f"❌ {error}")
+        return 1 if totals['errors'] else None
+
+    return purge_deleted
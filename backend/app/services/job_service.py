@@ -1,9 +1,65 @@
-from sqlalchemy import select, func
+import json
+import threading
+import time
+from hashlib import sha1
+from flask import current_app
+from sqlalchemy import select, func, update, literal, union_all, text
 from ..extensions import db
-from ..models.job import Job
+from ..models.job import Job, JOB_STATUS_ACTIVE, JOB_STATUS_DEPRECATED
+from ..models.saved_job import SavedJob
+from ..models.job_skill import JobSkill
 from ..common.exceptions import ConflictError
 from datetime import datetime, date, UTC, timedelta
-from .file_cleanup_service import FileCleanupService
+from .job_purge_service import JobPurgeService
+from ..common.background import run_in_background
+from ..common.cache import get_cache
+from .skill_index_service import SkillIndexService, MATCH_ALL
+from . import matching_service, suggest_service
+
+# Day the status transition last ran in this process
+_status_transition_day = None
+_status_transition_lock = threading.Lock()
+
+# Filters of the public search that come with per-value counts
+PUBLIC_FACETS = ("employment_type", "seniority", "work_mode", "visa_sponsorship")
+
+# Whether each database offers pg_trgm similarity(), by engine URL; checked once per process
+_pg_trgm = {}
+
+# Cached search pages live under the current generation; bumping it retires them all at once
+_SEARCH_GENERATION_KEY = "jobs:search:generation"
+
+
+def _search_generation() -> int | None:
+    """Current search cache generation; None if the cache is unavailable"""
+    cache = get_cache()
+    generation = cache.get(_SEARCH_GENERATION_KEY)
+    if generation is None:
+        # Seed from the clock rather than 0 so a counter lost to eviction or a
+        # cache restart never comes back to a generation whose pages still exist
+        cache.add(_SEARCH_GENERATION_KEY, time.time_ns(), ttl=0)
+        generation = cache.get(_SEARCH_GENERATION_KEY)
+    return generation
+
+
+def invalidate_job_caches(job_id: int | None = None) -> None:
+    """Retire cached search pages and drop the cached copies of ``job_id`` (or of every job).
+
+    Also patches this process's typeahead and matching indexes; call it after
+    the change is committed.
+    """
+    cache = get_cache()
+    if cache.incr(_SEARCH_GENERATION_KEY) == 1:
+        # The counter had been lost; see _search_generation
+        cache.set(_SEARCH_GENERATION_KEY, time.time_ns(), ttl=0)
+    if job_id is None:
+        cache.delete_prefix("jobs:detail:")
+        cache.delete_prefix("jobs:card:")
+    else:
+        cache.delete(f"jobs:detail:{job_id}")
+        cache.delete(f"jobs:card:{job_id}")
+    suggest_service.job_changed(job_id)
+    matching_service.job_changed(job_id)
 
 
 class JobService:
@@ -12,7 +68,7 @@ class JobService:
     def create_job(self, user_id: int, job_data: dict) -> dict:
         # Duplicate check (title per user)
         existing = db.session.execute(
-            select(Job).where(Job.user_id == user_id, Job.title == job_data["title"])
+            select(Job).where(Job.user_id == user_id, Job.title == job_data["title"], Job.deleted_at.is_(None))
         ).scalar_one_or_none()
         if existing:
             raise ConflictError("Job with the same title already exists for this user")
@@ -44,7 +100,10 @@ class JobService:
         )
 
         db.session.add(job)
+        db.session.flush()
+        SkillIndexService().sync(job.id, job.skills)
         db.session.commit()
+        invalidate_job_caches(job.id)
 
         return {
             "status": "created",
@@ -64,17 +123,17 @@ class JobService:
             page = 1
         if per_page < 1:
             per_page = 20
-        # Load all user's jobs ordered by created_at desc
-        base_q = select(Job).where(Job.user_id == user_id).order_by(Job.created_at.desc())
-        jobs = db.session.execute(base_q).scalars().all()
+        self._refresh_statuses()
+        base_q = select(Job).where(Job.user_id == user_id, Job.deleted_at.is_(None))
+        if status in {JOB_STATUS_ACTIVE, JOB_STATUS_DEPRECATED}:
+            base_q = base_q.where(Job.status == status)
+        total = db.session.execute(select(func.count()).select_from(base_q.subquery())).scalar() or 0
+        pages = (total + per_page - 1) // per_page if total else 1
+        jobs = db.session.execute(
+            base_q.order_by(Job.created_at.desc()).limit(per_page).offset((page - 1) * per_page)
+        ).scalars().all()
         results: list[dict] = []
-        today = datetime.now(UTC).date()
         for job in jobs:
-            # Compute status based on deadline
-            computed_status = "active"
-            if job.application_deadline and isinstance(job.application_deadline, date):
-                if job.application_deadline < today:
-                    computed_status = "deprecated"
             # Lightweight list DTO (omit large fields)
             results.append({
                 "id": job.id,
@@ -88,17 +147,8 @@ class JobService:
                 "application_deadline": job.application_deadline.isoformat() if job.application_deadline else None,
                 "created_at": job.created_at.isoformat() if job.created_at else None,
                 "updated_at": job.updated_at.isoformat() if job.updated_at else None,
-                "status": computed_status,
+                "status": job.status,
             })
-        # Filter by status in Python
-        if status in {"active", "deprecated"}:
-            results = [r for r in results if r.get("status") == status]
-        total = len(results)
-        pages = (total + per_page - 1) // per_page if total else 1
-        # Apply pagination in Python
-        start = (page - 1) * per_page
-        end = start + per_page
-        results = results[start:end]
         return {
             "jobs": results,
             "total": total,
@@ -113,6 +163,7 @@ class JobService:
         old_jobs = db.session.execute(
             select(Job).where(
                 Job.user_id == user_id,
+                Job.deleted_at.is_(None),
                 Job.application_deadline != None,  # noqa: E711
                 Job.application_deadline <= cutoff_date,
             )
@@ -126,19 +177,61 @@ class JobService:
         return deleted
 
     def count_active_jobs(self, user_id: int) -> int:
-        # Reuse list_jobs to ensure identical status logic
-        data = self.list_jobs(user_id=user_id, page=1, per_page=1000, status="active")
-        return len(data.get("jobs", []))
+        self._refresh_statuses()
+        return db.session.execute(
+            select(func.count(Job.id)).where(
+                Job.user_id == user_id, Job.status == JOB_STATUS_ACTIVE, Job.deleted_at.is_(None)
+            )
+        ).scalar() or 0
 
-    def get_job(self, user_id: int, job_id: int) -> dict | None:
+    def transition_job_statuses(self, today: date | None = None) -> int:
+        """Mark active jobs whose deadline has passed as deprecated; returns how many changed.
+
+        Meant to run once a day (``flask jobs transition-status``); it is an
+        index range scan over active jobs with an expired deadline.
+        """
+        today = today or datetime.now(UTC).date()
+        result = db.session.execute(
+            update(Job)
+            .where(Job.status == JOB_STATUS_ACTIVE, Job.application_deadline < today)
+            .values(status=JOB_STATUS_DEPRECATED),
+            execution_options={'synchronize_session': False},
+        )
+        db.session.commit()
+        if result.rowcount:
+            invalidate_job_caches()
+        return result.rowcount
+
+    def _refresh_statuses(self) -> None:
+        """Queue the daily transition if this process hasn't yet today.
+
+        Covers the gap between midnight and the scheduled run. The UPDATE
+        runs on the background runner with its own session, so read
+        requests never open a write transaction or commit their session.
+        """
+        global _status_transition_day
+        today = datetime.now(UTC).date()
+        if _status_transition_day == today:
+            return
+        with _status_transition_lock:
+            if _status_transition_day == today:
+                return
+            _status_transition_day = today
+        run_in_background(JobService().transition_job_statuses, today)
+
+    @staticmethod
+    def _get_owned_job(user_id: int, job_id: int) -> Job | None:
+        """The user's job, unless it doesn't exist or has been deleted"""
         job = db.session.get(Job, job_id)
-        if not job or job.user_id != user_id:
+        if not job or job.user_id != user_id or job.deleted_at is not None:
+            return None
+        return job
+
+    def get_job(self, user_id: int, job_id: int) -> dict | None:
+        self._refresh_statuses()
+        job = self._get_owned_job(user_id, job_id)
+        if not job:
             return None
-        computed_status = "active"
-        today = datetime.now(UTC).date()
-        if job.application_deadline and isinstance(job.application_deadline, date):
-            if job.application_deadline < today:
-                computed_status = "deprecated"
         return {
             "id": job.id,
             "title": job.title,
@@ -158,35 +251,43 @@ class JobService:
             "application_deadline": job.application_deadline.isoformat() if job.application_deadline else None,
             "created_at": job.created_at.isoformat() if job.created_at else None,
             "updated_at": job.updated_at.isoformat() if job.updated_at else None,
-            "status": computed_status,
+            "status": job.status,
         }
 
     def archive_job(self, user_id: int, job_id: int) -> bool:
-        job = db.session.get(Job, job_id)
-        if not job or job.user_id != user_id:
+        job = self._get_owned_job(user_id, job_id)
+        if not job:
             return False
         # Mark as deprecated by setting deadline to yesterday if not already
         today = datetime.now(UTC).date()
         if not job.application_deadline or job.application_deadline >= today:
             job.application_deadline = today.replace(day=today.day) - timedelta(days=1)
+        if job.status != JOB_STATUS_DEPRECATED:
+            job.status = JOB_STATUS_DEPRECATED
+        if db.session.is_modified(job):
             db.session.commit()
+            invalidate_job_caches(job_id)
         return True
 
     def unarchive_job(self, user_id: int, job_id: int) -> bool:
-        job = db.session.get(Job, job_id)
-        if not job or job.user_id != user_id:
+        job = self._get_owned_job(user_id, job_id)
+        if not job:
             return False
         # Make deadline at least 30 days in the future
         today = datetime.now(UTC).date()
         future = today + timedelta(days=30)
         if not job.application_deadline or job.application_deadline < future:
             job.application_deadline = future
+        if job.status != JOB_STATUS_ACTIVE:
+            job.status = JOB_STATUS_ACTIVE
+        if db.session.is_modified(job):
             db.session.commit()
+            invalidate_job_caches(job_id)
         return True
 
     def update_job(self, user_id: int, job_id: int, job_data: dict) -> dict | None:
-        job = db.session.get(Job, job_id)
-        if not job or job.user_id != user_id:
+        job = self._get_owned_job(user_id, job_id)
+        if not job:
             return None
         # Update mutable fields if provided
         for field in [
@@ -202,138 +303,334 @@ class JobService:
             if isinstance(deadline_val, str):
                 deadline_val = datetime.strptime(deadline_val, "%Y-%m-%d").date()
             job.application_deadline = deadline_val
+        if job_data.get("skills") is not None:
+            SkillIndexService().sync(job.id, job.skills)
         job.updated_at = datetime.utcnow()
         db.session.commit()
+        invalidate_job_caches(job_id)
         return self.get_job(user_id, job_id)
 
     def delete_job(self, user_id: int, job_id: int) -> dict:
         """
-        Permanently delete a job and all associated data.
-        This includes:
-        - The job record
-        - All applications for this job
-        - All saved job records for this job
-        - All associated files (resumes, cover letters)
-        - Empty folders
-        
+        Delete a job and all associated data.
+
+        The job is soft-deleted: setting ``deleted_at`` hides it from every
+        listing straight away, and the request returns without touching
+        applications, saved jobs or documents. Those are removed, together
+        with the job row, by JobPurgeService in throttled batches on a
+        background thread; ``flask jobs purge-deleted`` finishes any purge
+        an interrupted process left behind.
+
         Args:
             user_id: ID of the user requesting deletion
             job_id: ID of the job to delete
-            
+
         Returns:
-            dict: Deletion summary with cleanup details
-            
+            dict: Deletion summary
+
         Raises:
             ValueError: If job not found or user doesn't own the job
         """
-        # Verify job exists and user owns it
-        job = db.session.execute(
-            select(Job).where(Job.id == job_id, Job.user_id == user_id)
-        ).scalar_one_or_none()
-        
+        job = self._get_owned_job(user_id, job_id)
         if not job:
             raise ValueError("Job not found or access denied")
-        
+
         deletion_summary = {
             'job_id': job_id,
             'job_title': job.title,
-            'applications_deleted': 0,
-            'saved_jobs_deleted': 0,
-            'file_cleanup': {},
+            'deleted_at': None,
+            'purge': 'scheduled',
             'errors': []
         }
-        
+
         try:
-            # Get counts before deletion for summary
-            from ..models.application import Application
-            from ..models.saved_job import SavedJob
-            
-            applications_count = db.session.execute(
-                select(func.count(Application.id)).where(Application.job_id == job_id)
-            ).scalar() or 0
-            
-            saved_jobs_count = db.session.execute(
-                select(func.count(SavedJob.id)).where(SavedJob.job_id == job_id)
-            ).scalar() or 0
-            
-            deletion_summary['applications_deleted'] = applications_count
-            deletion_summary['saved_jobs_deleted'] = saved_jobs_count
-            
-            # Clean up files before deleting database records
-            file_cleanup_service = FileCleanupService()
-            deletion_summary['file_cleanup'] = file_cleanup_service.cleanup_job_files(job_id)
-            
-            # Manually delete applications and saved jobs (for compatibility with existing schema)
-            applications_to_delete = db.session.execute(
-                select(Application).where(Application.job_id == job_id)
-            ).scalars().all()
-            
-            for app in applications_to_delete:
-                db.session.delete(app)
-            
-            saved_jobs_to_delete = db.session.execute(
-                select(SavedJob).where(SavedJob.job_id == job_id)
-            ).scalars().all()
-            
-            for saved_job in saved_jobs_to_delete:
-                db.session.delete(saved_job)
-            
-            # Delete the job
-            db.session.delete(job)
+            job.deleted_at = datetime.utcnow()
             db.session.commit()
-            
         except Exception as e:
             db.session.rollback()
             deletion_summary['errors'].append(f"Deletion failed: {str(e)}")
             raise e
-        
+
+        invalidate_job_caches(job_id)
+        deletion_summary['deleted_at'] = job.deleted_at.isoformat()
+        run_in_background(JobPurgeService().purge_job, job_id)
         return deletion_summary
 
-    def search_public_jobs(self, q: str | None, page: int = 1, per_page: int = 20) -> dict:
+    def search_public_jobs(self, q: str | None, page: int = 1, per_page: int = 20,
+                           saved_by: int | None = None, filters: dict | None = None,
+                           facets: bool = False) -> dict:
+        """Active jobs matching ``q`` and ``filters``, newest first.
+
+        ``filters`` may hold ``employment_type``, ``seniority`` and
+        ``work_mode`` (lists of accepted values), ``visa_sponsorship``,
+        ``location`` (substring), ``salary_min``/``salary_max``, which
+        match jobs whose salary range overlaps the wanted one, and
+        ``skills`` with ``skills_match`` ('all' or 'any'). ``q`` matches
+        a title substring or the start of a skill. When that finds fewer
+        than JOB_SEARCH_FUZZY_MIN_HITS jobs, jobs whose title or skill words
+        resemble ``q`` (by trigram similarity, so "pyhton" finds Python
+        jobs) follow the exact matches, most similar first, and ``fuzzy``
+        is set in the result.
+
+        The matching ids and the total are cached per normalized
+        ``(q, filters, page, per_page)`` for JOB_SEARCH_CACHE_TTL seconds,
+        under a generation that every job write bumps; the items are filled
+        in from per-job cards cached alongside. A popular query is therefore
+        served without touching the database. With ``saved_by`` each item
+        also carries a ``saved`` flag for that user, looked up for the page's
+        ids in one IN query. With ``facets`` the result includes counts per
+        filter value, see ``_facet_counts``.
+        """
         if page < 1:
             page = 1
         if per_page < 1:
             per_page = 20
-        today = datetime.now(UTC).date()
-        base_q = select(Job).where(
-            (Job.application_deadline == None) | (Job.application_deadline >= today)  # noqa: E711
+        self._refresh_statuses()
+        # Matching is case-insensitive, so "Python " and "python" share a cache entry
+        q = " ".join((q or "").split()).lower() or None
+        filters = self._normalize_filters(filters)
+
+        result = self._cached_search(
+            "search", [q, filters, page, per_page], lambda: self._search_ids(q, filters, page, per_page)
         )
-        if q:
-            like = f"%{q}%"
-            # Title or skills text match
-            base_q = base_q.where(
-                (Job.title.ilike(like)) | (func.cast(Job.skills, db.String).ilike(like))
-            )
-        total = db.session.execute(base_q).scalars().count() if hasattr(db.session.execute(base_q).scalars(), 'count') else None
-        page_q = base_q.order_by(Job.created_at.desc()).limit(per_page).offset((page - 1) * per_page)
-        jobs = db.session.execute(page_q).scalars().all()
-        items = []
-        for job in jobs:
-            items.append({
-                "id": job.id,
-                "title": job.title,
-                "location": job.location,
-                "work_mode": job.work_mode,
-                "skills": job.skills,
-                "created_at": job.created_at.isoformat() if job.created_at else None,
-            })
-        pages = (total + per_page - 1) // per_page if total is not None else 1
-        return {
+        items = self._job_cards(result["ids"])
+        if saved_by is not None and items:
+            saved = set(db.session.execute(
+                select(SavedJob.job_id).where(SavedJob.user_id == saved_by, SavedJob.job_id.in_(result["ids"]))
+            ).scalars())
+            items = [{**item, "saved": item["id"] in saved} for item in items]
+        total = result["total"]
+        data = {
             "jobs": items,
-            "total": total if total is not None else len(items),
-            "pages": pages,
+            "total": total,
+            "pages": (total + per_page - 1) // per_page,
             "current_page": page,
             "per_page": per_page,
+            "fuzzy": result.get("fuzzy", False),
         }
+        if facets:
+            data["facets"] = self._cached_search("facets", [q, filters], lambda: self._facet_counts(q, filters))
+        return data
+
+    @staticmethod
+    def _normalize_filters(filters: dict | None) -> dict:
+        """Filters without empty values and with sorted lists, so equal searches share cache entries"""
+        normalized = {}
+        for name, value in (filters or {}).items():
+            if value is None or value == "" or value == []:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                value = sorted(set(value))
+            elif name == "location":
+                value = " ".join(value.split()).lower()
+            normalized[name] = value
+        return normalized
+
+    def _cached_search(self, kind: str, params: list, compute):
+        """``compute()``, cached under the current search generation"""
+        generation = _search_generation()
+        if generation is None:
+            return compute()
+        digest = sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()
+        return get_cache().get_or_set(
+            f"jobs:{kind}:{generation}:{digest}", compute,
+            ttl=current_app.config.get('JOB_SEARCH_CACHE_TTL', 30),
+        )
+
+    @staticmethod
+    def _search_conditions(q: str | None, filters: dict, skip: str | None = None) -> list:
+        """WHERE clauses for a public search, leaving out the ``skip`` filter"""
+        # status and deleted_at match the partial idx_jobs_active_* indexes
+        conditions = [Job.status == JOB_STATUS_ACTIVE, Job.deleted_at.is_(None)]
+        if q:
+            # Title substring, or a skill starting with q from the skill index
+            conditions.append(Job.title.ilike(f"%{q}%") | Job.id.in_(SkillIndexService.jobs_with_skill_prefix(q)))
+        if "skills" in filters:
+            conditions.append(Job.id.in_(
+                SkillIndexService.jobs_with_skills(filters["skills"], filters.get("skills_match", MATCH_ALL))
+            ))
+        for name in PUBLIC_FACETS:
+            if name in filters and name != skip:
+                column = getattr(Job, name)
+                value = filters[name]
+                conditions.append(column.in_(value) if isinstance(value, list) else column == value)
+        if "location" in filters:
+            conditions.append(Job.location.ilike(f"%{filters['location']}%"))
+        if "salary_min" in filters:
+            conditions.append(Job.salary_max >= filters["salary_min"])
+        if "salary_max" in filters:
+            conditions.append(Job.salary_min <= filters["salary_max"])
+        return conditions
+
+    def _search_ids(self, q: str | None, filters: dict, page: int, per_page: int) -> dict:
+        base_q = select(Job.id).where(*self._search_conditions(q, filters))
+        total = db.session.execute(select(func.count()).select_from(base_q.subquery())).scalar() or 0
+        if q and total < current_app.config.get('JOB_SEARCH_FUZZY_MIN_HITS', 3):
+            exact = list(db.session.execute(base_q.order_by(Job.created_at.desc())).scalars())
+            similar = [job_id for job_id in self._similar_job_ids(q, filters) if job_id not in exact]
+            if similar:
+                ids = exact + similar
+                start = (page - 1) * per_page
+                return {"ids": ids[start:start + per_page], "total": len(ids), "fuzzy": True}
+        ids = db.session.execute(
+            base_q.order_by(Job.created_at.desc()).limit(per_page).offset((page - 1) * per_page)
+        ).scalars().all()
+        return {"ids": list(ids), "total": total}
+
+    def _similar_job_ids(self, q: str, filters: dict) -> list[int]:
+        """Ids of jobs matching ``filters`` whose title or skills resemble ``q``, most similar first.
+
+        Uses pg_trgm on PostgreSQL when the extension is installed and the
+        in-process trigram index of suggest_service everywhere else.
+        """
+        threshold = current_app.config.get('JOB_SEARCH_FUZZY_THRESHOLD', 0.25)
+        limit = current_app.config.get('JOB_SEARCH_FUZZY_LIMIT', 50)
+        # The remaining filters still apply; q itself is what didn't match
+        conditions = self._search_conditions(None, filters)
+        if self._has_pg_trgm():
+            return [job_id for job_id, _ in self._pg_similar_jobs(q, threshold, limit, conditions)]
+        ranked_ids = [job_id for job_id, _ in suggest_service.similar_jobs(q, threshold=threshold, limit=limit)]
+        if not ranked_ids:
+            return []
+        matching = set(db.session.execute(
+            select(Job.id).where(Job.id.in_(ranked_ids), *conditions)
+        ).scalars())
+        return [job_id for job_id in ranked_ids if job_id in matching]
+
+    @staticmethod
+    def _has_pg_trgm() -> bool:
+        url = str(db.engine.url)
+        if url not in _pg_trgm:
+            _pg_trgm[url] = db.engine.dialect.name == "postgresql" and bool(db.session.execute(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            ).scalar())
+        return _pg_trgm[url]
+
+    @staticmethod
+    def _pg_similar_jobs(q: str, threshold: float, limit: int, conditions) -> list[tuple[int, float]]:
+        """(job_id, score) of jobs meeting ``conditions``, ranked by pg_trgm similarity of the title or a skill to ``q``"""
+        # Both branches filter before the LIMIT, so it only counts jobs that can be shown
+        scores = union_all(
+            select(Job.id.label("job_id"), func.word_similarity(q, Job.title).label("score")).where(*conditions),
+            select(JobSkill.job_id.label("job_id"), func.similarity(JobSkill.skill_norm, q).label("score"))
+            .join(Job, Job.id == JobSkill.job_id).where(*conditions),
+        ).subquery()
+        best = func.max(scores.c.score)
+        rows = db.session.execute(
+            select(scores.c.job_id, best).group_by(scores.c.job_id)
+            .having(best >= threshold).order_by(best.desc(), scores.c.job_id).limit(limit)
+        ).all()
+        return [(job_id, score) for job_id, score in rows]
+
+    def _facet_counts(self, q: str | None, filters: dict) -> dict:
+        """Jobs per value of each facet, from one UNION ALL of grouped counts.
+
+        A facet's own filter is left out of its counts while the others
+        apply, so the counts tell the user what picking another value of
+        that facet (alongside the current choice) would return.
+        """
+        selects = []
+        for name in PUBLIC_FACETS:
+            column = getattr(Job, name)
+            selects.append(
+                select(literal(name).label("facet"), func.cast(column, db.String).label("value"),
+                       func.count().label("jobs"))
+                .where(*self._search_conditions(q, filters, skip=name), column.is_not(None))
+                .group_by(column)
+            )
+        counts = {name: {} for name in PUBLIC_FACETS}
+        for facet, value, jobs in db.session.execute(union_all(*selects)).all():
+            if facet == "visa_sponsorship":
+                # CAST of a boolean reads '1'/'0' on SQLite and 'true'/'false' on PostgreSQL
+                value = "true" if value in ("1", "true") else "false"
+            counts[facet][value] = jobs
+        return counts
+
+    def recommended_jobs(self, user_id: int, limit: int = 10) -> dict:
+        """Active jobs most similar to the skills ``user_id`` listed on past applications.
+
+        Each item is a search card with a ``score``, the cosine similarity
+        of the TF-IDF vectors (see matching_service). Jobs already applied
+        to are left out; a candidate without applications gets no jobs.
+        """
+        self._refresh_statuses()
+        ranked = matching_service.recommend_for_candidate(user_id, limit=limit)
+        scores = dict(ranked)
+        items = [{**card, "score": scores[card["id"]]} for card in self._job_cards(list(scores))]
+        return {"jobs": items, "total": len(items)}
+
+    def _job_cards(self, job_ids: list[int]) -> list[dict]:
+        """Search result items for ``job_ids``, in order, cached per job.
+
+        Cards aren't checked against the row when read. Only the worker that
+        makes an edit drops its cached card, so on a per-worker cache backend
+        cards live for JOB_CARD_LOCAL_CACHE_TTL seconds only. Jobs that are
+        no longer public are left out when their card is rebuilt.
+        """
+        cache = get_cache()
+        cached = cache.get_many([f"jobs:card:{job_id}" for job_id in job_ids])
+        cards = {card["id"]: card for card in cached.values()}
+        missing = [job_id for job_id in job_ids if job_id not in cards]
+        if missing:
+            config = current_app.config
+            ttl = config.get('JOB_DETAIL_CACHE_TTL', 300)
+            if not cache.backend.shared:
+                ttl = min(ttl, config.get('JOB_CARD_LOCAL_CACHE_TTL', 5))
+            for job in db.session.execute(
+                select(Job).where(Job.id.in_(missing), Job.status == JOB_STATUS_ACTIVE, Job.deleted_at.is_(None))
+            ).scalars():
+                card = {
+                    "id": job.id,
+                    "title": job.title,
+                    "location": job.location,
+                    "work_mode": job.work_mode,
+                    "skills": job.skills,
+                    "created_at": job.created_at.isoformat() if job.created_at else None,
+                }
+                cache.set(f"jobs:card:{job.id}", card, ttl=ttl)
+                cards[job.id] = card
+        return [cards[job_id] for job_id in job_ids if job_id in cards]
 
     def get_public_job(self, job_id: int) -> dict | None:
-        job = db.session.get(Job, job_id)
-        if not job:
-            return None
+        entry = self.get_public_job_entry(job_id)
+        return entry["payload"] if entry else None
+
+    def get_public_job_entry(self, job_id: int) -> dict | None:
+        """Public payload of an active job with its ETag and Last-Modified time.
+
+        The cached entry records the ``updated_at`` it was built from and is
+        only served while the row still has that version, so only that one
+        column is read per request and edits made by any worker show up at
+        once. Returns None if the job isn't public.
+        """
+        self._refresh_statuses()
+        updated_at = db.session.execute(
+            select(Job.updated_at).where(
+                Job.id == job_id, Job.status == JOB_STATUS_ACTIVE, Job.deleted_at.is_(None)
+            )
+        ).scalar_one_or_none()
         # Only allow viewing active jobs publicly
-        today = datetime.now(UTC).date()
-        if job.application_deadline and job.application_deadline < today:
+        if updated_at is None:
             return None
+
+        def build():
+            job = db.session.get(Job, job_id)
+            payload = self._public_payload(job)
+            return {
+                "payload": payload,
+                "updated_at": job.updated_at.isoformat(),
+                "etag": sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest(),
+            }
+
+        entry = get_cache().get_or_set(
+            f"jobs:detail:{job_id}", build,
+            ttl=current_app.config.get('JOB_DETAIL_CACHE_TTL', 300),
+            accept=lambda cached: cached["updated_at"] == updated_at.isoformat(),
+        )
+        return {**entry, "last_modified": datetime.fromisoformat(entry["updated_at"]).replace(tzinfo=UTC)}
+
+    @staticmethod
+    def _public_payload(job: Job) -> dict:
         return {
             "id": job.id,
             "title": job.title,
@@ -355,3 +652,15 @@ class JobService:
             "updated_at": job.updated_at.isoformat() if job.updated_at else None,
         }
 
+
+def transition_job_status_command():
+    """Flask CLI command for the daily job status transition"""
+    from flask.cli import with_appcontext
+
+    @with_appcontext
+    def transition_status():
+        """Mark jobs whose application deadline has passed as deprecated"""
+        changed = JobService().transition_job_statuses()
+        print(f"✅ {changed} jobs moved to deprecated")
+
+    return transition_status
@@ -0,0 +1,140 @@
+"""
+In-process indexes of active jobs kept in step with the jobs table.
+
+The typeahead (suggest_service) and recommendation (matching_service)
+indexes live in each worker's memory, so they can't rely on anything that
+only the writing worker sees. Instead each index remembers the newest
+``Job.updated_at`` it has applied and, at most every
+SEARCH_INDEX_SYNC_SECONDS, re-reads the jobs changed since then with a
+range scan on ``idx_jobs_updated``. Status changes made by the transition
+cron and soft deletes bump ``updated_at`` too, so they are picked up the
+same way. Hard deletes and anything else the scan can't see show up as a
+mismatch with the active job count and trigger a rebuild, as does reaching
+SEARCH_INDEX_MAX_AGE_SECONDS.
+
+Writes made by this process are applied at once through ``job_changed``.
+Rebuilds run outside the lock readers take: while one request builds, the
+others keep answering from the previous index.
+"""
+import threading
+import time
+from datetime import timedelta
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from ..extensions import db
+from ..models.job import Job, JOB_STATUS_ACTIVE
+
+# Changed rows are re-read from this far before the last one seen, to cover
+# transactions that commit out of order and small clock differences between workers
+SYNC_OVERLAP = timedelta(seconds=5)
+
+_registry = []
+
+
+def _active():
+    return (Job.status == JOB_STATUS_ACTIVE, Job.deleted_at.is_(None))
+
+
+class LiveJobIndex:
+    """Holder of one index, built by ``factory()`` and filled with ``add(index, row)``.
+
+    ``columns`` are the Job columns ``add`` reads; the index must also
+    offer ``remove_job(job_id)`` and ``__len__``.
+    """
+
+    def __init__(self, factory, columns, add):
+        self._factory = factory
+        self._columns = columns
+        self._add = add
+        self._index = None
+        self._synced_to = None    # newest updated_at applied
+        self._built_at = 0.0
+        self._checked_at = 0.0
+        self._stale = False
+        self._lock = threading.Lock()        # guards the index and the fields above
+        self._build_lock = threading.Lock()
+        _registry.append(self)
+
+    def _select(self, *conditions):
+        return select(Job.id, Job.status, Job.deleted_at, Job.updated_at, *self._columns).where(*conditions)
+
+    def _apply(self, index, rows) -> None:
+        for row in rows:
+            if row.status == JOB_STATUS_ACTIVE and row.deleted_at is None:
+                self._add(index, row)
+            else:
+                index.remove_job(row.id)
+
+    def _build(self) -> None:
+        built_at = self._built_at
+        if not self._build_lock.acquire(blocking=self._index is None):
+            return  # another request is building; keep serving the current index
+        try:
+            if self._built_at != built_at and self._index is not None:
+                return  # built by the request we waited for
+            synced_to = db.session.execute(select(func.max(Job.updated_at))).scalar()
+            index = self._factory()
+            self._apply(index, db.session.execute(self._select(*_active())).all())
+            with self._lock:
+                self._index, self._synced_to = index, synced_to
+                self._built_at = self._checked_at = time.monotonic()
+                self._stale = False
+        finally:
+            self._build_lock.release()
+
+    def _sync(self) -> None:
+        """Apply the jobs changed since the last sync; rebuild if counts disagree"""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            synced_to = self._synced_to
+        conditions = () if synced_to is None else (Job.updated_at >= synced_to - SYNC_OVERLAP,)
+        rows = db.session.execute(self._select(*conditions)).all()
+        active = db.session.execute(select(func.count()).select_from(Job).where(*_active())).scalar()
+        with self._lock:
+            self._apply(self._index, rows)
+            newest = max((row.updated_at for row in rows), default=None)
+            if newest is not None and (self._synced_to is None or newest > self._synced_to):
+                self._synced_to = newest
+            if len(self._index) != active:
+                self._stale = True
+
+    def read(self, reader):
+        """``reader(index)`` on an index synced within SEARCH_INDEX_SYNC_SECONDS"""
+        config = current_app.config
+        now = time.monotonic()
+        if self._index is None or self._stale \
+                or now - self._built_at > config.get('SEARCH_INDEX_MAX_AGE_SECONDS', 600):
+            self._build()
+        elif now - self._checked_at >= config.get('SEARCH_INDEX_SYNC_SECONDS', 2):
+            self._sync()
+            if self._stale:
+                self._build()
+        with self._lock:
+            return reader(self._index)
+
+    def job_changed(self, job_id: int | None) -> None:
+        """Apply this process's write to ``job_id`` now (None: many jobs, rebuild on next read)"""
+        if self._index is None:
+            return
+        if job_id is None:
+            self._stale = True
+            return
+        rows = db.session.execute(self._select(Job.id == job_id)).all()
+        with self._lock:
+            if rows:
+                self._apply(self._index, rows)
+            else:
+                self._index.remove_job(job_id)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._index = self._synced_to = None
+            self._stale = False
+
+
+def reset_all() -> None:
+    """Drop every in-process job index, for when the jobs table was replaced wholesale"""
+    for holder in _registry:
+        holder.reset()
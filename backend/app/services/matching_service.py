@@ -0,0 +1,173 @@
+"""
+Job recommendations for candidates from TF-IDF vectors.
+
+Each active job is a row of a sparse term matrix built from the words of
+its skills, requirements and description, held in process memory as CSR
+arrays (``data``, ``indices``, ``indptr``). A candidate is described by the
+skills they listed on past applications, weighted by the same IDF, and
+their cosine similarity to every job comes out of one sparse
+matrix-vector product: ``np.add.reduceat`` over the row slices.
+
+Like the typeahead index in suggest_service, the matrix is kept in step
+with the jobs table by ``live_job_index``. Applying a changed job only
+re-tokenizes that job; the IDF weighting and row norms, which depend on
+every job, are recomputed lazily in a few vectorized passes.
+"""
+import math
+import re
+from collections import Counter
+
+import numpy as np
+from sqlalchemy import select
+
+from ..extensions import db
+from ..models.application import Application
+from ..models.job import Job
+from .live_job_index import LiveJobIndex
+
+# Skills say more about a job than the words of its description
+SKILL_WEIGHT = 3.0
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9#+.]*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or our the this to we will with you your "
+    "able work working team experience years strong good knowledge skills".split()
+)
+
+
+def tokenize(text) -> list[str]:
+    """Lowercase words of ``text`` without stopwords and trailing dots"""
+    if not isinstance(text, str):
+        return []
+    tokens = (token.rstrip('.') for token in _TOKEN_RE.findall(text.lower()))
+    return [token for token in tokens if len(token) > 1 and token not in _STOPWORDS]
+
+
+def _weights(weighted_texts) -> dict:
+    """Sublinear term frequencies, 1 + log(tf), of (weight, text) pairs"""
+    counts = Counter()
+    for weight, text in weighted_texts:
+        for token in tokenize(text):
+            counts[token] += weight
+    return {term: 1 + math.log(count) for term, count in counts.items()}
+
+
+def job_terms(skills, requirements, description) -> dict:
+    """Term weights of a job"""
+    texts = [(SKILL_WEIGHT, skill) for skill in skills or []]
+    texts += [(1.0, requirement) for requirement in requirements or []]
+    texts.append((1.0, description))
+    return _weights(texts)
+
+
+def candidate_terms(skill_texts) -> dict:
+    """Term weights of a candidate from the skills fields of their applications"""
+    return _weights((1.0, text) for text in skill_texts)
+
+
+class MatchingIndex:
+    """Sparse TF rows of jobs with document frequencies, compiled to CSR arrays on demand"""
+
+    def __init__(self):
+        self._vocabulary = {}   # term -> column
+        self._df = []           # column -> jobs using the term
+        self._rows = {}         # job_id -> (columns, term weights)
+        self._termless = set()  # jobs whose text has no terms; they match nothing
+        self._compiled = None
+
+    def __len__(self):
+        # Counts every job applied, so it can be checked against the active job count
+        return len(self._rows) + len(self._termless)
+
+    def add_job(self, job_id: int, terms: dict) -> None:
+        self.remove_job(job_id)
+        if not terms:
+            self._termless.add(job_id)
+            return
+        columns = []
+        for term in terms:
+            column = self._vocabulary.get(term)
+            if column is None:
+                column = self._vocabulary[term] = len(self._df)
+                self._df.append(0)
+            self._df[column] += 1
+            columns.append(column)
+        self._rows[job_id] = (np.array(columns, dtype=np.int64),
+                              np.fromiter(terms.values(), dtype=np.float64, count=len(terms)))
+        self._compiled = None
+
+    def remove_job(self, job_id: int) -> None:
+        self._termless.discard(job_id)
+        row = self._rows.pop(job_id, None)
+        if row is not None:
+            for column in row[0]:
+                self._df[column] -= 1
+            self._compiled = None
+
+    def _compile(self) -> dict:
+        """CSR arrays with TF-IDF weights, the IDF vector and row norms"""
+        if self._compiled is None:
+            job_ids = np.fromiter(self._rows, dtype=np.int64, count=len(self._rows))
+            rows = list(self._rows.values())
+            lengths = np.array([len(columns) for columns, _ in rows], dtype=np.int64)
+            indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=indptr[1:])
+            indices = np.concatenate([columns for columns, _ in rows]) if rows else np.zeros(0, np.int64)
+            tf = np.concatenate([weights for _, weights in rows]) if rows else np.zeros(0)
+            # Smoothed IDF, as in scikit-learn: terms in every job still weigh 1
+            idf = np.log((1 + len(rows)) / (1 + np.array(self._df, dtype=np.float64))) + 1
+            data = tf * idf[indices]
+            norms = np.sqrt(np.add.reduceat(data * data, indptr[:-1])) if rows else np.zeros(0)
+            self._compiled = {"job_ids": job_ids, "indptr": indptr, "indices": indices,
+                              "data": data, "idf": idf, "norms": norms}
+        return self._compiled
+
+    def scores(self, terms: dict) -> tuple:
+        """(job ids, cosine similarities) of every job to the vector of ``terms``"""
+        matrix = self._compile()
+        query = np.zeros(len(matrix["idf"]))
+        for term, weight in terms.items():
+            column = self._vocabulary.get(term)
+            if column is not None and self._df[column]:
+                query[column] = weight
+        query *= matrix["idf"]
+        query_norm = np.linalg.norm(query)
+        if not len(matrix["job_ids"]) or not query_norm:
+            return matrix["job_ids"][:0], np.zeros(0)
+        products = np.add.reduceat(matrix["data"] * query[matrix["indices"]], matrix["indptr"][:-1])
+        return matrix["job_ids"], products / (matrix["norms"] * query_norm)
+
+    def recommend(self, terms: dict, limit: int = 10, exclude=()) -> list[tuple[int, float]]:
+        """The ``limit`` most similar jobs as (job_id, score), best first, leaving out ``exclude``"""
+        job_ids, scores = self.scores(terms)
+        if exclude and len(job_ids):
+            scores = np.where(np.isin(job_ids, list(exclude)), 0.0, scores)
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        ranked = sorted(candidates, key=lambda i: (-scores[i], job_ids[i]))
+        return [(int(job_ids[i]), round(float(scores[i]), 4)) for i in ranked]
+
+
+def _add_job(index: MatchingIndex, row) -> None:
+    index.add_job(row.id, job_terms(row.skills, row.requirements, row.description))
+
+
+_live = LiveJobIndex(MatchingIndex, (Job.skills, Job.requirements, Job.description), _add_job)
+
+
+def recommend_for_candidate(user_id: int, limit: int = 10) -> list[tuple[int, float]]:
+    """Active jobs closest to the skills on ``user_id``'s applications, excluding jobs applied to"""
+    rows = db.session.execute(
+        select(Application.job_id, Application.skills).where(Application.user_id == user_id)
+    ).all()
+    terms = candidate_terms(row.skills for row in rows)
+    if not terms:
+        return []
+    exclude = {row.job_id for row in rows}
+    return _live.read(lambda index: index.recommend(terms, limit=limit, exclude=exclude))
+
+
+def job_changed(job_id: int | None) -> None:
+    """Apply this process's change to ``job_id`` (None: many jobs) to the matrix"""
+    _live.job_changed(job_id)
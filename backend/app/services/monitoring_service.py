@@ -4,20 +4,146 @@ Database monitoring and health check service
 import os
 import time
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, UTC
 from flask import current_app
-from sqlalchemy import text, inspect
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import text, inspect, select, update
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from app.extensions import db
+from app.models.health_check_sample import HealthCheckSample
 
 logger = logging.getLogger(__name__)
 
+
+class HealthHistoryStore:
+    """Fixed-capacity, time-bucketed health history shared by all workers.
+
+    Samples live in the ``health_check_samples`` table. Each bucket of
+    HEALTH_HISTORY_RESOLUTION_SECONDS maps to slot ``bucket_index % capacity``,
+    so the table never grows beyond HEALTH_HISTORY_CAPACITY rows and every
+    worker reads and writes the same history.
+    """
+    
+    def _settings(self):
+        resolution = max(int(current_app.config.get('HEALTH_HISTORY_RESOLUTION_SECONDS', 60)), 1)
+        capacity = max(int(current_app.config.get('HEALTH_HISTORY_CAPACITY', 2880)), 1)
+        return resolution, capacity
+    
+    def record(self, health_status, now=None):
+        """Fold a health check result into its time bucket"""
+        resolution, capacity = self._settings()
+        now = now or datetime.utcnow()
+        bucket_index = int(now.replace(tzinfo=UTC).timestamp()) // resolution
+        bucket_start = datetime.fromtimestamp(bucket_index * resolution, UTC).replace(tzinfo=None)
+        slot = bucket_index % capacity
+        healthy = 1 if health_status.get('overall_status') == 'healthy' else 0
+        last_values = {
+            'last_status': health_status.get('overall_status', 'error'),
+            'last_checked_at': now,
+            'last_result': health_status,
+        }
+        table = HealthCheckSample.__table__
+        
+        # Own transaction so recording never commits the caller's session state
+        for _ in range(2):
+            try:
+                with db.engine.begin() as conn:
+                    # Same bucket: accumulate
+                    result = conn.execute(
+                        update(table)
+                        .where(table.c.slot == slot, table.c.bucket_start == bucket_start)
+                        .values(
+                            total_checks=table.c.total_checks + 1,
+                            healthy_checks=table.c.healthy_checks + healthy,
+                            **last_values,
+                        )
+                    )
+                    if result.rowcount:
+                        return
+                    # Stale slot from a previous lap of the ring: overwrite
+                    result = conn.execute(
+                        update(table)
+                        .where(table.c.slot == slot)
+                        .values(bucket_start=bucket_start, total_checks=1, healthy_checks=healthy, **last_values)
+                    )
+                    if result.rowcount:
+                        return
+                    conn.execute(
+                        table.insert().values(
+                            slot=slot, bucket_start=bucket_start, total_checks=1, healthy_checks=healthy, **last_values
+                        )
+                    )
+                    return
+            except IntegrityError:
+                # Another worker created the slot concurrently; retry as an update
+                continue
+    
+    def has_samples(self):
+        table = HealthCheckSample.__table__
+        with db.engine.connect() as conn:
+            return conn.execute(select(table.c.slot).limit(1)).first() is not None
+    
+    def history(self, hours=24, max_points=None):
+        """Samples for the last ``hours``, downsampled to at most ``max_points`` buckets"""
+        resolution, _ = self._settings()
+        cutoff = datetime.utcnow() - timedelta(hours=hours)
+        table = HealthCheckSample.__table__
+        with db.engine.connect() as conn:
+            rows = conn.execute(
+                select(
+                    table.c.bucket_start,
+                    table.c.total_checks,
+                    table.c.healthy_checks,
+                    table.c.last_status,
+                    table.c.last_checked_at,
+                )
+                .where(table.c.bucket_start >= cutoff)
+                .order_by(table.c.bucket_start)
+            ).all()
+        
+        bucket_seconds = resolution
+        if max_points and len(rows) > max_points:
+            window_seconds = hours * 3600
+            bucket_seconds = -(-window_seconds // max_points)
+            bucket_seconds = -(-bucket_seconds // resolution) * resolution
+        
+        points = []
+        for row in rows:
+            key = int(row.bucket_start.replace(tzinfo=UTC).timestamp()) // bucket_seconds * bucket_seconds
+            if points and points[-1]['_key'] == key:
+                point = points[-1]
+                point['total_checks'] += row.total_checks
+                point['healthy_checks'] += row.healthy_checks
+                point['last_status'] = row.last_status
+                point['last_checked_at'] = row.last_checked_at
+            else:
+                points.append({
+                    '_key': key,
+                    'total_checks': row.total_checks,
+                    'healthy_checks': row.healthy_checks,
+                    'last_status': row.last_status,
+                    'last_checked_at': row.last_checked_at,
+                })
+        
+        return [
+            {
+                'timestamp': datetime.fromtimestamp(point['_key'], UTC).replace(tzinfo=None).isoformat(),
+                'bucket_seconds': bucket_seconds,
+                'overall_status': 'healthy' if point['healthy_checks'] == point['total_checks'] else 'unhealthy',
+                'total_checks': point['total_checks'],
+                'healthy_checks': point['healthy_checks'],
+                'last_status': point['last_status'],
+                'last_checked_at': point['last_checked_at'].isoformat(),
+            }
+            for point in points
+        ]
+
 class DatabaseMonitor:
     """Database monitoring and health check service"""
     
     def __init__(self):
-        self.health_history = []
-        self.max_history = 100
+        self.history_store = HealthHistoryStore()
+        # Cached results of expensive catalog queries: name -> (expires_at, result)
+        self._cache = {}
     
     def check_database_health(self):
         """Perform comprehensive database health check"""
@@ -48,6 +174,14 @@ class DatabaseMonitor:
             query_check = self._check_long_running_queries()
             health_status['checks']['long_queries'] = query_check
             
+            # Check for blocked lock chains
+            lock_check = self._check_locks()
+            health_status['checks']['locks'] = lock_check
+            
+            # Check buffer cache hit ratio
+            cache_check = self._check_cache_hit_ratio()
+            health_status['checks']['cache_hit_ratio'] = cache_check
+            
             # Determine overall status
             failed_checks = [check for check in health_status['checks'].values() 
                            if not check.get('status', True)]
@@ -60,10 +194,11 @@ class DatabaseMonitor:
             health_status['overall_status'] = 'error'
             health_status['error'] = str(e)
         
-        # Store in history
-        self.health_history.append(health_status)
-        if len(self.health_history) > self.max_history:
-            self.health_history.pop(0)
+        # Store in the shared history
+        try:
+            self.history_store.record(health_status)
+        except Exception as e:
+            logger.error(f"Failed to record health history: {e}")
         
         return health_status
     
@@ -89,36 +224,64 @@ class DatabaseMonitor:
                 'message': 'Database connection failed'
             }
     
+    def _dialect(self):
+        """Name of the SQLAlchemy dialect backing the app database"""
+        return db.engine.dialect.name
+    
+    def _cached(self, name, compute):
+        """Return a cached result for ``name`` or compute and cache it"""
+        ttl = current_app.config.get('MONITORING_CACHE_TTL_SECONDS', 30)
+        now = time.monotonic()
+        cached = self._cache.get(name)
+        if cached and cached[0] > now:
+            return cached[1]
+        result = compute()
+        self._cache[name] = (now + ttl, result)
+        return result
+    
+    def clear_cache(self):
+        """Drop cached monitoring results so the next call hits the database"""
+        self._cache.clear()
+    
+    def _fetch_all(self, sql, params=None):
+        """Run a read-only monitoring query and return rows as dicts"""
+        with db.engine.connect() as conn:
+            result = conn.execute(text(sql), params or {})
+            return [dict(row._mapping) for row in result]
+    
     def _check_database_size(self):
         """Check database size"""
         try:
-            # Get database file size for SQLite
-            db_uri = current_app.config['SQLALCHEMY_DATABASE_URI']
-            if db_uri.startswith('sqlite:///'):
-                db_path = db_uri.replace('sqlite:///', '')
-                if not os.path.isabs(db_path):
-                    db_path = os.path.join(current_app.instance_path, db_path)
-                
-                size_bytes = os.path.getsize(db_path)
-                size_mb = size_bytes / (1024 * 1024)
-                
-                # Warning if database is larger than 100MB
-                status = size_mb < 100
-                
-                return {
-                    'name': 'database_size',
-                    'status': status,
-                    'size_mb': round(size_mb, 2),
-                    'size_bytes': size_bytes,
-                    'message': f'Database size: {size_mb:.2f}MB',
-                    'warning': 'Database size exceeds 100MB' if not status else None
-                }
+            max_size_mb = current_app.config.get('DATABASE_SIZE_WARNING_MB', 100)
+            dialect = self._dialect()
+            if dialect == 'sqlite':
+                # page_count * page_size also works for in-memory databases
+                with db.engine.connect() as conn:
+                    page_count = conn.execute(text("PRAGMA page_count")).scalar() or 0
+                    page_size = conn.execute(text("PRAGMA page_size")).scalar() or 0
+                size_bytes = page_count * page_size
+            elif dialect == 'postgresql':
+                size_bytes = self._cached('database_size', lambda: self._fetch_all(
+                    "SELECT pg_database_size(current_database()) AS size_bytes"
+                )[0]['size_bytes'])
             else:
                 return {
                     'name': 'database_size',
                     'status': True,
                     'message': 'Database size check not supported for this database type'
                 }
+            
+            size_mb = size_bytes / (1024 * 1024)
+            status = size_mb < max_size_mb
+            
+            return {
+                'name': 'database_size',
+                'status': status,
+                'size_mb': round(size_mb, 2),
+                'size_bytes': size_bytes,
+                'message': f'Database size: {size_mb:.2f}MB',
+                'warning': f'Database size exceeds {max_size_mb}MB' if not status else None
+            }
         except Exception as e:
             return {
                 'name': 'database_size',
@@ -193,15 +356,24 @@ class DatabaseMonitor:
             }
     
     def _check_long_running_queries(self):
-        """Check for long-running queries (SQLite doesn't support this well)"""
+        """Check for queries running longer than LONG_QUERY_THRESHOLD_SECONDS"""
         try:
-            # For SQLite, we can't easily check running queries
-            # This is more relevant for PostgreSQL/MySQL
+            if self._dialect() != 'postgresql':
+                return {
+                    'name': 'long_queries',
+                    'status': True,
+                    'message': f'Long query check not supported for {self._dialect()}',
+                    'note': 'Only available on PostgreSQL (reads pg_stat_activity)'
+                }
+            
+            threshold = current_app.config.get('LONG_QUERY_THRESHOLD_SECONDS', 30)
+            queries = self._cached('long_queries', lambda: self.get_long_running_queries(threshold))
             return {
                 'name': 'long_queries',
-                'status': True,
-                'message': 'Long query check not supported for SQLite',
-                'note': 'Consider upgrading to PostgreSQL for production monitoring'
+                'status': len(queries) == 0,
+                'threshold_seconds': threshold,
+                'queries': queries,
+                'message': f'{len(queries)} queries running longer than {threshold}s'
             }
         except Exception as e:
             return {
@@ -211,30 +383,234 @@ class DatabaseMonitor:
                 'message': 'Failed to check long-running queries'
             }
     
-    def get_health_history(self, hours=24):
+    def _check_locks(self):
+        """Check for sessions blocked on locks held by other sessions"""
+        try:
+            if self._dialect() != 'postgresql':
+                return {
+                    'name': 'locks',
+                    'status': True,
+                    'message': f'Lock check not supported for {self._dialect()}'
+                }
+            
+            chains = self._cached('locks', self.get_blocked_lock_chains)
+            return {
+                'name': 'locks',
+                'status': len(chains) == 0,
+                'blocked_sessions': len(chains),
+                'chains': chains,
+                'message': f'{len(chains)} sessions waiting on locks'
+            }
+        except Exception as e:
+            return {
+                'name': 'locks',
+                'status': False,
+                'error': str(e),
+                'message': 'Failed to check locks'
+            }
+    
+    def _check_cache_hit_ratio(self):
+        """Check the shared buffer cache hit ratio for the current database"""
+        try:
+            if self._dialect() != 'postgresql':
+                return {
+                    'name': 'cache_hit_ratio',
+                    'status': True,
+                    'message': f'Cache hit ratio not supported for {self._dialect()}'
+                }
+            
+            minimum = current_app.config.get('CACHE_HIT_RATIO_MIN', 0.95)
+            ratio = self._cached('cache_hit_ratio', self.get_cache_hit_ratio)
+            # No block reads yet means nothing to judge
+            status = ratio is None or ratio >= minimum
+            return {
+                'name': 'cache_hit_ratio',
+                'status': status,
+                'ratio': ratio,
+                'minimum': minimum,
+                'message': f'Cache hit ratio: {ratio:.4f}' if ratio is not None else 'No block reads recorded yet'
+            }
+        except Exception as e:
+            return {
+                'name': 'cache_hit_ratio',
+                'status': False,
+                'error': str(e),
+                'message': 'Failed to check cache hit ratio'
+            }
+    
+    def get_long_running_queries(self, threshold_seconds):
+        """Active queries (other than our own) running longer than the threshold (PostgreSQL)"""
+        rows = self._fetch_all(
+            """
+            SELECT pid,
+                   usename AS username,
+                   state,
+                   wait_event_type,
+                   wait_event,
+                   EXTRACT(EPOCH FROM (now() - query_start)) AS duration_seconds,
+                   LEFT(query, 500) AS query
+            FROM pg_stat_activity
+            WHERE datname = current_database()
+              AND pid <> pg_backend_pid()
+              AND state <> 'idle'
+              AND query_start IS NOT NULL
+              AND now() - query_start > make_interval(secs => CAST(:threshold AS double precision))
+            ORDER BY query_start
+            """,
+            {'threshold': threshold_seconds},
+        )
+        for row in rows:
+            row['duration_seconds'] = round(float(row['duration_seconds']), 2)
+        return rows
+    
+    def get_blocked_lock_chains(self):
+        """Blocked sessions with the chain of sessions blocking them (PostgreSQL)"""
+        rows = self._fetch_all(
+            """
+            SELECT a.pid,
+                   pg_blocking_pids(a.pid) AS blocking_pids,
+                   a.wait_event_type,
+                   EXTRACT(EPOCH FROM (now() - a.query_start)) AS waiting_seconds,
+                   LEFT(a.query, 500) AS query
+            FROM pg_stat_activity a
+            WHERE a.datname = current_database()
+              AND cardinality(pg_blocking_pids(a.pid)) > 0
+            """
+        )
+        blocked_by = {row['pid']: list(row['blocking_pids']) for row in rows}
+        
+        # Details for blockers that are not themselves blocked
+        blocker_pids = {pid for pids in blocked_by.values() for pid in pids} - set(blocked_by)
+        blockers = {}
+        if blocker_pids:
+            for row in self._fetch_all(
+                """
+                SELECT pid, state, LEFT(query, 500) AS query,
+                       EXTRACT(EPOCH FROM (now() - xact_start)) AS transaction_seconds
+                FROM pg_stat_activity
+                WHERE pid = ANY(:pids)
+                """,
+                {'pids': list(blocker_pids)},
+            ):
+                blockers[row['pid']] = row
+        
+        chains = []
+        for row in rows:
+            # Walk to the root blocker, guarding against cycles (deadlocks)
+            chain = [row['pid']]
+            current = row['pid']
+            while blocked_by.get(current):
+                current = blocked_by[current][0]
+                if current in chain:
+                    break
+                chain.append(current)
+            root = blockers.get(chain[-1], {})
+            chains.append({
+                'pid': row['pid'],
+                'blocking_pids': blocked_by[row['pid']],
+                'chain': chain,
+                'wait_event_type': row['wait_event_type'],
+                'waiting_seconds': round(float(row['waiting_seconds'] or 0), 2),
+                'query': row['query'],
+                'root_blocker': {
+                    'pid': chain[-1],
+                    'state': root.get('state'),
+                    'query': root.get('query'),
+                    'transaction_seconds': round(float(root['transaction_seconds']), 2)
+                    if root.get('transaction_seconds') is not None else None,
+                },
+            })
+        return chains
+    
+    def get_cache_hit_ratio(self):
+        """Buffer cache hit ratio for the current database (PostgreSQL)"""
+        row = self._fetch_all(
+            """
+            SELECT blks_hit, blks_read
+            FROM pg_stat_database
+            WHERE datname = current_database()
+            """
+        )[0]
+        total = (row['blks_hit'] or 0) + (row['blks_read'] or 0)
+        if not total:
+            return None
+        return round(row['blks_hit'] / total, 4)
+    
+    def get_table_bloat(self):
+        """Dead tuple ratio and table/index sizes per user table (PostgreSQL)"""
+        max_ratio = current_app.config.get('TABLE_BLOAT_RATIO_MAX', 0.2)
+        rows = self._fetch_all(
+            """
+            SELECT relname AS table_name,
+                   n_live_tup AS live_tuples,
+                   n_dead_tup AS dead_tuples,
+                   pg_table_size(relid) AS table_bytes,
+                   pg_indexes_size(relid) AS index_bytes,
+                   last_autovacuum
+            FROM pg_stat_user_tables
+            ORDER BY n_dead_tup DESC
+            """
+        )
+        for row in rows:
+            total = (row['live_tuples'] or 0) + (row['dead_tuples'] or 0)
+            row['dead_ratio'] = round(row['dead_tuples'] / total, 4) if total else 0.0
+            row['index_to_table_ratio'] = (
+                round(row['index_bytes'] / row['table_bytes'], 2) if row['table_bytes'] else None
+            )
+            row['bloated'] = row['dead_ratio'] > max_ratio
+            if row['last_autovacuum'] is not None:
+                row['last_autovacuum'] = row['last_autovacuum'].isoformat()
+        return rows
+    
+    def get_database_activity(self, refresh=False):
+        """Detailed activity report (long queries, locks, bloat, cache hit ratio)"""
+        dialect = self._dialect()
+        if dialect != 'postgresql':
+            return {
+                'dialect': dialect,
+                'supported': False,
+                'message': 'Detailed activity monitoring requires PostgreSQL'
+            }
+        if refresh:
+            self.clear_cache()
+        
+        threshold = current_app.config.get('LONG_QUERY_THRESHOLD_SECONDS', 30)
+        return {
+            'dialect': dialect,
+            'supported': True,
+            'timestamp': datetime.utcnow().isoformat(),
+            'long_queries': self._cached('long_queries', lambda: self.get_long_running_queries(threshold)),
+            'long_query_threshold_seconds': threshold,
+            'lock_chains': self._cached('locks', self.get_blocked_lock_chains),
+            'table_bloat': self._cached('table_bloat', self.get_table_bloat),
+            'cache_hit_ratio': self._cached('cache_hit_ratio', self.get_cache_hit_ratio),
+            'database_size': self._check_database_size(),
+        }
+    
+    def get_health_history(self, hours=24, max_points=None):
         """Get health check history for the last N hours"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-        return [check for check in self.health_history 
-                if datetime.fromisoformat(check['timestamp']) > cutoff_time]
+        if max_points is None:
+            max_points = current_app.config.get('HEALTH_HISTORY_MAX_POINTS', 288)
+        return self.history_store.history(hours=hours, max_points=max_points)
     
     def get_health_summary(self):
         """Get health check summary"""
-        if not self.health_history:
+        if not self.history_store.has_samples():
             return {'status': 'no_data', 'message': 'No health checks performed yet'}
         
-        recent_checks = self.get_health_history(hours=1)
+        recent_checks = self.history_store.history(hours=1)
         if not recent_checks:
             return {'status': 'stale', 'message': 'No recent health checks'}
         
-        healthy_count = sum(1 for check in recent_checks if check['overall_status'] == 'healthy')
-        total_count = len(recent_checks)
+        healthy_count = sum(point['healthy_checks'] for point in recent_checks)
+        total_count = sum(point['total_checks'] for point in recent_checks)
         
         return {
             'status': 'healthy' if healthy_count == total_count else 'unhealthy',
             'healthy_checks': healthy_count,
             'total_checks': total_count,
             'success_rate': round((healthy_count / total_count) * 100, 2),
-            'last_check': recent_checks[-1]['timestamp'] if recent_checks else None
+            'last_check': recent_checks[-1]['last_checked_at']
         }
 
 # Global monitor instance
@@ -247,3 +623,7 @@ def get_database_health():
 def get_health_summary():
     """Get database health summary"""
     return db_monitor.get_health_summary()
+
+def get_database_activity(refresh=False):
+    """Get detailed database activity (PostgreSQL only)"""
+    return db_monitor.get_database_activity(refresh=refresh)
@@ -0,0 +1,335 @@
+"""
+Logical backup and restore for PostgreSQL using COPY.
+
+Backups are a single tar archive holding a ``manifest.json`` plus one
+compressed ``COPY ... TO STDOUT`` stream per table. Tables are dumped in
+parallel from one exported snapshot so the archive is consistent, and
+restored in parallel with ``COPY ... FROM STDIN`` into tables created without
+secondary indexes or foreign keys; those are rebuilt once the data is loaded.
+"""
+import copy
+import io
+import json
+import math
+import re
+import shutil
+import tarfile
+import tempfile
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import Enum, Integer, text
+from sqlalchemy.schema import AddConstraint, CreateIndex, CreateTable
+
+from app.services.backup_compression import GzipCompressor, open_compressed
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIX = '.pgdump.tar'
+MANIFEST_NAME = 'manifest.json'
+FORMAT_VERSION = 1
+COPY_CHUNK_SIZE = 1024 * 1024
+
+_SNAPSHOT_ID_RE = re.compile(r'^[0-9A-F-]+$', re.IGNORECASE)
+
+
+def _copy_out(cursor, sql, fileobj):
+    """Stream ``COPY ... TO STDOUT`` into ``fileobj``; returns (bytes, rows)"""
+    total_bytes = rows = 0
+    if hasattr(cursor, 'copy'):  # psycopg 3
+        with cursor.copy(sql) as copy:
+            for block in copy:
+                fileobj.write(block)
+                total_bytes += len(block)
+                rows += bytes(block).count(b'\n')
+        return total_bytes, rows
+
+    # psycopg2: copy_expert writes everything through fileobj.write
+    class _Counter:
+        def write(self, block):
+            nonlocal total_bytes, rows
+            data = block.encode() if isinstance(block, str) else block
+            fileobj.write(data)
+            total_bytes += len(data)
+            rows += data.count(b'\n')
+
+    cursor.copy_expert(sql, _Counter())
+    return total_bytes, rows
+
+
+class _CappedBuffer:
+    """In-memory sink that keeps only the first ``limit`` bytes written to it (None: all)"""
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.buffer = io.BytesIO()
+
+    def write(self, block):
+        if self.limit is None:
+            self.buffer.write(block)
+        elif self.buffer.tell() < self.limit:
+            self.buffer.write(bytes(block[:self.limit - self.buffer.tell()]))
+
+
+def _copy_in(cursor, sql, fileobj):
+    """Stream ``fileobj`` into ``COPY ... FROM STDIN``"""
+    if hasattr(cursor, 'copy'):  # psycopg 3
+        with cursor.copy(sql) as copy:
+            while True:
+                block = fileobj.read(COPY_CHUNK_SIZE)
+                if not block:
+                    break
+                copy.write(block)
+    else:
+        cursor.copy_expert(sql, fileobj, size=COPY_CHUNK_SIZE)
+
+
+class PostgresBackupEngine:
+    """Parallel COPY-based dump/restore of the tables in ``metadata``"""
+
+    def __init__(self, engine, metadata, workers=4, compressor=None):
+        self.engine = engine
+        self.metadata = metadata
+        self.workers = max(int(workers), 1)
+        self.compressor = compressor or GzipCompressor()
+        self.preparer = engine.dialect.identifier_preparer
+
+    def _quote_table(self, table):
+        return self.preparer.format_table(table)
+
+    def _column_list(self, table, columns=None):
+        names = columns or [c.name for c in table.columns]
+        return ', '.join(self.preparer.quote(name) for name in names)
+
+    def _existing_tables(self):
+        with self.engine.connect() as conn:
+            names = set(conn.execute(text(
+                "SELECT tablename FROM pg_tables WHERE schemaname = current_schema()"
+            )).scalars())
+        return [t for t in self.metadata.sorted_tables if t.name in names]
+
+    # ------------------------------------------------------------------ dump
+
+    def _dump_table(self, table, snapshot_id, staging_dir, compressor):
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+            cursor.execute(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'")
+            part_name = f"{table.name}.copy{compressor.suffix if compressor else ''}"
+            sql = f"COPY {self._quote_table(table)} ({self._column_list(table)}) TO STDOUT"
+            if compressor:
+                out = compressor.open(staging_dir / part_name)
+            else:
+                out = open(staging_dir / part_name, 'wb')
+            with out:
+                size, rows = _copy_out(cursor, sql, out)
+            raw.rollback()
+            return {
+                'name': table.name,
+                'columns': [c.name for c in table.columns],
+                'file': part_name,
+                'bytes': size,
+                'rows': rows,
+            }
+        finally:
+            raw.close()
+
+    def dump_parts(self, staging_dir, compress=True):
+        """Dump every table from one exported snapshot into ``staging_dir``.
+
+        Returns the manifest describing the per-table files.
+        """
+        staging_dir = Path(staging_dir)
+        tables = self._existing_tables()
+        compressor = None
+        if compress:
+            # Tables are compressed concurrently; split the compressor's threads between them
+            parallel = max(min(self.workers, len(tables)), 1)
+            compressor = copy.copy(self.compressor)
+            compressor.threads = max(self.compressor.threads // parallel, 1)
+        coordinator = self.engine.raw_connection()
+        try:
+            cursor = coordinator.cursor()
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+            cursor.execute("SELECT pg_export_snapshot()")
+            snapshot_id = cursor.fetchone()[0]
+            if not _SNAPSHOT_ID_RE.match(snapshot_id):
+                raise RuntimeError(f"Unexpected snapshot id: {snapshot_id!r}")
+
+            # The coordinator keeps the snapshot alive until every worker is done
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                entries = list(pool.map(
+                    lambda t: self._dump_table(t, snapshot_id, staging_dir, compressor), tables
+                ))
+            coordinator.rollback()
+        finally:
+            coordinator.close()
+
+        return {
+            'format': 'jobboard-pgcopy',
+            'version': FORMAT_VERSION,
+            'created_at': datetime.utcnow().isoformat(),
+            'compressor': self.compressor.name if compress else None,
+            'server_version': self.engine.dialect.server_version_info,
+            'tables': entries,
+        }
+
+    def sample(self, limit_bytes=None):
+        """The first ``limit_bytes`` of uncompressed COPY output, table by table, read into memory.
+
+        Each table is read with a LIMIT sized from its average row width so
+        the server stops sending rows once the sample is full.
+        """
+        sink = _CappedBuffer(limit_bytes or None)
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+            for table in self._existing_tables():
+                limit = ''
+                if limit_bytes:
+                    remaining = limit_bytes - sink.buffer.tell()
+                    if remaining <= 0:
+                        break
+                    cursor.execute(
+                        "SELECT reltuples, pg_relation_size(oid) FROM pg_class WHERE oid = %s::regclass",
+                        (self._quote_table(table),),
+                    )
+                    tuples, size = cursor.fetchone()
+                    # Never-analyzed tables report no tuples: assume one-byte rows
+                    width = size / tuples if tuples and tuples > 0 else 1
+                    limit = f" LIMIT {math.ceil(remaining / max(width, 1))}"
+                columns = self._column_list(table)
+                _copy_out(cursor, f"COPY (SELECT {columns} FROM {self._quote_table(table)}{limit}) TO STDOUT", sink)
+            raw.rollback()
+        finally:
+            raw.close()
+        return sink.buffer.getvalue()
+
+    def dump(self, archive_path):
+        """Write a consistent logical backup of every table to ``archive_path``"""
+        archive_path = Path(archive_path)
+        started = time.perf_counter()
+        staging_dir = Path(tempfile.mkdtemp(prefix='pgdump-', dir=archive_path.parent))
+        try:
+            manifest = self.dump_parts(staging_dir)
+            entries = manifest['tables']
+            partial_path = archive_path.with_name(archive_path.name + '.partial')
+            with tarfile.open(partial_path, 'w') as tar:
+                manifest_path = staging_dir / MANIFEST_NAME
+                manifest_path.write_text(json.dumps(manifest, indent=2))
+                tar.add(manifest_path, arcname=MANIFEST_NAME)
+                for entry in entries:
+                    tar.add(staging_dir / entry['file'], arcname=entry['file'])
+            partial_path.replace(archive_path)
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        elapsed = time.perf_counter() - started
+        raw_bytes = sum(e['bytes'] for e in entries)
+        return {
+            'path': str(archive_path),
+            'database_bytes': raw_bytes,
+            'compressed_bytes': archive_path.stat().st_size,
+            'seconds': round(elapsed, 3),
+            'throughput_mb_s': round(raw_bytes / (1024 * 1024) / elapsed, 2) if elapsed else None,
+            'tables': len(entries),
+            'rows': sum(e['rows'] for e in entries),
+        }
+
+    # --------------------------------------------------------------- restore
+
+    @staticmethod
+    def read_manifest(archive_path):
+        with tarfile.open(archive_path, 'r') as tar:
+            member = tar.extractfile(MANIFEST_NAME)
+            if member is None:
+                raise ValueError("Backup archive has no manifest")
+            return json.loads(member.read())
+
+    def _create_bare_tables(self, conn):
+        """Create tables and enum types without secondary indexes or foreign keys"""
+        for table in self.metadata.sorted_tables:
+            for column in table.columns:
+                if isinstance(column.type, Enum):
+                    column.type.create(conn, checkfirst=True)
+        for table in self.metadata.sorted_tables:
+            conn.execute(CreateTable(table, include_foreign_key_constraints=[]))
+
+    def _build_indexes_and_constraints(self, conn):
+        for table in self.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(CreateIndex(index))
+        for table in self.metadata.sorted_tables:
+            for constraint in table.foreign_key_constraints:
+                conn.execute(AddConstraint(constraint))
+
+    def _reset_sequences(self, conn):
+        """Move serial sequences past the restored ids"""
+        for table in self.metadata.sorted_tables:
+            pk = list(table.primary_key.columns)
+            if len(pk) != 1 or not isinstance(pk[0].type, Integer) or pk[0].autoincrement is False:
+                continue
+            column = pk[0]
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence(:table, :column), "
+                f"COALESCE(MAX({self.preparer.quote(column.name)}), 1), "
+                f"MAX({self.preparer.quote(column.name)}) IS NOT NULL) "
+                f"FROM {self._quote_table(table)}"
+            ), {'table': table.name, 'column': column.name})
+
+    def _load_table(self, table, entry, staging_dir):
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            sql = f"COPY {self._quote_table(table)} ({self._column_list(table, entry['columns'])}) FROM STDIN"
+            with open_compressed(staging_dir / entry['file']) as src:
+                _copy_in(cursor, sql, src)
+            raw.commit()
+            return entry['rows']
+        finally:
+            raw.close()
+
+    def restore_parts(self, staging_dir, manifest):
+        """Replace the database contents with the per-table files in ``staging_dir``"""
+        started = time.perf_counter()
+        staging_dir = Path(staging_dir)
+        tables_by_name = {t.name: t for t in self.metadata.sorted_tables}
+        entries = [e for e in manifest['tables'] if e['name'] in tables_by_name]
+
+        with self.engine.begin() as conn:
+            self.metadata.drop_all(conn)
+            self._create_bare_tables(conn)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            rows = sum(pool.map(
+                lambda e: self._load_table(tables_by_name[e['name']], e, staging_dir), entries
+            ))
+
+        with self.engine.begin() as conn:
+            self._build_indexes_and_constraints(conn)
+            self._reset_sequences(conn)
+        with self.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            conn.execute(text("ANALYZE"))
+
+        return {
+            'tables': len(entries),
+            'rows': rows,
+            'seconds': round(time.perf_counter() - started, 3),
+        }
+
+    def restore(self, archive_path):
+        """Replace the database contents with ``archive_path``"""
+        manifest = self.read_manifest(archive_path)
+        staging_dir = Path(tempfile.mkdtemp(prefix='pgrestore-', dir=Path(archive_path).parent))
+        try:
+            with tarfile.open(archive_path, 'r') as tar:
+                for entry in manifest['tables']:
+                    tar.extract(entry['file'], path=staging_dir, filter='data')
+            return self.restore_parts(staging_dir, manifest)
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
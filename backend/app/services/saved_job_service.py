@@ -1,5 +1,11 @@
-from sqlalchemy import select, delete
+import base64
+from datetime import datetime, UTC
+
+from sqlalchemy import select, delete, func, insert, literal, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from ..extensions import db
+from ..common.exceptions import ResourceNotFoundError, ValidationError
 from ..models.saved_job import SavedJob
 from ..models.job import Job
 
@@ -11,33 +17,112 @@ class SavedJobService:
         ).scalar_one_or_none()
         return row is not None
 
+    def saved_statuses(self, user_id: int, job_ids: list[int]) -> dict[int, bool]:
+        """Saved flag for each of ``job_ids``, from one IN query"""
+        if not job_ids:
+            return {}
+        saved = set(db.session.execute(
+            select(SavedJob.job_id).where(SavedJob.user_id == user_id, SavedJob.job_id.in_(job_ids))
+        ).scalars())
+        return {job_id: job_id in saved for job_id in job_ids}
+
+    def _insert_saved(self, user_id: int, job_ids: list[int]) -> int:
+        """Save every live job in ``job_ids`` not saved yet; returns rows inserted.
+
+        One INSERT ... SELECT ... ON CONFLICT DO NOTHING: missing or deleted
+        jobs are skipped by the SELECT and concurrent saves of the same job
+        by the conflict clause, instead of surfacing as IntegrityErrors.
+        """
+        source = select(
+            literal(user_id), Job.id, literal(datetime.now(UTC), type_=SavedJob.created_at.type)
+        ).where(Job.id.in_(job_ids), Job.deleted_at.is_(None))
+        columns = ['user_id', 'job_id', 'created_at']
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            dialect_insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+            stmt = dialect_insert(SavedJob).from_select(columns, source)
+            stmt = stmt.on_conflict_do_nothing(index_elements=['user_id', 'job_id'])
+            return db.session.execute(stmt).rowcount
+        inserted = 0
+        for job_id in job_ids:
+            try:
+                with db.session.begin_nested():
+                    inserted += db.session.execute(
+                        insert(SavedJob).from_select(columns, source.where(Job.id == job_id))
+                    ).rowcount
+            except IntegrityError:
+                continue
+        return inserted
+
+    def _delete_saved(self, user_id: int, job_ids: list[int]) -> int:
+        """Unsave ``job_ids``; returns how many were saved"""
+        stmt = delete(SavedJob).where(SavedJob.user_id == user_id, SavedJob.job_id.in_(job_ids))
+        if db.session.get_bind().dialect.delete_returning:
+            return len(db.session.execute(stmt.returning(SavedJob.job_id)).all())
+        return db.session.execute(stmt).rowcount
+
     def save(self, user_id: int, job_id: int) -> dict:
-        if self.is_saved(user_id, job_id):
-            return {"saved": True}
-        sj = SavedJob(user_id=user_id, job_id=job_id)
-        db.session.add(sj)
+        inserted = self._insert_saved(user_id, [job_id])
         db.session.commit()
+        # Nothing inserted: either already saved, or there is no such job
+        if not inserted and not self.is_saved(user_id, job_id):
+            raise ResourceNotFoundError("Job not found")
         return {"saved": True}
 
     def unsave(self, user_id: int, job_id: int) -> dict:
-        db.session.execute(
-            delete(SavedJob).where(SavedJob.user_id == user_id, SavedJob.job_id == job_id)
-        )
+        removed = self._delete_saved(user_id, [job_id])
+        db.session.commit()
+        return {"saved": False, "removed": bool(removed)}
+
+    def bulk_update(self, user_id: int, save_ids: list[int], unsave_ids: list[int]) -> dict:
+        """Save and unsave many jobs in one transaction; returns the resulting flags"""
+        overlap = set(save_ids) & set(unsave_ids)
+        if overlap:
+            raise ValidationError(f"Job ids cannot be both saved and unsaved: {sorted(overlap)}")
+        saved = self._insert_saved(user_id, save_ids) if save_ids else 0
+        unsaved = self._delete_saved(user_id, unsave_ids) if unsave_ids else 0
         db.session.commit()
-        return {"saved": False}
+        return {
+            "saved_count": saved,
+            "unsaved_count": unsaved,
+            "saved": self.saved_statuses(user_id, list(save_ids) + list(unsave_ids)),
+        }
+
+    def list(self, user_id: int, page: int = 1, per_page: int = 20, cursor: str | None = None) -> dict:
+        """A page of the user's saved jobs, most recently saved first.
 
-    def list(self, user_id: int, page: int = 1, per_page: int = 20) -> dict:
+        Pages are ordered by (created_at, id) descending. Passing the previous
+        response's ``next_cursor`` continues from the last item with a keyset
+        condition instead of an OFFSET, so deep pages stay cheap and don't
+        shift when jobs are saved or unsaved meanwhile.
+        """
         if page < 1:
             page = 1
         if per_page < 1:
             per_page = 20
-        
+
+        filters = (SavedJob.user_id == user_id, Job.deleted_at.is_(None))
+        total = db.session.execute(
+            select(func.count(SavedJob.id)).join(Job, SavedJob.job_id == Job.id).where(*filters)
+        ).scalar() or 0
+
         # Join SavedJob with Job to get full job information
-        base_q = select(SavedJob, Job).join(Job, SavedJob.job_id == Job.id).where(SavedJob.user_id == user_id)
-        total = db.session.execute(base_q).scalars().count() if hasattr(db.session.execute(base_q).scalars(), 'count') else None
-        page_q = base_q.limit(per_page).offset((page - 1) * per_page)
-        results = db.session.execute(page_q).all()
-        
+        page_q = (
+            select(SavedJob, Job)
+            .join(Job, SavedJob.job_id == Job.id)
+            .where(*filters)
+            .order_by(SavedJob.created_at.desc(), SavedJob.id.desc())
+        )
+        if cursor:
+            saved_at, saved_id = _decode_cursor(cursor)
+            page_q = page_q.where(tuple_(SavedJob.created_at, SavedJob.id) < (saved_at, saved_id))
+        else:
+            page_q = page_q.offset((page - 1) * per_page)
+        # One extra row tells whether another page follows
+        results = db.session.execute(page_q.limit(per_page + 1)).all()
+        has_more = len(results) > per_page
+        results = results[:per_page]
+
         items = []
         for saved_job, job in results:
             items.append({
@@ -51,12 +136,28 @@ class SavedJobService:
                 "skills": job.skills,
                 "created_at": job.created_at.isoformat() if job.created_at else None,
             })
-        
+
+        last = results[-1][0] if results else None
         return {
             "items": items,
             "current_page": page,
-            "pages": 1 if total is None else (total // per_page + (1 if total % per_page else 0)),
-            "total": total or len(items),
+            "pages": (total + per_page - 1) // per_page if total else 1,
+            "per_page": per_page,
+            "total": total,
+            "next_cursor": _encode_cursor(last.created_at, last.id) if has_more else None,
         }
 
 
+def _encode_cursor(created_at: datetime, saved_job_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{saved_job_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of _encode_cursor; raises ValueError for anything malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, saved_job_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(saved_job_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
@@ -0,0 +1,94 @@
+"""
+Inverted skill index: ``job_skills`` rows derived from ``Job.skills``.
+
+Skills are normalized (lowercased, whitespace collapsed) so "React",
+" react " and "REACT" are one key. Exact, prefix and multi-skill lookups
+are range or IN scans on ``idx_job_skills_skill_job`` that return job ids,
+instead of casting every job's JSON list to text and matching it with
+ILIKE, which also let "react" match "Preact".
+"""
+from sqlalchemy import delete, distinct, func, insert, select
+
+from ..extensions import db
+from ..models.job import Job
+from ..models.job_skill import JobSkill
+
+MATCH_ALL = 'all'
+MATCH_ANY = 'any'
+
+# Longest normalized skill kept in the index (JobSkill.skill_norm)
+MAX_SKILL_LENGTH = 100
+
+
+def normalize_skill(skill) -> str:
+    """Index key for ``skill``; empty for blanks and non-strings"""
+    if not isinstance(skill, str):
+        return ''
+    return " ".join(skill.split()).lower()[:MAX_SKILL_LENGTH]
+
+
+class SkillIndexService:
+    """Keep ``job_skills`` in step with ``Job.skills`` and query it"""
+
+    @staticmethod
+    def normalized(skills) -> list[str]:
+        """Distinct normalized skills, in order of first appearance"""
+        seen = {}
+        for skill in skills or []:
+            key = normalize_skill(skill)
+            if key:
+                seen.setdefault(key, None)
+        return list(seen)
+
+    def sync(self, job_id: int, skills) -> None:
+        """Replace the index rows of ``job_id``; runs in the caller's transaction"""
+        db.session.execute(delete(JobSkill).where(JobSkill.job_id == job_id))
+        keys = self.normalized(skills)
+        if keys:
+            db.session.execute(insert(JobSkill), [{'job_id': job_id, 'skill_norm': key} for key in keys])
+
+    def reindex(self, batch_size: int = 500) -> int:
+        """Rebuild the index for every job, one committed batch at a time; returns jobs indexed"""
+        indexed, last_id = 0, 0
+        while True:
+            rows = db.session.execute(
+                select(Job.id, Job.skills).where(Job.id > last_id).order_by(Job.id).limit(batch_size)
+            ).all()
+            if not rows:
+                return indexed
+            for row in rows:
+                self.sync(row.id, row.skills)
+            db.session.commit()
+            indexed += len(rows)
+            last_id = rows[-1].id
+
+    @staticmethod
+    def jobs_with_skills(skills, match: str = MATCH_ALL):
+        """Subquery of job ids having all (or any) of ``skills``"""
+        keys = SkillIndexService.normalized(skills)
+        query = select(JobSkill.job_id).where(JobSkill.skill_norm.in_(keys))
+        if match == MATCH_ALL and len(keys) > 1:
+            query = query.group_by(JobSkill.job_id).having(func.count(distinct(JobSkill.skill_norm)) == len(keys))
+        return query
+
+    @staticmethod
+    def jobs_with_skill_prefix(prefix: str):
+        """Subquery of job ids having a skill that starts with ``prefix``"""
+        key = normalize_skill(prefix)
+        # LIKE rather than a range, which only holds under byte-order collations
+        return select(JobSkill.job_id).where(JobSkill.skill_norm.startswith(key, autoescape=True))
+
+
+def reindex_job_skills_command():
+    """Flask CLI command to rebuild the job skill index"""
+    from flask.cli import with_appcontext
+    import click
+
+    @with_appcontext
+    @click.option('--batch-size', type=int, default=500, help='Jobs indexed per transaction')
+    def reindex_skills(batch_size):
+        """Rebuild job_skills from every job's skills list"""
+        indexed = SkillIndexService().reindex(batch_size=batch_size)
+        print(f"✅ Indexed skills of {indexed} jobs")
+
+    return reindex_skills
@@ -0,0 +1,240 @@
+"""
+Storage ledger: incrementally maintained totals of uploaded document usage.
+
+Uploads and deletions adjust the ``storage_usage`` counters inside the same
+transaction as the application rows they belong to, so storage stats and
+quota checks are single-row lookups instead of a walk over ``static/``.
+``reconcile`` rebuilds the counters from disk to correct any drift (files
+removed by hand, failed transactions after a file was written, ...).
+"""
+import threading
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+from flask import current_app
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from ..extensions import db
+from ..models.application import Application
+from ..models.storage_usage import StorageUsage
+from ..common.exceptions import QuotaExceededError
+
+SCOPE_USER = 'user'
+SCOPE_JOB = 'job'
+SCOPE_DOC_TYPE = 'doc_type'
+SCOPE_TOTAL = 'total'
+SCOPE_UNREFERENCED = 'unreferenced'
+ALL = 'all'
+
+QUOTA_CONFIG_KEYS = {
+    SCOPE_USER: 'STORAGE_QUOTA_PER_USER_BYTES',
+    SCOPE_JOB: 'STORAGE_QUOTA_PER_JOB_BYTES',
+}
+
+# Only one reconciliation per process at a time
+_reconcile_lock = threading.Lock()
+
+
+class StorageLedger:
+    """Read and adjust the storage usage counters"""
+
+    def _apply(self, deltas: dict) -> None:
+        """Add ``{(scope, key): (bytes, files)}`` to the counters in the current session"""
+        now = datetime.utcnow()
+        dialect = db.session.get_bind().dialect.name
+        for (scope, key), (size, files) in sorted(deltas.items()):
+            values = {'scope': scope, 'scope_key': str(key), 'bytes': size, 'files': files, 'updated_at': now}
+            if dialect in ('sqlite', 'postgresql'):
+                dialect_insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+                stmt = dialect_insert(StorageUsage).values(**values)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['scope', 'scope_key'],
+                    set_={
+                        'bytes': StorageUsage.bytes + stmt.excluded.bytes,
+                        'files': StorageUsage.files + stmt.excluded.files,
+                        'updated_at': stmt.excluded.updated_at,
+                    },
+                )
+                db.session.execute(stmt)
+                continue
+            result = db.session.execute(
+                update(StorageUsage)
+                .where(StorageUsage.scope == scope, StorageUsage.scope_key == str(key))
+                .values(bytes=StorageUsage.bytes + size, files=StorageUsage.files + files, updated_at=now)
+            )
+            if result.rowcount == 0:
+                db.session.execute(insert(StorageUsage).values(**values))
+
+    @staticmethod
+    def _document_deltas(user_id: int, job_id: int, doc_type: str, size: int, files: int) -> dict:
+        return {
+            (SCOPE_USER, user_id): (size, files),
+            (SCOPE_JOB, job_id): (size, files),
+            (SCOPE_DOC_TYPE, doc_type): (size, files),
+            (SCOPE_TOTAL, ALL): (size, files),
+        }
+
+    def record_upload(self, user_id: int, job_id: int, doc_type: str, size: int) -> None:
+        """Count a stored document; the caller commits"""
+        self._apply(self._document_deltas(user_id, job_id, doc_type, size, 1))
+
+    def record_delete(self, user_id: int, job_id: int, doc_type: str, size: int) -> None:
+        """Uncount a removed document; the caller commits"""
+        self._apply(self._document_deltas(user_id, job_id, doc_type, -size, -1))
+
+    def usage(self, scope: str, key) -> dict:
+        row = db.session.get(StorageUsage, (scope, str(key)))
+        return {'bytes': row.bytes if row else 0, 'files': row.files if row else 0}
+
+    @staticmethod
+    def quota_for(scope: str) -> int:
+        """Configured quota in bytes for ``scope``; 0 means unlimited"""
+        return int(current_app.config.get(QUOTA_CONFIG_KEYS[scope], 0) or 0)
+
+    def check_quota(self, user_id: int, job_id: int, incoming_bytes: int = 0) -> None:
+        """Raise QuotaExceededError if storing ``incoming_bytes`` more would pass a quota.
+
+        Called with the upload size before anything is written, and again
+        with 0 after the counters were bumped inside the upload transaction,
+        which catches concurrent uploads that both passed the first check.
+        """
+        for scope, key in ((SCOPE_USER, user_id), (SCOPE_JOB, job_id)):
+            limit = self.quota_for(scope)
+            if not limit:
+                continue
+            used = self.usage(scope, key)['bytes']
+            if used + incoming_bytes > limit:
+                limit_mb = limit / (1024 * 1024)
+                if scope == SCOPE_USER:
+                    raise QuotaExceededError(
+                        f"Storage quota exceeded: your documents are limited to {limit_mb:.0f}MB"
+                    )
+                raise QuotaExceededError(
+                    "This job has reached its document storage limit and cannot accept more uploads"
+                )
+
+    def top_consumers(self, scope: str, limit: int = 20) -> list:
+        """Largest ``scope`` entries by bytes, with their share of the quota"""
+        quota = self.quota_for(scope)
+        rows = db.session.execute(
+            select(StorageUsage)
+            .where(StorageUsage.scope == scope)
+            .order_by(StorageUsage.bytes.desc(), StorageUsage.scope_key)
+            .limit(limit)
+        ).scalars().all()
+        return [
+            {
+                'id': int(r.scope_key),
+                'bytes': r.bytes,
+                'files': r.files,
+                'quota_bytes': quota or None,
+                'quota_used_percent': round(100 * r.bytes / quota, 1) if quota else None,
+                'updated_at': r.updated_at.isoformat(),
+            }
+            for r in rows
+        ]
+
+    def stats(self) -> dict:
+        """Totals per document type plus the overall and unreferenced rows"""
+        rows = db.session.execute(
+            select(StorageUsage).where(StorageUsage.scope.in_([SCOPE_DOC_TYPE, SCOPE_TOTAL, SCOPE_UNREFERENCED]))
+        ).scalars().all()
+        by_scope = {(r.scope, r.scope_key): r for r in rows}
+        total = by_scope.get((SCOPE_TOTAL, ALL))
+        unreferenced = by_scope.get((SCOPE_UNREFERENCED, ALL))
+        return {
+            'total_files': total.files if total else 0,
+            'total_size_bytes': total.bytes if total else 0,
+            'by_document_type': {
+                key: {'bytes': r.bytes, 'files': r.files}
+                for (scope, key), r in sorted(by_scope.items()) if scope == SCOPE_DOC_TYPE
+            },
+            'unreferenced_files': unreferenced.files if unreferenced else 0,
+            'unreferenced_size_bytes': unreferenced.bytes if unreferenced else 0,
+            'reconciled_at': unreferenced.updated_at.isoformat() if unreferenced else None,
+        }
+
+    def _lookup(self, paths: list) -> dict:
+        """Map stored paths to (user_id, job_id, doc_type) for referenced documents"""
+        rows = db.session.execute(
+            select(Application.user_id, Application.job_id, Application.resume_path, Application.cover_letter_path)
+            .where(or_(Application.resume_path.in_(paths), Application.cover_letter_path.in_(paths)))
+        ).all()
+        owners = {}
+        for user_id, job_id, resume_path, cover_letter_path in rows:
+            if resume_path:
+                owners[resume_path] = (user_id, job_id, 'resume')
+            if cover_letter_path:
+                owners[cover_letter_path] = (user_id, job_id, 'cover_letter')
+        return owners
+
+    def reconcile(self, batch_size: int | None = None) -> dict | None:
+        """Rebuild the counters from the files on disk.
+
+        Returns the rebuilt totals, or None if another reconciliation is
+        already running in this process. Uploads that land while the scan is
+        in progress may be off by one file until the next run.
+        """
+        from .file_cleanup_service import FileCleanupService
+
+        if not _reconcile_lock.acquire(blocking=False):
+            return None
+        try:
+            batch_size = batch_size or current_app.config.get('ORPHAN_SWEEP_BATCH_SIZE', 500)
+            totals = defaultdict(lambda: [0, 0])
+            # Always written, so an empty store still records when it was reconciled
+            totals[(SCOPE_TOTAL, ALL)] = [0, 0]
+            totals[(SCOPE_UNREFERENCED, ALL)] = [0, 0]
+
+            def process(batch):
+                owners = self._lookup([rel for rel, _ in batch])
+                for rel, size in batch:
+                    owner = owners.get(rel)
+                    if owner is None:
+                        keys = [(SCOPE_UNREFERENCED, ALL)]
+                    else:
+                        user_id, job_id, doc_type = owner
+                        keys = self._document_deltas(user_id, job_id, doc_type, 0, 0).keys()
+                    for key in keys:
+                        totals[key][0] += size
+                        totals[key][1] += 1
+
+            batch = []
+            for rel, entry in FileCleanupService()._iter_document_files():
+                try:
+                    batch.append((rel, entry.stat(follow_symlinks=False).st_size))
+                except FileNotFoundError:
+                    continue
+                if len(batch) >= batch_size:
+                    process(batch)
+                    batch = []
+            if batch:
+                process(batch)
+
+            now = datetime.utcnow()
+            db.session.execute(delete(StorageUsage))
+            db.session.execute(insert(StorageUsage), [
+                {'scope': scope, 'scope_key': str(key), 'bytes': size, 'files': files, 'updated_at': now}
+                for (scope, key), (size, files) in totals.items()
+            ])
+            db.session.commit()
+            current_app.logger.info(
+                f"Storage ledger reconciled: {totals[(SCOPE_TOTAL, ALL)][1]} documents, "
+                f"{totals[(SCOPE_UNREFERENCED, ALL)][1]} unreferenced files"
+            )
+            return self.stats()
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            _reconcile_lock.release()
+
+
+def file_size(path: Path) -> int:
+    """Size of ``path`` in bytes, 0 if it is already gone"""
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
@@ -0,0 +1,180 @@
+"""
+Typeahead suggestions and typo-tolerant matching for the public job search.
+
+Titles, skills and locations of active jobs are kept in a sorted array in
+process memory; a prefix lookup is a ``bisect`` into it followed by a short
+scan, so answering a keystroke costs no database query. The words of
+titles and skills are also indexed by trigram, which lets a misspelt query
+("pyhton") find the jobs of the words it most resembles.
+
+The index is kept in step with the jobs table by ``live_job_index``:
+writes made by this process are applied at once, those of other workers
+and of the status transition cron within SEARCH_INDEX_SYNC_SECONDS.
+"""
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+
+from ..models.job import Job
+from .live_job_index import LiveJobIndex
+
+KIND_TITLE = 'title'
+KIND_SKILL = 'skill'
+KIND_LOCATION = 'location'
+KINDS = (KIND_TITLE, KIND_SKILL, KIND_LOCATION)
+
+# Matches looked at per lookup before ranking; bounds the work for short prefixes
+MAX_SCAN = 500
+
+# Words shorter than this are too short for trigram matching to mean much
+MIN_FUZZY_WORD = 3
+_WORD_RE = re.compile(r"[a-z0-9#+.]+")
+
+
+def _normalize(text) -> str:
+    if not isinstance(text, str):
+        return ''
+    return " ".join(text.split()).lower()
+
+
+def _job_terms(title, skills, location) -> set:
+    """(key, kind, display) triples a job contributes to the index"""
+    terms = set()
+    for kind, values in ((KIND_TITLE, [title]), (KIND_SKILL, skills or []), (KIND_LOCATION, [location])):
+        for value in values:
+            key = _normalize(value)
+            if key:
+                terms.add((key, kind, " ".join(value.split())))
+    return terms
+
+
+def trigrams(word: str) -> set:
+    """Trigrams of ``word`` padded like pg_trgm: two spaces in front, one behind"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _fuzzy_words(terms: set) -> set:
+    words = set()
+    for key, kind, _ in terms:
+        if kind != KIND_LOCATION:
+            words.update(word for word in _WORD_RE.findall(key) if len(word) >= MIN_FUZZY_WORD)
+    return words
+
+
+class SuggestIndex:
+    """Sorted (key, kind) entries, each with a display text and a job count,
+    plus the title and skill words of each job indexed by trigram"""
+
+    def __init__(self):
+        self._entries = []   # sorted (key, kind)
+        self._terms = {}     # (key, kind) -> [display, job count]
+        self._jobs = {}      # job_id -> terms it contributed
+        self._words = {}     # word -> ids of jobs using it
+        self._grams = {}     # trigram -> words containing it
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def add_job(self, job_id: int, terms: set) -> None:
+        self.remove_job(job_id)
+        self._jobs[job_id] = terms
+        for key, kind, display in terms:
+            term = self._terms.get((key, kind))
+            if term is None:
+                self._terms[(key, kind)] = [display, 1]
+                insort(self._entries, (key, kind))
+            else:
+                term[1] += 1
+        for word in _fuzzy_words(terms):
+            job_ids = self._words.get(word)
+            if job_ids is None:
+                job_ids = self._words[word] = set()
+                for gram in trigrams(word):
+                    self._grams.setdefault(gram, set()).add(word)
+            job_ids.add(job_id)
+
+    def remove_job(self, job_id: int) -> None:
+        terms = self._jobs.pop(job_id, ())
+        for key, kind, _ in terms:
+            term = self._terms[(key, kind)]
+            term[1] -= 1
+            if not term[1]:
+                del self._terms[(key, kind)]
+                del self._entries[bisect_left(self._entries, (key, kind))]
+        for word in _fuzzy_words(terms):
+            job_ids = self._words[word]
+            job_ids.discard(job_id)
+            if not job_ids:
+                del self._words[word]
+                for gram in trigrams(word):
+                    self._grams[gram].discard(word)
+                    if not self._grams[gram]:
+                        del self._grams[gram]
+
+    def lookup(self, prefix: str, limit: int = 10, kinds=KINDS) -> list[dict]:
+        """Entries starting with ``prefix``, most used first"""
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+        matches = []
+        position = bisect_left(self._entries, (prefix,))
+        for key, kind in self._entries[position:position + MAX_SCAN]:
+            if not key.startswith(prefix):
+                break
+            if kind in kinds:
+                display, jobs = self._terms[(key, kind)]
+                matches.append({"text": display, "kind": kind, "jobs": jobs})
+        matches.sort(key=lambda match: (-match["jobs"], match["text"].lower()))
+        return matches[:limit]
+
+    def similar_jobs(self, query: str, threshold: float = 0.25, limit: int = 20) -> list[tuple[int, float]]:
+        """(job_id, score) of jobs whose words resemble those of ``query``, best first.
+
+        Word similarity is pg_trgm's: shared trigrams over the trigrams of
+        both words. Each query word contributes the similarity of its
+        closest word in the job, and the score is their average.
+        """
+        query_words = [w for w in _WORD_RE.findall(_normalize(query)) if len(w) >= MIN_FUZZY_WORD]
+        if not query_words:
+            return []
+        scores = Counter()
+        for query_word in query_words:
+            grams = trigrams(query_word)
+            shared = Counter()
+            for gram in grams:
+                shared.update(self._grams.get(gram, ()))
+            best = {}
+            for word, common in shared.items():
+                similarity = common / (len(grams) + len(trigrams(word)) - common)
+                if similarity < threshold:
+                    continue
+                for job_id in self._words[word]:
+                    if similarity > best.get(job_id, 0):
+                        best[job_id] = similarity
+            scores.update(best)
+        ranked = sorted(((job_id, score / len(query_words)) for job_id, score in scores.items()),
+                        key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+
+def _add_job(index: SuggestIndex, row) -> None:
+    index.add_job(row.id, _job_terms(row.title, row.skills, row.location))
+
+
+_live = LiveJobIndex(SuggestIndex, (Job.title, Job.skills, Job.location), _add_job)
+
+
+def suggest(prefix: str, limit: int = 10, kinds=KINDS) -> list[dict]:
+    """Suggestions for ``prefix``; reads the database only to sync the index"""
+    return _live.read(lambda index: index.lookup(prefix, limit=limit, kinds=kinds))
+
+
+def similar_jobs(query: str, threshold: float = 0.25, limit: int = 20) -> list[tuple[int, float]]:
+    """Active jobs resembling ``query`` despite typos, as (job_id, score), best first"""
+    return _live.read(lambda index: index.similar_jobs(query, threshold=threshold, limit=limit))
+
+
+def job_changed(job_id: int | None) -> None:
+    """Apply this process's change to ``job_id`` (None: many jobs) to the index"""
+    _live.job_changed(job_id)
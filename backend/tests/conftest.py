@@ -15,6 +15,7 @@ if BACKEND_DIR not in sys.path:
 from app import create_app
 from app.extensions import db as _db
 from app.services.auth_service import register_user, authenticate
+from app.services.live_job_index import reset_all as reset_job_indexes
 from flask_jwt_extended import create_access_token
 from datetime import timedelta
 
@@ -69,6 +70,64 @@ def app():
         _db.drop_all()
 
 
+@pytest.fixture(scope="session")
+def postgresql_url(tmp_path_factory):
+    """URL of a throwaway PostgreSQL database.
+
+    Uses TEST_POSTGRESQL_URL when set, otherwise starts a local server through
+    pytest-postgresql's executor. Skips when no PostgreSQL binaries are found.
+    """
+    url = os.getenv("TEST_POSTGRESQL_URL")
+    if url:
+        yield url
+        return
+
+    pg_ctl = shutil.which("pg_ctl") or next(iter(sorted(glob.glob("/usr/lib/postgresql/*/bin/pg_ctl"), reverse=True)), None)
+    if not pg_ctl:
+        pytest.skip("PostgreSQL binaries (pg_ctl) not available")
+
+    import port_for
+    from pytest_postgresql.executor import PostgreSQLExecutor
+    from pytest_postgresql.janitor import DatabaseJanitor
+
+    port = port_for.select_random()
+    base = tmp_path_factory.mktemp("postgresql")
+    executor = PostgreSQLExecutor(
+        executable=pg_ctl,
+        host="127.0.0.1",
+        port=port,
+        datadir=str(base / "data"),
+        unixsocketdir=str(base),
+        logfile=str(base / "postgresql.log"),
+        startparams="-w",
+        dbname="jobboard_test",
+    )
+    with executor:
+        executor.wait_for_postgres()
+        with DatabaseJanitor(
+            user=executor.user,
+            host=executor.host,
+            port=executor.port,
+            version=executor.version,
+            dbname="jobboard_test",
+        ):
+            yield f"postgresql+psycopg://{executor.user}@{executor.host}:{executor.port}/jobboard_test"
+
+
+@pytest.fixture
+def pg_app(postgresql_url):
+    """Application bound to the PostgreSQL test database"""
+    class PgConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = postgresql_url
+
+    pg = create_app(PgConfig)
+    with pg.app_context():
+        _db.create_all()
+        yield pg
+        _db.session.remove()
+        _db.drop_all()
+
+
 @pytest.fixture()
 def client(app):
     return app.test_client()
@@ -76,7 +135,9 @@ def client(app):
 
 @pytest.fixture(autouse=True)
 def db(app):
-    # Ensure a clean database for each test
+    # Ensure a clean database (and no cached rows or in-process job indexes from the last one) for each test
+    app.extensions['cache'].clear()
+    reset_job_indexes()
     _db.session.remove()
     _db.drop_all()
     _db.create_all()
@@ -106,8 +167,10 @@ def auth_headers(app):
 
 @pytest.fixture
 def make_job(app):
+    """Create a job through JobService; keyword arguments override payload fields"""
     from app.services.job_service import JobService
-    def _mk(user_id):
+    from app.models.job import Job
+    def _mk(user_id, **overrides):
         payload = {
             "title": f"Job {os.urandom(2).hex()}",
             "description": "desc long enough",
@@ -118,12 +181,10 @@ def make_job(app):
             "responsibilities": "resp",
             "skills": ["skill"],
             "application_deadline": "2099-01-01",
+            **overrides,
         }
-        JobService().create_job(user_id=user_id, job_data=payload)
-        # Fetch minimal info
-        from sqlalchemy import select
-        from app.models.job import Job
-        return _db.session.execute(select(Job).where(Job.user_id==user_id).limit(1)).scalar_one()
+        result = JobService().create_job(user_id=user_id, job_data=payload)
+        return _db.session.get(Job, result["job"]["id"])
     return _mk
 
 
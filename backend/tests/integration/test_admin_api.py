@@ -96,3 +96,74 @@ def test_admin_metrics_and_users():
         ctx.pop()
 
 
+
+
+def test_admin_storage_stats_and_reconcile(tmp_path):
+    app, client, ctx = _mk_client()
+    try:
+        app.instance_path = str(tmp_path / 'instance')
+        doc = tmp_path / 'static' / 'users' / '1' / 'stray.pdf'
+        doc.parent.mkdir(parents=True)
+        doc.write_bytes(b'x' * 10)
+
+        _register_user(client, 'admin@example.com', 'admin')
+        from app.models.user import User
+        admin_id = db.session.query(User).filter_by(email='admin@example.com').first().id
+        _add_role(admin_id, 'admin')
+        headers = {'Authorization': f"Bearer {_login(client, 'admin@example.com')['access_token']}"}
+
+        before = client.get('/api/admin/storage', headers=headers)
+        assert before.status_code == 200
+        assert before.get_json()['reconciled_at'] is None
+
+        # Runs inline under TESTING
+        started = client.post('/api/admin/storage/reconcile', headers=headers)
+        assert started.status_code == 202
+
+        after = client.get('/api/admin/storage', headers=headers).get_json()
+        assert after['unreferenced_files'] == 1
+        assert after['unreferenced_size_bytes'] == 10
+        assert after['reconciled_at'] is not None
+
+        from app.services.storage_ledger_service import StorageLedger
+        StorageLedger().record_upload(admin_id, 42, 'resume', 2048)
+        db.session.commit()
+        top = client.get('/api/admin/storage/top-consumers?scope=user&limit=5', headers=headers)
+        assert top.status_code == 200
+        consumers = top.get_json()['consumers']
+        assert consumers[0]['id'] == admin_id
+        assert consumers[0]['username'] == 'admin'
+        assert consumers[0]['bytes'] == 2048
+        jobs = client.get('/api/admin/storage/top-consumers?scope=job', headers=headers).get_json()
+        assert jobs['consumers'][0]['id'] == 42
+        assert client.get('/api/admin/storage/top-consumers?scope=disk', headers=headers).status_code == 400
+    finally:
+        db.drop_all()
+        ctx.pop()
+
+
+def test_admin_metrics_served_from_cache():
+    app, client, ctx = _mk_client()
+    try:
+        _register_user(client, 'admin@example.com', 'admin')
+        from app.models.user import User
+        admin_id = db.session.query(User).filter_by(email='admin@example.com').first().id
+        _add_role(admin_id, 'admin')
+        headers = {'Authorization': f"Bearer {_login(client, 'admin@example.com')['access_token']}"}
+
+        first = client.get('/api/admin/metrics', headers=headers).get_json()
+        _register_user(client, 'late@example.com', 'late')
+        # Cached until ADMIN_METRICS_CACHE_TTL runs out
+        assert client.get('/api/admin/metrics', headers=headers).get_json() == first
+
+        stats = client.get('/api/admin/cache', headers=headers)
+        assert stats.status_code == 200
+        body = stats.get_json()
+        assert body['backend'] == 'memory'
+        assert body['namespaces']['admin']['misses'] == 1
+        assert body['namespaces']['admin']['hits'] == 1
+        # Token checks bypass a per-process cache
+        assert 'auth' not in body['namespaces']
+    finally:
+        db.drop_all()
+        ctx.pop()
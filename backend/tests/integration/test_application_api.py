@@ -190,6 +190,31 @@ class TestApplicationAPI:
         assert data['status'] == 'created'
         assert 'application' in data
     
+    def test_apply_for_job_over_storage_quota(self, app, client, auth_headers, sample_job, sample_application_data):
+        """Uploads that would pass the user's quota are refused before anything is written"""
+        app.config['STORAGE_QUOTA_PER_USER_BYTES'] = 20
+        data = {
+            'firstName': sample_application_data['firstName'],
+            'lastName': sample_application_data['lastName'],
+            'email': sample_application_data['email'],
+            'resume': (BytesIO(b'%PDF-1.4 fake pdf content'), 'resume.pdf'),
+            'coverLetter': (BytesIO(b'%PDF-1.4 fake cover letter content'), 'cover_letter.pdf')
+        }
+        
+        with patch('app.api.applications.routes.validate_and_process_upload') as mock_validate, \
+                patch('app.services.application_service.ApplicationService._save_file') as mock_save_file:
+            response = client.post(
+                f'/api/applications/jobs/{sample_job.id}/apply',
+                data=data,
+                headers=auth_headers,
+                content_type='multipart/form-data'
+            )
+        
+        assert response.status_code == 413
+        assert 'quota' in response.get_json()['error'].lower()
+        mock_validate.assert_not_called()
+        mock_save_file.assert_not_called()
+    
     def test_apply_for_job_missing_files(self, client, auth_headers, sample_job, sample_application_data):
         """Test job application with missing files"""
         data = {
@@ -1,6 +1,6 @@
 import pytest
 import json
-from datetime import date
+from datetime import date, datetime
 from unittest.mock import patch, MagicMock
 from flask import current_app
 from app import create_app
@@ -312,6 +312,26 @@ class TestApplicationDetailAPI:
         data = response.get_json()
         assert 'error' in data
     
+    def test_application_of_deleted_job_not_found(self, client, recruiter_auth_headers, sample_application):
+        """Test that applications to a soft-deleted job are no longer reachable"""
+        with client.application.app_context():
+            job = db.session.get(Job, sample_application.job_id)
+            job.deleted_at = datetime.utcnow()
+            db.session.commit()
+        
+        response = client.get(
+            f'/api/applications/{sample_application.id}',
+            headers=recruiter_auth_headers
+        )
+        assert response.status_code == 404
+        
+        response = client.patch(
+            f'/api/applications/{sample_application.id}/status',
+            headers=recruiter_auth_headers,
+            json={'status': 'accepted'}
+        )
+        assert response.status_code == 404
+    
     def test_update_application_status_success(self, client, recruiter_auth_headers, sample_job, sample_candidate):
         """Test successful application status update"""
         # Create test application within the test
@@ -158,3 +158,29 @@ def test_logout_refresh_without_token(client):
     assert res.status_code == 401
     body = res.get_json() or {}
     assert "Missing" in (body.get("msg") or body.get("error") or "")
+
+
+def test_revocation_by_another_worker_applies_at_once(client):
+    from datetime import UTC, datetime, timedelta
+    from flask_jwt_extended import decode_token
+    from app.extensions import db
+    from app.models.revoked_token import RevokedToken
+
+    client.post(
+        "/api/auth/register",
+        json={"email": "otherworker@example.com", "password": "Password123!", "username": "otherworker"},
+    )
+    access = client.post(
+        "/api/auth/login",
+        json={"email": "otherworker@example.com", "password": "Password123!"},
+    ).get_json()["access_token"]
+    headers = {"Authorization": f"Bearer {access}"}
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+    # Written straight to the database, as a logout handled by another worker would be;
+    # nothing this process cached may let the token through
+    with client.application.app_context():
+        jti = decode_token(access)["jti"]
+        db.session.add(RevokedToken(jti=jti, expires_at=datetime.now(UTC) + timedelta(hours=1)))
+        db.session.commit()
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
@@ -0,0 +1,24 @@
+from app.extensions import db
+from app.models.application import Application
+
+
+def test_recommended_jobs_endpoint(client, auth_headers, make_user, make_job):
+    recruiter = make_user(is_verified=True)
+    candidate = make_user(is_verified=True)
+    job = make_job(user_id=recruiter.id)
+
+    resp = client.get('/api/candidate/recommended-jobs', headers=auth_headers(candidate))
+    assert resp.status_code == 200
+    assert resp.json == {"jobs": [], "total": 0}
+
+    other = make_job(user_id=candidate.id)
+    db.session.add(Application(user_id=candidate.id, job_id=other.id, first_name="A", last_name="B",
+                               email="a@example.com", skills="skill"))
+    db.session.commit()
+    resp = client.get('/api/candidate/recommended-jobs?limit=5', headers=auth_headers(candidate))
+    assert resp.status_code == 200
+    assert [item["id"] for item in resp.json["jobs"]] == [job.id]
+    assert 0 < resp.json["jobs"][0]["score"] <= 1
+
+    assert client.get('/api/candidate/recommended-jobs?limit=0', headers=auth_headers(candidate)).status_code == 400
+    assert client.get('/api/candidate/recommended-jobs').status_code == 401
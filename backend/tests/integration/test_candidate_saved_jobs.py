@@ -34,3 +34,78 @@ def test_candidate_saved_jobs_flow(client, auth_headers, make_user, make_job):
     assert resp.json['saved'] is False
 
 
+
+def test_batch_saved_status(client, auth_headers, make_user, make_job):
+    user = make_user(is_verified=True)
+    saved_job = make_job(user_id=user.id)
+    other_job = make_job(user_id=make_user().id)
+    client.post(f'/api/candidate/saved-jobs/{saved_job.id}', headers=auth_headers(user))
+
+    resp = client.get(f'/api/candidate/saved-jobs/status?job_ids={saved_job.id},{other_job.id},999999',
+                      headers=auth_headers(user))
+    assert resp.status_code == 200
+    assert resp.json['saved'] == {str(saved_job.id): True, str(other_job.id): False, '999999': False}
+
+    resp = client.get('/api/candidate/saved-jobs/status?job_ids=1,abc', headers=auth_headers(user))
+    assert resp.status_code == 400
+    ids = ','.join(str(i) for i in range(101))
+    resp = client.get(f'/api/candidate/saved-jobs/status?job_ids={ids}', headers=auth_headers(user))
+    assert resp.status_code == 400
+
+
+def test_public_search_include_saved(client, auth_headers, make_user, make_job):
+    user = make_user(is_verified=True)
+    saved_job = make_job(user_id=user.id)
+    other_job = make_job(user_id=make_user().id)
+    client.post(f'/api/candidate/saved-jobs/{saved_job.id}', headers=auth_headers(user))
+
+    resp = client.get('/api/recruiter/jobs?include=saved', headers=auth_headers(user))
+    assert resp.status_code == 200
+    flags = {job['id']: job['saved'] for job in resp.json['jobs']}
+    assert flags[saved_job.id] is True
+    assert flags[other_job.id] is False
+
+    # Anonymous callers, or a bad token, get the plain listing
+    for headers in ({}, {"Authorization": "Bearer not-a-token"}):
+        resp = client.get('/api/recruiter/jobs?include=saved', headers=headers)
+        assert resp.status_code == 200
+        assert all('saved' not in job for job in resp.json['jobs'])
+
+
+def test_save_is_idempotent_and_unknown_job_404s(client, auth_headers, make_user, make_job):
+    user = make_user(is_verified=True)
+    job = make_job(user_id=user.id)
+
+    for _ in range(2):
+        resp = client.post(f'/api/candidate/saved-jobs/{job.id}', headers=auth_headers(user))
+        assert resp.status_code == 200
+        assert resp.json['saved'] is True
+    assert client.get('/api/candidate/saved-jobs', headers=auth_headers(user)).json['total'] == 1
+
+    resp = client.post('/api/candidate/saved-jobs/999999', headers=auth_headers(user))
+    assert resp.status_code == 404
+
+    resp = client.delete(f'/api/candidate/saved-jobs/{job.id}', headers=auth_headers(user))
+    assert resp.json == {'saved': False, 'removed': True}
+    resp = client.delete(f'/api/candidate/saved-jobs/{job.id}', headers=auth_headers(user))
+    assert resp.json == {'saved': False, 'removed': False}
+
+
+def test_bulk_save_and_unsave(client, auth_headers, make_user, make_job):
+    user = make_user(is_verified=True)
+    jobs = [make_job(user_id=make_user().id) for _ in range(3)]
+    client.post(f'/api/candidate/saved-jobs/{jobs[0].id}', headers=auth_headers(user))
+
+    resp = client.post('/api/candidate/saved-jobs/bulk', headers=auth_headers(user),
+                       json={'save': [jobs[1].id, jobs[2].id, 999999], 'unsave': [jobs[0].id]})
+    assert resp.status_code == 200
+    assert resp.json['saved_count'] == 2
+    assert resp.json['unsaved_count'] == 1
+    assert resp.json['saved'] == {str(jobs[0].id): False, str(jobs[1].id): True,
+                                  str(jobs[2].id): True, '999999': False}
+
+    resp = client.post('/api/candidate/saved-jobs/bulk', headers=auth_headers(user),
+                       json={'save': [jobs[1].id], 'unsave': [jobs[1].id]})
+    assert resp.status_code == 400
+    resp = client.post('/api/candidate/saved-jobs/bulk', headers=auth_headers(user), json={'save': 'nope'})
+    assert resp.status_code == 400
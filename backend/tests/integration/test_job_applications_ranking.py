@@ -0,0 +1,23 @@
+from app.extensions import db
+from app.models.application import Application
+
+
+def test_job_applications_order_by_score(client, auth_headers, make_user, make_job):
+    recruiter = make_user(is_verified=True)
+    job = make_job(user_id=recruiter.id)
+    for skills in ("cooking", "skill"):
+        candidate = make_user(is_verified=True)
+        db.session.add(Application(user_id=candidate.id, job_id=job.id, first_name="A", last_name="B",
+                                   email=candidate.email, skills=skills))
+    db.session.commit()
+
+    url = f'/api/applications/jobs/{job.id}/applications'
+    resp = client.get(f'{url}?order=score&per_page=1', headers=auth_headers(recruiter))
+    assert resp.status_code == 200
+    assert resp.json['applications'][0]['skills'] == "skill"
+    assert resp.json['applications'][0]['match_score'] > 0
+    assert resp.json['pagination']['pages'] == 2
+
+    resp = client.get(f'{url}?order=salary', headers=auth_headers(recruiter))
+    assert resp.status_code == 400
+    assert 'order' in resp.json['details']
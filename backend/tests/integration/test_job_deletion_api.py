@@ -29,8 +29,8 @@ class TestJobDeletionAPI:
             deletion_summary = data['deletion_summary']
             assert deletion_summary['job_id'] == job.id
             assert deletion_summary['job_title'] == job.title  # Use the actual job title
-            assert deletion_summary['applications_deleted'] == 0
-            assert deletion_summary['saved_jobs_deleted'] == 0
+            assert deletion_summary['purge'] == 'scheduled'
+            assert deletion_summary['deleted_at'] is not None
 
     def test_delete_job_with_applications(self, client, auth_headers, make_user, make_job):
         """Test job deletion with applications via API"""
@@ -79,9 +79,9 @@ class TestJobDeletionAPI:
             data = response.get_json()
             deletion_summary = data['deletion_summary']
             
-            assert deletion_summary['applications_deleted'] == 2
-            assert deletion_summary['saved_jobs_deleted'] == 1
+            assert deletion_summary['purge'] == 'scheduled'
             
+            # The purge ran inline (background tasks are synchronous under TESTING)
             # Verify applications are deleted
             applications = db.session.execute(
                 db.select(Application).where(Application.job_id == job.id)
@@ -183,8 +183,9 @@ class TestJobDeletionAPI:
             data = response.get_json()
             deletion_summary = data['deletion_summary']
             
-            # Verify file cleanup results
-            file_cleanup = deletion_summary['file_cleanup']
-            assert file_cleanup['files_deleted'] >= 0  # Files may not exist in test environment
-            assert file_cleanup['folders_deleted'] >= 0
-            assert file_cleanup['errors'] == []
+            assert deletion_summary['purge'] == 'scheduled'
+            
+            # The job is gone from the recruiter's listing immediately
+            listing = client.get('/api/recruiter/my-jobs', headers=recruiter_headers)
+            assert listing.status_code == 200
+            assert listing.get_json()['total'] == 0
@@ -0,0 +1,82 @@
+"""
+COPY-based PostgreSQL backup/restore round trip. Skipped when PostgreSQL
+binaries are not available (see the ``postgresql_url`` fixture).
+"""
+from sqlalchemy import func, inspect, select
+
+from app.extensions import db
+from app.models.job import Job
+from app.models.user import User
+from app.services.auth_service import register_user
+from app.services.backup_service import DatabaseBackupService
+from app.services.job_service import JobService
+
+
+def _seed(count):
+    user = register_user(email="pgbackup@example.com", password="Password123!", username="pgbackup")
+    for i in range(count):
+        JobService().create_job(user.id, {
+            "title": f"Backup Job {i}",
+            "description": "A job that should survive a restore",
+            "salary_min": 1,
+            "salary_max": 2,
+            "location": "Remote",
+            "requirements": ["python"],
+            "responsibilities": "Ship",
+            "skills": ["python", "sql"],
+            "application_deadline": "2099-01-01",
+        })
+    return user
+
+
+def test_postgres_backup_and_restore_round_trip(pg_app, tmp_path, monkeypatch):
+    monkeypatch.setattr(pg_app, 'instance_path', str(tmp_path))
+    pg_app.config['BACKUP_PARALLEL_WORKERS'] = 3
+    _seed(25)
+
+    service = DatabaseBackupService()
+    archive = service.create_backup("pg_nightly")
+    assert archive.endswith("pg_nightly.pgdump.tar")
+    assert service.last_backup_stats['rows'] >= 26
+    assert service.verify_backup(archive)[0] is True
+
+    # Lose data, then restore
+    db.session.execute(Job.__table__.delete())
+    db.session.commit()
+    assert db.session.execute(select(func.count(Job.id))).scalar() == 0
+
+    assert service.restore_backup(archive) is True
+    db.session.remove()
+
+    assert db.session.execute(select(func.count(Job.id))).scalar() == 25
+    assert db.session.execute(select(func.count(User.id))).scalar() == 1
+
+    # Secondary indexes and foreign keys were rebuilt after the load
+    inspector = inspect(db.engine)
+    assert 'idx_jobs_user_created' in {ix['name'] for ix in inspector.get_indexes('jobs')}
+    assert inspector.get_foreign_keys('applications')
+
+    # Sequences continue after the restored ids
+    user = db.session.execute(select(User)).scalar_one()
+    result = JobService().create_job(user.id, {
+        "title": "After Restore",
+        "description": "New rows get fresh ids",
+        "salary_min": 1,
+        "salary_max": 2,
+        "location": "Remote",
+        "requirements": ["python"],
+        "responsibilities": "Ship",
+        "skills": ["python"],
+        "application_deadline": "2099-01-01",
+    })
+    assert result["job"]["id"] > 25
+
+
+def test_postgres_benchmark_sample_is_capped(pg_app, tmp_path, monkeypatch):
+    monkeypatch.setattr(pg_app, 'instance_path', str(tmp_path))
+    _seed(25)
+
+    service = DatabaseBackupService()
+    assert len(service._sample_database(512)) == 512
+    # Nothing is staged on disk
+    assert list(service.backup_dir.iterdir()) == []
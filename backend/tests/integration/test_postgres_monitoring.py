@@ -0,0 +1,85 @@
+"""
+PostgreSQL-only monitoring checks. These run against a throwaway server started
+through pytest-postgresql (see the ``postgresql_url`` fixture) and are skipped
+when PostgreSQL binaries are not installed.
+"""
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+
+from app.extensions import db
+from app.services.monitoring_service import DatabaseMonitor
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = predicate()
+        if result:
+            return result
+        time.sleep(0.2)
+    return predicate()
+
+
+def test_database_size_and_cache_hit_ratio(pg_app):
+    monitor = DatabaseMonitor()
+    size = monitor._check_database_size()
+    assert size['status'] is True
+    assert size['size_bytes'] > 0
+
+    ratio = monitor._check_cache_hit_ratio()
+    assert ratio['name'] == 'cache_hit_ratio'
+    assert ratio['ratio'] is None or 0 <= ratio['ratio'] <= 1
+
+
+def test_detects_long_running_query(pg_app):
+    pg_app.config['LONG_QUERY_THRESHOLD_SECONDS'] = 0.5
+    engine = create_engine(pg_app.config['SQLALCHEMY_DATABASE_URI'])
+
+    def _sleep():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_sleep(3)"))
+
+    worker = threading.Thread(target=_sleep)
+    worker.start()
+    try:
+        monitor = DatabaseMonitor()
+        queries = _wait_for(lambda: monitor.get_long_running_queries(0.5))
+        assert any('pg_sleep' in q['query'] for q in queries)
+    finally:
+        worker.join()
+        engine.dispose()
+
+
+def test_reports_blocked_lock_chain(pg_app):
+    engine = create_engine(pg_app.config['SQLALCHEMY_DATABASE_URI'])
+    holder = engine.connect()
+    holder_tx = holder.begin()
+    holder.execute(text("LOCK TABLE jobs IN ACCESS EXCLUSIVE MODE"))
+
+    def _blocked_read():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT count(*) FROM jobs"))
+
+    worker = threading.Thread(target=_blocked_read)
+    worker.start()
+    try:
+        monitor = DatabaseMonitor()
+        chains = _wait_for(monitor.get_blocked_lock_chains)
+        assert chains
+        holder_pid = holder.execute(text("SELECT pg_backend_pid()")).scalar()
+        assert chains[0]['root_blocker']['pid'] == holder_pid
+        assert 'LOCK TABLE' in (chains[0]['root_blocker']['query'] or '') or chains[0]['root_blocker']['state']
+    finally:
+        holder_tx.rollback()
+        holder.close()
+        worker.join()
+        engine.dispose()
+
+
+def test_activity_report_lists_table_bloat(pg_app):
+    report = DatabaseMonitor().get_database_activity(refresh=True)
+    assert report['supported'] is True
+    assert {row['table_name'] for row in report['table_bloat']} >= {'jobs', 'users'}
+    db.session.remove()
@@ -74,3 +74,79 @@ def test_public_job_detail_404_for_deprecated(client):
   res = client.get(f"/api/recruiter/jobs/{job_id}")
   assert res.status_code == 404
 
+
+
+def _create_public_job(client, email, username, title):
+  client.post("/api/auth/register", json={"email": email, "password": "Password123!", "username": username})
+  access = client.post("/api/auth/login", json={"email": email, "password": "Password123!"}).get_json()["access_token"]
+  res = client.post("/api/recruiter/create-job", json={"title": title, **_base_job_payload()}, headers=auth_header(access))
+  return access, res.get_json()["job"]["id"]
+
+
+def test_public_job_detail_conditional_get(client):
+  _, job_id = _create_public_job(client, "etag@example.com", "etag1", "Cached Detail")
+
+  res = client.get(f"/api/recruiter/jobs/{job_id}")
+  assert res.status_code == 200
+  etag = res.headers["ETag"]
+  assert not etag.startswith("W/")
+  assert res.headers["Last-Modified"]
+  assert "public" in res.headers["Cache-Control"]
+  assert "max-age=" in res.headers["Cache-Control"]
+
+  not_modified = client.get(f"/api/recruiter/jobs/{job_id}", headers={"If-None-Match": etag})
+  assert not_modified.status_code == 304
+  assert not_modified.data == b""
+  assert not_modified.headers["ETag"] == etag
+
+  stale = client.get(f"/api/recruiter/jobs/{job_id}", headers={"If-None-Match": '"other"'})
+  assert stale.status_code == 200
+
+
+def test_public_job_detail_cache_invalidated_by_writes(client):
+  access, job_id = _create_public_job(client, "etag2@example.com", "etag2", "Before Edit")
+  etag = client.get(f"/api/recruiter/jobs/{job_id}").headers["ETag"]
+
+  client.put(f"/api/recruiter/my-jobs/{job_id}", json={"title": "After Edit"}, headers=auth_header(access))
+  res = client.get(f"/api/recruiter/jobs/{job_id}", headers={"If-None-Match": etag})
+  assert res.status_code == 200
+  assert res.get_json()["title"] == "After Edit"
+  assert res.headers["ETag"] != etag
+
+  client.post(f"/api/recruiter/my-jobs/{job_id}/archive", headers=auth_header(access))
+  assert client.get(f"/api/recruiter/jobs/{job_id}").status_code == 404
+  client.post(f"/api/recruiter/my-jobs/{job_id}/unarchive", headers=auth_header(access))
+  assert client.get(f"/api/recruiter/jobs/{job_id}").status_code == 200
+
+  client.delete(f"/api/recruiter/my-jobs/{job_id}", headers=auth_header(access))
+  assert client.get(f"/api/recruiter/jobs/{job_id}").status_code == 404
+
+
+def test_public_jobs_filters_and_facets(client):
+  access, _ = _create_public_job(client, "facets@example.com", "facets1", "Remote Role")
+  client.post("/api/recruiter/create-job", json={"title": "Office Role", **_base_job_payload(), "work_mode": "onsite"},
+              headers=auth_header(access))
+
+  res = client.get("/api/recruiter/jobs?work_mode=remote,hybrid&include=facets")
+  assert res.status_code == 200
+  data = res.get_json()
+  assert [job["title"] for job in data["jobs"]] == ["Remote Role"]
+  assert data["facets"]["work_mode"] == {"remote": 1, "onsite": 1}
+
+  assert "facets" not in client.get("/api/recruiter/jobs").get_json()
+  assert client.get("/api/recruiter/jobs?work_mode=underwater").status_code == 400
+  assert client.get("/api/recruiter/jobs?salary_min=10&salary_max=5").status_code == 400
+
+
+def test_suggest_endpoint(client):
+  _create_public_job(client, "suggest@example.com", "suggest1", "Senior Python Engineer")
+
+  res = client.get("/api/recruiter/jobs/suggest?prefix=Sen")
+  assert res.status_code == 200
+  assert res.get_json()["suggestions"][0] == {"text": "Senior Python Engineer", "kind": "title", "jobs": 1}
+
+  res = client.get("/api/recruiter/jobs/suggest?prefix=re&kind=skill")
+  assert [s["text"] for s in res.get_json()["suggestions"]] == ["react"]
+
+  assert client.get("/api/recruiter/jobs/suggest").status_code == 400
+  assert client.get("/api/recruiter/jobs/suggest?prefix=a&limit=500").status_code == 400
@@ -0,0 +1,114 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from app.extensions import db as _db
+from app.models.application import Application
+from app.services.applicant_ranking_service import ApplicantRankingService, score_applications
+from app.services.application_service import ApplicationService
+from app.services.job_service import JobService
+
+
+def _row(skills=None, experience=None, education=None):
+    return SimpleNamespace(skills=skills, experience=experience, education=education)
+
+
+def test_scores_blend_skills_experience_and_education():
+    requirements = ["Bachelor degree in computer science", "3+ years of Python"]
+    rows = [
+        _row("Python, Django, PostgreSQL", "5-10 years", "master"),
+        _row("python, django", "1-2 years", "high-school"),
+        _row("Java", "5-10 years", "bachelor"),
+        _row(),
+    ]
+    scores = score_applications(["Python", "Django", "Machine Learning"], requirements, "senior", rows)
+
+    assert list(scores) == sorted(scores, reverse=True)
+    assert ((0 <= scores) & (scores <= 1)).all()
+    # Blank skills match nothing; blank experience and education score UNKNOWN_SCORE
+    assert scores[3] == pytest.approx(0.4 * 0.5)
+    # Both words of a multi-word skill are needed
+    assert score_applications(["Machine Learning"], [], None, [_row("machine vision")])[0] == \
+        score_applications(["Machine Learning"], [], None, [_row("go")])[0]
+
+
+def test_experience_short_of_the_seniority_costs_more_than_excess():
+    # Half a year either side of the year a junior role expects
+    rows = [_row(experience="1-2 years"), _row(experience="0-1 years"), _row(experience="10+ years")]
+    over, short, far_over = score_applications([], [], "junior", rows)
+    assert over > short > far_over
+
+
+def _apply(job_id, user, skills, experience="3-5 years"):
+    application = Application(user_id=user.id, job_id=job_id, first_name="A", last_name="B",
+                              email=user.email, skills=skills, experience=experience, education="bachelor")
+    _db.session.add(application)
+    _db.session.commit()
+    return application.id
+
+
+def test_order_by_score_caches_scores_until_the_job_changes(app, db, make_user, make_job):
+    recruiter = make_user()
+    job_id = make_job(recruiter.id, title="Backend", requirements=["Bachelor degree"], skills=["Python", "Django"],
+                      seniority="mid").id
+    weak = _apply(job_id, make_user(), "Excel")
+    strong = _apply(job_id, make_user(), "Python, Django")
+    partial = _apply(job_id, make_user(), "Python")
+    service = ApplicationService()
+
+    newest = service.get_job_applications(job_id, recruiter.id)
+    assert [a["id"] for a in newest["applications"]] == [partial, strong, weak]
+    assert all(a["match_score"] is None for a in newest["applications"])
+
+    page = service.get_job_applications(job_id, recruiter.id, per_page=2, order="score")
+    assert [a["id"] for a in page["applications"]] == [strong, partial]
+    assert page["pagination"]["total"] == 3 and page["pagination"]["pages"] == 2
+    assert service.get_job_applications(job_id, recruiter.id, page=2, per_page=2, order="score")[
+        "applications"][0]["id"] == weak
+    updated_at = _db.session.execute(select(Application.updated_at).where(Application.id == weak)).scalar()
+
+    ranking = ApplicantRankingService()
+    job = JobService._get_owned_job(recruiter.id, job_id)
+    assert ranking.refresh_scores(job) == 0
+    _apply(job_id, make_user(), "Django")
+    assert ranking.refresh_scores(job) == 1
+    # Scoring doesn't count as an edit of the application
+    assert _db.session.execute(select(Application.updated_at).where(Application.id == weak)).scalar() == updated_at
+
+    JobService().update_job(recruiter.id, job_id, {"skills": ["Excel"]})
+    ranked = service.get_job_applications(job_id, recruiter.id, order="score")["applications"]
+    assert ranked[0]["id"] == weak
+    assert ranking.refresh_scores(JobService._get_owned_job(recruiter.id, job_id)) == 0
+
+
+def test_unscored_applications_sort_last(app, db, make_user, make_job, monkeypatch):
+    from sqlalchemy import event
+
+    recruiter = make_user()
+    job_id = make_job(recruiter.id, title="Backend", skills=["Python"]).id
+    scored = _apply(job_id, make_user(), "Python")
+    service = ApplicationService()
+    service.get_job_applications(job_id, recruiter.id, order="score")
+    # Applied after the scores were refreshed, so its match_score is still NULL
+    monkeypatch.setattr(ApplicantRankingService, "refresh_scores", lambda self, job: 0)
+    unscored = _apply(job_id, make_user(), "Python")
+
+    statements = []
+    capture = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(_db.engine, "before_cursor_execute", capture)
+    try:
+        ranked = service.get_job_applications(job_id, recruiter.id, order="score")["applications"]
+    finally:
+        event.remove(_db.engine, "before_cursor_execute", capture)
+
+    assert [a["id"] for a in ranked] == [scored, unscored]
+    # SQLite puts NULLs last in a descending sort anyway; PostgreSQL needs it spelled out
+    assert any("match_score DESC NULLS LAST" in statement for statement in statements)
+
+
+def test_score_order_uses_index(app, db):
+    stmt = ("EXPLAIN QUERY PLAN SELECT id FROM applications WHERE job_id = 1 "
+            "ORDER BY match_score DESC NULLS LAST, created_at DESC")
+    plan = " ".join(str(row) for row in db.session.execute(db.text(stmt)).all())
+    assert "idx_applications_job_score" in plan
@@ -1,7 +1,7 @@
 import pytest
 import os
 import tempfile
-from datetime import date
+from datetime import date, datetime
 from unittest.mock import patch, MagicMock
 from io import BytesIO
 from flask import current_app
@@ -279,3 +279,26 @@ class TestApplicationService:
             assert 'pagination' in result
             assert len(result['applications']) == 1
             assert result['applications'][0]['first_name'] == 'John'
+    
+    def test_applications_of_deleted_job_are_hidden(self, app, sample_user, sample_job):
+        """Applications to a soft-deleted job drop out of both listings"""
+        from app.common.exceptions import AuthorizationError
+        with app.app_context():
+            db.session.add(Application(
+                user_id=sample_user.id,
+                job_id=sample_job.id,
+                first_name='John',
+                last_name='Doe',
+                email='john@example.com',
+                status='submitted'
+            ))
+            sample_job.deleted_at = datetime.utcnow()
+            db.session.merge(sample_job)
+            db.session.commit()
+            
+            service = ApplicationService()
+            result = service.get_user_applications(sample_user.id)
+            assert result['applications'] == []
+            assert result['pagination']['total'] == 0
+            with pytest.raises(AuthorizationError):
+                service.get_job_applications(sample_job.id, sample_job.user_id)
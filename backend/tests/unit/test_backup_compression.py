@@ -0,0 +1,69 @@
+import gzip
+import io
+import random
+
+import pytest
+
+from app.services.backup_compression import (
+    GzipCompressor,
+    ParallelGzipCompressor,
+    available_compressors,
+    get_compressor,
+    measure_compressor,
+    open_compressed,
+)
+
+
+def _payload(size=3_000_000):
+    rng = random.Random(3)
+    words = [b"job", b"board", b"python", b"flask", b"resume", b"candidate"]
+    return b" ".join(rng.choice(words) for _ in range(size // 6))
+
+
+def test_parallel_gzip_output_is_standard_gzip(tmp_path):
+    data = _payload()
+    path = tmp_path / "out.gz"
+    compressor = ParallelGzipCompressor(level=6, threads=4, block_size=256 * 1024)
+
+    with compressor.open(path) as out:
+        for offset in range(0, len(data), 100_000):
+            out.write(data[offset:offset + 100_000])
+
+    assert gzip.decompress(path.read_bytes()) == data
+    with open_compressed(path) as f:
+        assert f.read() == data
+
+
+def test_parallel_gzip_is_deterministic_and_close_to_gzip_ratio():
+    data = _payload()
+    first, second = io.BytesIO(), io.BytesIO()
+    for sink in (first, second):
+        writer = ParallelGzipCompressor(level=6, threads=3, block_size=512 * 1024).wrap(sink)
+        writer.write(data)
+        writer.close()
+
+    assert first.getvalue() == second.getvalue()
+    single = measure_compressor(GzipCompressor(level=6), data)
+    assert len(first.getvalue()) < single['output_bytes'] * 1.05
+
+
+def test_parallel_gzip_handles_empty_input(tmp_path):
+    path = tmp_path / "empty.gz"
+    ParallelGzipCompressor(threads=2).open(path).close()
+    assert gzip.decompress(path.read_bytes()) == b""
+
+
+def test_get_compressor_uses_config(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'BACKUP_COMPRESSOR', 'gzip')
+    monkeypatch.setitem(app.config, 'BACKUP_COMPRESSION_LEVEL', '1')
+    compressor = get_compressor()
+    assert compressor.name == 'gzip'
+    assert compressor.level == 1
+
+    assert get_compressor('pgzip', threads=2).threads == 2
+    with pytest.raises(ValueError, match="Unknown backup compressor"):
+        get_compressor('bz9')
+
+
+def test_available_compressors_always_include_gzip():
+    assert {'gzip', 'pgzip'} <= set(available_compressors())
@@ -0,0 +1,166 @@
+import gzip
+import sqlite3
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.backup_compression import GzipCompressor, ParallelGzipCompressor
+from app.services.backup_service import DatabaseBackupService
+
+
+@pytest.fixture
+def sqlite_file_db(app, tmp_path, monkeypatch):
+    """Point the backup service at a throwaway on-disk SQLite database"""
+    db_path = tmp_path / "app.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, payload TEXT)")
+    conn.executemany("INSERT INTO items (payload) VALUES (?)", [("x" * 200,) for _ in range(2000)])
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setitem(app.config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{db_path}")
+    monkeypatch.setitem(app.config, 'BACKUP_PAGES_PER_STEP', 16)
+    monkeypatch.setattr(app, 'instance_path', str(tmp_path))
+    return db_path
+
+
+def _row_count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_create_backup_streams_compressed_snapshot(sqlite_file_db):
+    service = DatabaseBackupService()
+    backup_path = service.create_backup("nightly")
+
+    assert backup_path.endswith("nightly.db.gz")
+    # No uncompressed or partial artifacts are left behind
+    assert sorted(p.name for p in service.backup_dir.iterdir()) == ["nightly.db.gz"]
+
+    stats = service.last_backup_stats
+    assert stats['integrity_check'] == 'ok'
+    assert stats['steps'] > 1  # copied in page batches
+    assert stats['compressed_bytes'] < stats['database_bytes']
+
+    restored = sqlite3.connect(':memory:')
+    with gzip.open(backup_path, 'rb') as f:
+        restored.deserialize(f.read())
+    assert restored.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 2000
+    assert service.verify_backup(backup_path)[0] is True
+
+
+def test_backup_runs_while_writer_is_active(sqlite_file_db):
+    stop = threading.Event()
+
+    def writer():
+        conn = sqlite3.connect(sqlite_file_db, timeout=5)
+        while not stop.is_set():
+            conn.execute("INSERT INTO items (payload) VALUES ('w')")
+            conn.commit()
+        conn.close()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        service = DatabaseBackupService()
+        service.create_backup("concurrent")
+    finally:
+        stop.set()
+        thread.join()
+
+    assert service.last_backup_stats['integrity_check'] == 'ok'
+
+
+def test_restore_backup_round_trip(sqlite_file_db):
+    service = DatabaseBackupService()
+    backup_path = service.create_backup("before_change")
+
+    conn = sqlite3.connect(sqlite_file_db)
+    conn.execute("DELETE FROM items")
+    conn.commit()
+    conn.close()
+    assert _row_count(sqlite_file_db) == 0
+
+    assert service.restore_backup(backup_path) is True
+    assert _row_count(sqlite_file_db) == 2000
+    # The decompressed image and the pre-restore snapshot are not left behind
+    assert not [p.name for p in service.backup_dir.iterdir() if p.name.startswith('.')]
+
+
+def test_backup_rejects_non_sqlite(app, monkeypatch, tmp_path):
+    monkeypatch.setitem(app.config, 'SQLALCHEMY_DATABASE_URI', "mysql://localhost/db")
+    monkeypatch.setattr(app, 'instance_path', str(tmp_path))
+    with pytest.raises(ValueError, match="only supported for SQLite"):
+        DatabaseBackupService().create_backup()
+
+
+def test_list_and_verify_include_postgres_archives(app, monkeypatch, tmp_path):
+    import io
+    import json
+    import tarfile
+
+    monkeypatch.setattr(app, 'instance_path', str(tmp_path))
+    service = DatabaseBackupService()
+    archive = service.backup_dir / "nightly.pgdump.tar"
+    manifest = json.dumps({'format': 'jobboard-pgcopy', 'version': 1, 'tables': []}).encode()
+    with tarfile.open(archive, 'w') as tar:
+        info = tarfile.TarInfo('manifest.json')
+        info.size = len(manifest)
+        tar.addfile(info, io.BytesIO(manifest))
+
+    assert [b['name'] for b in service.list_backups()] == ["nightly"]
+    assert service.verify_backup(archive)[0] is True
+
+
+def test_create_backup_with_explicit_compressor_round_trips(sqlite_file_db):
+    service = DatabaseBackupService()
+    backup_path = service.create_backup("single", compressor=GzipCompressor(level=1))
+    assert service.last_backup_stats['compressor'] == 'gzip'
+    assert service.verify_backup(backup_path)[0] is True
+
+    service.restore_backup(backup_path)
+    assert _row_count(sqlite_file_db) == 2000
+
+
+def test_benchmark_compression_reports_each_compressor(sqlite_file_db):
+    service = DatabaseBackupService()
+    results = service.benchmark_compression(compressors=['gzip', 'pgzip'], levels=[1, 6], threads=2)
+
+    assert {(r['compressor'], r['level']) for r in results} == {
+        ('gzip', 1), ('gzip', 6), ('pgzip', 1), ('pgzip', 6)
+    }
+    assert all(r['ratio'] > 1 for r in results)
+    # Benchmarks never write archives
+    assert list(service.backup_dir.iterdir()) == []
+
+
+def test_benchmark_sample_stops_at_sample_bytes(sqlite_file_db):
+    service = DatabaseBackupService()
+    sample = service._sample_database(4096)
+
+    assert len(sample) == 4096
+    assert sample.startswith(b'SQLite format 3')
+
+
+def test_postgres_dump_splits_compression_threads_between_workers(app, monkeypatch, tmp_path):
+    monkeypatch.setattr(app, 'instance_path', str(tmp_path))
+    monkeypatch.setitem(app.config, 'BACKUP_PARALLEL_WORKERS', 4)
+    engine = DatabaseBackupService()._postgres_engine(ParallelGzipCompressor(threads=8))
+    engine.engine = MagicMock()
+    engine.engine.raw_connection.return_value.cursor.return_value.fetchone.return_value = ['00000003-1']
+    monkeypatch.setattr(engine, '_existing_tables', lambda: ['a', 'b', 'c', 'd', 'e'])
+    threads = []
+
+    def dump_table(table, snapshot_id, staging_dir, compressor):
+        threads.append(compressor.threads)
+
+    monkeypatch.setattr(engine, '_dump_table', dump_table)
+
+    engine.dump_parts(tmp_path)
+
+    assert threads == [2] * 5
+    assert engine.compressor.threads == 8
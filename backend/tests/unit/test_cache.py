@@ -0,0 +1,178 @@
+import fnmatch
+import socketserver
+import threading
+import time
+
+import pytest
+
+from app.common.cache import Cache, MemoryBackend, RedisBackend, SQLiteBackend
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    """Just enough of the Redis protocol for RedisBackend"""
+
+    def _reply(self, value):
+        if value is None:
+            self.wfile.write(b"$-1\r\n")
+        elif isinstance(value, int):
+            self.wfile.write(b":%d\r\n" % value)
+        elif isinstance(value, list):
+            self.wfile.write(b"*%d\r\n" % len(value))
+            for item in value:
+                self._reply(item)
+        else:
+            self.wfile.write(b"$%d\r\n%s\r\n" % (len(value), value))
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            header = self.rfile.readline()
+            if not header:
+                return
+            args = []
+            for _ in range(int(header[1:])):
+                length = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(length + 2)[:-2])
+            command = args[0].upper()
+            with self.server.lock:
+                now = time.monotonic()
+                for key in [k for k, (_, expires) in store.items() if expires and expires <= now]:
+                    del store[key]
+                if command == b"GET":
+                    entry = store.get(args[1])
+                    self._reply(entry[0] if entry else None)
+                elif command == b"SET":
+                    options = [a.upper() for a in args[3:]]
+                    expires = now + int(args[4 + options.index(b"PX")]) / 1000 if b"PX" in options else None
+                    if b"NX" in options and args[1] in store:
+                        self._reply(None)
+                    else:
+                        store[args[1]] = (args[2], expires)
+                        self.wfile.write(b"+OK\r\n")
+                elif command == b"MGET":
+                    self._reply([store[key][0] if key in store else None for key in args[1:]])
+                elif command == b"INCR":
+                    value, expires = store.get(args[1], (b"0", None))
+                    store[args[1]] = (str(int(value) + 1).encode(), expires)
+                    self._reply(int(value) + 1)
+                elif command == b"DEL":
+                    self._reply(sum(store.pop(key, None) is not None for key in args[1:]))
+                elif command == b"SCAN":
+                    pattern = args[3].decode().replace("\\", "")
+                    self._reply([b"0", [k for k in store if fnmatch.fnmatchcase(k.decode(), pattern)]])
+                else:
+                    self.wfile.write(b"-ERR unknown command\r\n")
+
+
+@pytest.fixture
+def resp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _RespHandler)
+    server.daemon_threads = True
+    server.store, server.lock = {}, threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"redis://127.0.0.1:{server.server_address[1]}/0"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend()
+    if request.param == "sqlite":
+        return SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+    return RedisBackend(request.getfixturevalue("resp_server"))
+
+
+def test_backend_contract(backend):
+    assert backend.get("a:1") is None
+    backend.set("a:1", b"one")
+    backend.set("a:2", b"two", ttl=0.05)
+    backend.set("b:1", b"other")
+    assert backend.get("a:1") == b"one"
+    assert backend.get("a:2") == b"two"
+
+    assert backend.add("a:1", b"again") is False
+    assert backend.add("a:3", b"three", ttl=10) is True
+    time.sleep(0.1)
+    assert backend.get("a:2") is None
+    # An expired key counts as absent
+    assert backend.add("a:2", b"fresh") is True
+
+    assert backend.delete_prefix("a:") == 3
+    assert backend.get("a:1") is None
+    assert backend.get("b:1") == b"other"
+    backend.delete("b:1")
+    assert backend.get("b:1") is None
+
+    assert backend.incr("n") == 1
+    assert backend.incr("n") == 2
+    backend.set("c:1", b"x")
+    assert backend.get_many(["c:1", "c:2", "n"]) == [b"x", None, b"2"]
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_entries=2)
+    backend.set("a", b"1")
+    backend.set("b", b"2")
+    backend.get("a")
+    backend.set("c", b"3")
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1"
+
+
+def test_get_or_set_recomputes_once_under_concurrency():
+    cache = Cache(MemoryBackend(), prefix="t:")
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"rows": [1, 2]}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_set("jobs:x", compute)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"rows": [1, 2]}] * 8
+    stats = cache.stats()["jobs"]
+    assert stats["misses"] == 1
+    assert stats["hits"] + stats["waits"] == 7
+    assert stats["hit_ratio"] == 0.875
+
+
+def test_get_or_set_waits_for_another_process(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    # Two workers opening the same file
+    holder, waiter = Cache(SQLiteBackend(path)), Cache(SQLiteBackend(path))
+    assert holder.backend.add("jobs:x:lock", b"1", 5)
+
+    result = []
+    thread = threading.Thread(target=lambda: result.append(waiter.get_or_set("jobs:x", lambda: "recomputed")))
+    thread.start()
+    time.sleep(0.1)
+    holder.set("jobs:x", "from holder")
+    thread.join()
+
+    assert result == ["from holder"]
+    assert waiter.stats()["jobs"]["waits"] == 1
+
+
+def test_get_or_set_rejects_stale_values():
+    cache = Cache(MemoryBackend())
+    cache.set("jobs:detail:1", {"version": 1})
+    value = cache.get_or_set("jobs:detail:1", lambda: {"version": 2}, accept=lambda v: v["version"] == 2)
+    assert value == {"version": 2}
+    assert cache.get("jobs:detail:1") == {"version": 2}
+
+
+def test_unreachable_backend_falls_back_to_compute():
+    # Nothing listens on port 1
+    cache = Cache(RedisBackend("redis://127.0.0.1:1/0", timeout=0.2), lock_timeout=0)
+    assert cache.get_or_set("admin:metrics", lambda: {"total": 3}) == {"total": 3}
+    assert cache.stats()["admin"]["errors"] >= 1
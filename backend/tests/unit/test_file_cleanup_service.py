@@ -1,9 +1,13 @@
+import os
+import time
+
 import pytest
 import tempfile
 import shutil
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 from app.services.file_cleanup_service import FileCleanupService
+from app.services.storage_ledger_service import StorageLedger
 from app.models.application import Application
 from app.models.job import Job
 from app.models.saved_job import SavedJob
@@ -11,7 +15,7 @@ from app.models.user import User
 
 
 class TestFileCleanupService:
-    """Test the FileCleanupService for job and user file cleanup"""
+    """Test the FileCleanupService document removal and orphan sweep"""
 
     @pytest.fixture
     def temp_static_folder(self):
@@ -46,107 +50,24 @@ class TestFileCleanupService:
             service.static_folder = temp_static_folder
             return service
 
-    def test_cleanup_job_files_no_applications(self, mock_app_context, temp_static_folder):
-        """Test cleanup when job has no applications"""
-        service = FileCleanupService()
-        
-        # Mock database query to return no applications
-        with patch('app.services.file_cleanup_service.db.session.execute') as mock_execute:
-            mock_scalars = MagicMock()
-            mock_scalars.all.return_value = []
-            mock_execute.return_value.scalars.return_value = mock_scalars
-            
-            result = service.cleanup_job_files(1)
-            
-            assert result['files_deleted'] == 0
-            assert result['folders_deleted'] == 0
-            assert result['errors'] == []
-
-    def test_cleanup_job_files_with_applications(self, service_with_mocked_static, temp_static_folder):
-        """Test cleanup when job has applications with files"""
-        service = service_with_mocked_static
-        
-        # Create test files
-        user_folder = temp_static_folder / 'applications' / '1'
-        user_folder.mkdir(parents=True)
-        
-        resume_file = user_folder / 'resume_1.pdf'
-        cover_letter_file = user_folder / 'cover_letter_1.pdf'
-        
-        resume_file.write_text('fake resume content')
-        cover_letter_file.write_text('fake cover letter content')
-        
-        # Mock application with file paths
-        mock_application = MagicMock()
-        mock_application.user_id = 1
-        mock_application.resume_path = 'applications/1/resume_1.pdf'
-        mock_application.cover_letter_path = 'applications/1/cover_letter_1.pdf'
-        
-        # Mock database query
-        with patch('app.services.file_cleanup_service.db.session.execute') as mock_execute:
-            mock_scalars = MagicMock()
-            mock_scalars.all.return_value = [mock_application]
-            mock_execute.return_value.scalars.return_value = mock_scalars
-            
-            result = service.cleanup_job_files(1)
-            
-            assert result['files_deleted'] == 2
-            assert result['folders_deleted'] == 1  # User folder should be deleted
-            assert result['errors'] == []
-            assert str(resume_file) in result['deleted_paths']
-            assert str(cover_letter_file) in result['deleted_paths']
-            
-            # Verify files are actually deleted
-            assert not resume_file.exists()
-            assert not cover_letter_file.exists()
-            assert not user_folder.exists()
+    def _add_application(self, db, make_user, make_job, resume_path, cover_letter_path=None):
+        owner = make_user()
+        candidate = make_user()
+        job = make_job(owner.id)
+        application = Application(
+            user_id=candidate.id,
+            job_id=job.id,
+            first_name="Ada",
+            last_name="Lovelace",
+            email="ada@test.com",
+            resume_path=resume_path,
+            cover_letter_path=cover_letter_path,
+        )
+        db.session.add(application)
+        db.session.commit()
+        return application
 
-    def test_cleanup_user_files(self, service_with_mocked_static, temp_static_folder):
-        """Test cleanup of all files for a user"""
-        service = service_with_mocked_static
-        
-        # Create test files
-        user_folder = temp_static_folder / 'applications' / '1'
-        user_folder.mkdir(parents=True)
-        
-        resume_file = user_folder / 'resume_1.pdf'
-        cover_letter_file = user_folder / 'cover_letter_1.pdf'
-        
-        resume_file.write_text('fake resume content')
-        cover_letter_file.write_text('fake cover letter content')
-        
-        # Mock applications
-        mock_app1 = MagicMock()
-        mock_app1.resume_path = 'applications/1/resume_1.pdf'
-        mock_app1.cover_letter_path = 'applications/1/cover_letter_1.pdf'
-        
-        mock_app2 = MagicMock()
-        mock_app2.resume_path = 'applications/1/resume_2.pdf'
-        mock_app2.cover_letter_path = None
-        
-        # Create second resume file
-        resume_file2 = user_folder / 'resume_2.pdf'
-        resume_file2.write_text('fake resume content 2')
-        
-        # Mock database query
-        with patch('app.services.file_cleanup_service.db.session.execute') as mock_execute:
-            mock_scalars = MagicMock()
-            mock_scalars.all.return_value = [mock_app1, mock_app2]
-            mock_execute.return_value.scalars.return_value = mock_scalars
-            
-            result = service.cleanup_user_files(1)
-            
-            assert result['files_deleted'] == 3  # 2 resumes + 1 cover letter
-            assert result['folders_deleted'] == 1  # User folder
-            assert result['errors'] == []
-            
-            # Verify files are deleted
-            assert not resume_file.exists()
-            assert not resume_file2.exists()
-            assert not cover_letter_file.exists()
-            assert not user_folder.exists()
-
-    def test_cleanup_orphaned_files(self, service_with_mocked_static, temp_static_folder):
+    def test_cleanup_orphaned_files(self, service_with_mocked_static, temp_static_folder, db, make_user, make_job):
         """Test cleanup of orphaned files"""
         service = service_with_mocked_static
         
@@ -157,10 +78,9 @@ class TestFileCleanupService:
         orphaned_file = user_folder / 'orphaned.pdf'
         orphaned_file.write_text('orphaned content')
         
-        # Mock applications with different file paths
-        mock_application = MagicMock()
-        mock_application.resume_path = 'applications/1/valid_resume.pdf'
-        mock_application.cover_letter_path = 'applications/1/valid_cover.pdf'
+        # Application referencing the valid files
+        self._add_application(db, make_user, make_job,
+                              'applications/1/valid_resume.pdf', 'applications/1/valid_cover.pdf')
         
         # Create valid files
         valid_resume = user_folder / 'valid_resume.pdf'
@@ -168,49 +88,113 @@ class TestFileCleanupService:
         valid_resume.write_text('valid resume')
         valid_cover.write_text('valid cover')
         
-        # Mock database query
-        with patch('app.services.file_cleanup_service.db.session.execute') as mock_execute:
-            mock_scalars = MagicMock()
-            mock_scalars.all.return_value = [mock_application]
-            mock_execute.return_value.scalars.return_value = mock_scalars
-            
-            result = service.cleanup_orphaned_files()
-            
-            assert result['files_deleted'] == 1  # Only orphaned file
-            assert result['folders_deleted'] == 0  # Folder not empty yet
-            assert result['errors'] == []
-            
-            # Verify orphaned file is deleted but valid files remain
-            assert not orphaned_file.exists()
-            assert valid_resume.exists()
-            assert valid_cover.exists()
+        result = service.cleanup_orphaned_files(min_age_seconds=0)
+        
+        assert result['files_deleted'] == 1  # Only orphaned file
+        assert result['folders_deleted'] == 0  # Folder not empty yet
+        assert result['errors'] == []
+        
+        # Verify orphaned file is deleted but valid files remain
+        assert not orphaned_file.exists()
+        assert valid_resume.exists()
+        assert valid_cover.exists()
+
+    def test_cleanup_orphaned_files_walks_users_layout(self, service_with_mocked_static, temp_static_folder,
+                                                       db, make_user, make_job):
+        """Orphans under static/users/... are found and emptied folders pruned"""
+        service = service_with_mocked_static
+        doc_dir = temp_static_folder / 'users' / '7' / 'applications' / '3' / 'resume' / '2026' / '01' / '02'
+        doc_dir.mkdir(parents=True)
+        kept = doc_dir / 'kept.pdf'
+        kept.write_text('kept')
+        self._add_application(db, make_user, make_job, str(kept.relative_to(temp_static_folder)))
+
+        orphan_dir = temp_static_folder / 'users' / '8' / 'applications' / '4' / 'cover_letter' / '2026' / '01' / '02'
+        orphan_dir.mkdir(parents=True)
+        orphans = [orphan_dir / f'orphan_{i}.pdf' for i in range(5)]
+        for orphan in orphans:
+            orphan.write_text('x' * 10)
+
+        result = service.cleanup_orphaned_files(batch_size=2, min_age_seconds=0)
+
+        assert result['files_scanned'] == 6
+        assert result['files_deleted'] == 5
+        assert result['bytes_reclaimed'] == 50
+        assert kept.exists()
+        # users/8/... is removed up to, but not including, static/users
+        assert not (temp_static_folder / 'users' / '8').exists()
+        assert (temp_static_folder / 'users').exists()
+
+    def test_cleanup_orphaned_files_dry_run_and_min_age(self, service_with_mocked_static, temp_static_folder):
+        """Dry runs delete nothing and recent uploads are never candidates"""
+        service = service_with_mocked_static
+        doc_dir = temp_static_folder / 'users' / '9' / 'applications' / '5' / 'resume'
+        doc_dir.mkdir(parents=True)
+        old = doc_dir / 'old.pdf'
+        fresh = doc_dir / 'fresh.pdf'
+        old.write_text('old')
+        fresh.write_text('fresh')
+        two_hours_ago = time.time() - 7200
+        os.utime(old, (two_hours_ago, two_hours_ago))
+
+        result = service.cleanup_orphaned_files(dry_run=True, min_age_seconds=3600)
+
+        assert result['dry_run'] is True
+        assert result['files_scanned'] == 2
+        assert result['files_deleted'] == 1
+        assert result['deleted_paths'] == [str(old)]
+        assert old.exists() and fresh.exists()
 
-    def test_get_storage_stats(self, service_with_mocked_static, temp_static_folder):
+    def test_remove_documents_in_batches(self, service_with_mocked_static, temp_static_folder, db):
+        """Documents are deleted in batches, uncounted from the ledger and their folders pruned"""
+        service = service_with_mocked_static
+        ledger = StorageLedger()
+        documents = []
+        for i in range(5):
+            path = temp_static_folder / 'users' / '4' / 'applications' / str(i) / 'resume' / 'r.pdf'
+            path.parent.mkdir(parents=True)
+            path.write_text('x' * 10)
+            ledger.record_upload(4, 2, 'resume', 10)
+            documents.append((4, 2, 'resume', str(path.relative_to(temp_static_folder))))
+        db.session.commit()
+        # Already gone: skipped without touching the counters
+        documents.append((4, 2, 'cover_letter', 'users/4/applications/9/cover_letter/missing.pdf'))
+
+        result = service.remove_documents(documents, batch_size=2)
+
+        assert result['files_deleted'] == 5
+        assert result['errors'] == []
+        assert ledger.usage('user', 4) == {'bytes': 0, 'files': 0}
+        assert ledger.usage('job', 2) == {'bytes': 0, 'files': 0}
+        assert not (temp_static_folder / 'users' / '4').exists()
+        assert (temp_static_folder / 'users').exists()
+
+    def test_get_storage_stats(self, service_with_mocked_static, temp_static_folder, db, make_user, make_job):
         """Test storage statistics calculation"""
         service = service_with_mocked_static
         
         # Create test files
-        applications_folder = temp_static_folder / 'applications'
-        jobs_folder = temp_static_folder / 'jobs'
-        
-        app_file = applications_folder / '1' / 'resume.pdf'
+        app_file = temp_static_folder / 'users' / '1' / 'applications' / '1' / 'resume' / 'resume.pdf'
         app_file.parent.mkdir(parents=True)
         app_file.write_text('resume content')
+        self._add_application(db, make_user, make_job, str(app_file.relative_to(temp_static_folder)))
         
-        job_file = jobs_folder / '1' / 'job.pdf'
-        job_file.parent.mkdir(parents=True)
-        job_file.write_text('job content')
-        
-        other_file = temp_static_folder / 'other.pdf'
+        other_file = temp_static_folder / 'applications' / 'stray.pdf'
         other_file.write_text('other content')
         
+        # Stats come from the ledger, which is rebuilt by reconciliation
+        assert service.get_storage_stats()['total_files'] == 0
+        with patch.object(FileCleanupService, '__init__', lambda s: setattr(s, 'static_folder', temp_static_folder)):
+            StorageLedger().reconcile()
         result = service.get_storage_stats()
         
-        assert result['total_files'] == 3
-        assert result['total_size_bytes'] > 0
-        assert result['applications_folder_size'] > 0
-        assert result['jobs_folder_size'] > 0
-        assert result['other_files_size'] > 0
+        assert result['total_files'] == 1
+        assert result['total_size_bytes'] == len('resume content')
+        assert result['applications_folder_size'] == len('resume content')
+        assert result['by_document_type'] == {'resume': {'bytes': len('resume content'), 'files': 1}}
+        assert result['unreferenced_files'] == 1
+        assert result['other_files_size'] == len('other content')
+        assert result['reconciled_at'] is not None
 
     def test_delete_file_nonexistent(self, mock_app_context, temp_static_folder):
         """Test deleting a file that doesn't exist"""
@@ -244,17 +228,19 @@ class TestFileCleanupService:
         assert result is False
         assert folder.exists()  # Folder should still exist
 
-    def test_error_handling_during_cleanup(self, mock_app_context, temp_static_folder):
-        """Test error handling during cleanup"""
-        service = FileCleanupService()
-        
-        # Mock database query to raise an exception
-        with patch('app.services.file_cleanup_service.db.session.execute') as mock_execute:
-            mock_execute.side_effect = Exception("Database error")
-            
-            result = service.cleanup_job_files(1)
-            
-            assert result['files_deleted'] == 0
-            assert result['folders_deleted'] == 0
-            assert len(result['errors']) == 1
-            assert "Database error" in result['errors'][0]
+    def test_error_handling_during_cleanup(self, service_with_mocked_static, temp_static_folder, db):
+        """A failing batch is rolled back and reported; later batches still run"""
+        service = service_with_mocked_static
+        documents = []
+        for i in range(2):
+            path = temp_static_folder / 'users' / '5' / 'applications' / str(i) / 'resume' / 'r.pdf'
+            path.parent.mkdir(parents=True)
+            path.write_text('x')
+            documents.append((5, 3, 'resume', str(path.relative_to(temp_static_folder))))
+
+        with patch.object(StorageLedger, 'record_delete', side_effect=[Exception("Database error"), None]):
+            result = service.remove_documents(documents, batch_size=1)
+
+        assert result['files_deleted'] == 2
+        assert len(result['errors']) == 1
+        assert "Database error" in result['errors'][0]
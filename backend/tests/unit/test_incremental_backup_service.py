@@ -0,0 +1,170 @@
+import io
+import os
+import random
+import sqlite3
+import threading
+
+import pytest
+
+from app.services.incremental_backup_service import (
+    _GEAR,
+    _gear_hashes,
+    ContentDefinedChunker,
+    IncrementalBackupService,
+)
+
+
+@pytest.fixture
+def backup_env(app, tmp_path, monkeypatch):
+    """On-disk SQLite database plus a static/ document tree in a temp dir"""
+    instance = tmp_path / "instance"
+    instance.mkdir()
+    db_path = tmp_path / "app.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, payload TEXT)")
+    conn.executemany("INSERT INTO items (payload) VALUES (?)", [(f"row-{i}" * 20,) for i in range(2000)])
+    conn.commit()
+    conn.close()
+
+    docs = tmp_path / "static" / "users" / "1" / "applications" / "1" / "resume"
+    docs.mkdir(parents=True)
+    rng = random.Random(1)
+    (docs / "resume.pdf").write_bytes(rng.randbytes(200_000))
+    (docs / "cover.pdf").write_bytes(rng.randbytes(50_000))
+
+    monkeypatch.setitem(app.config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{db_path}")
+    monkeypatch.setattr(app, 'instance_path', str(instance))
+    return {'db_path': db_path, 'docs': docs}
+
+
+def _row_count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_chunk_boundaries_resynchronise_after_insert():
+    chunker = ContentDefinedChunker(min_size=512, avg_size=2048, max_size=8192)
+    data = random.Random(7).randbytes(300_000)
+    edited = data[:1000] + b"inserted bytes" + data[1000:]
+
+    original = list(chunker.chunks(io.BytesIO(data)))
+    changed = list(chunker.chunks(io.BytesIO(edited)))
+
+    assert b"".join(original) == data
+    assert all(len(c) <= 8192 for c in original)
+    shared = set(original) & set(changed)
+    # Only the chunk(s) around the edit differ
+    assert len(shared) >= len(original) - 2
+
+
+def test_gear_hashes_match_the_rolling_hash():
+    data = random.Random(3).randbytes(1000)
+    h = 0
+    expected = []
+    for byte in data:
+        h = ((h << 1) + int(_GEAR[byte])) & ((1 << 64) - 1)
+        expected.append(h)
+
+    assert _gear_hashes(data).tolist() == expected
+
+
+def test_second_snapshot_only_stores_changed_chunks(backup_env):
+    service = IncrementalBackupService()
+    service.create_snapshot("first")
+    first = service.last_snapshot_stats
+    assert first['new_chunks'] > 0
+    assert first['files_changed'] == 2
+
+    with open(backup_env['docs'] / "cover.pdf", "ab") as f:
+        f.write(b"appendix")
+    service.create_snapshot("second")
+    second = service.last_snapshot_stats
+
+    assert second['files_reused'] == 1
+    assert second['files_changed'] == 1
+    assert second['new_chunks'] <= 3
+    assert second['new_bytes'] < first['new_bytes'] / 10
+    assert service.load_manifest("second")['parent'] == "first"
+    assert [s['name'] for s in service.list_snapshots()] == ["second", "first"]
+
+
+def test_restore_snapshot_to_point_in_time(backup_env):
+    service = IncrementalBackupService()
+    resume = backup_env['docs'] / "resume.pdf"
+    original_resume = resume.read_bytes()
+    service.create_snapshot("before")
+
+    conn = sqlite3.connect(backup_env['db_path'])
+    conn.execute("DELETE FROM items WHERE id > 100")
+    conn.commit()
+    conn.close()
+    resume.write_bytes(b"overwritten")
+    (backup_env['docs'] / "new.pdf").write_bytes(b"uploaded later")
+    service.create_snapshot("after")
+
+    summary = service.restore_snapshot("before", prune_files=True)
+
+    assert _row_count(backup_env['db_path']) == 2000
+    assert resume.read_bytes() == original_resume
+    assert not (backup_env['docs'] / "new.pdf").exists()
+    assert summary['files_written'] == 1
+    assert summary['files_unchanged'] == 1
+    assert summary['files_removed'] == 1
+    assert summary['pre_restore_snapshot'].startswith("pre_restore_")
+
+    # The later state is still recoverable
+    service.restore_snapshot("after", restore_database=False)
+    assert resume.read_bytes() == b"overwritten"
+
+
+def test_collect_garbage_keeps_chunks_of_remaining_snapshots(backup_env):
+    service = IncrementalBackupService()
+    service.create_snapshot("first")
+    (backup_env['docs'] / "resume.pdf").write_bytes(os.urandom(100_000))
+    service.create_snapshot("second")
+
+    service.delete_snapshot("first")
+    result = service.collect_garbage()
+
+    assert result['chunks_removed'] > 0
+    assert service.verify_snapshot("second")[0] is True
+    assert service.verify_snapshot("first")[0] is False
+
+
+def test_collect_garbage_waits_for_running_snapshot(backup_env, monkeypatch):
+    service = IncrementalBackupService()
+    service.create_snapshot("first")
+    service.delete_snapshot("first")
+    # Every chunk is now unreferenced, and the next snapshot reuses them all
+
+    collector = IncrementalBackupService()
+    threads = []
+    put = service.store.put
+
+    def put_and_collect(data):
+        if not threads:
+            threads.append(threading.Thread(target=collector.collect_garbage))
+            threads[0].start()
+            threads[0].join(timeout=0.2)
+            assert threads[0].is_alive()  # blocked on the repository lock
+        return put(data)
+
+    monkeypatch.setattr(service.store, 'put', put_and_collect)
+    service.create_snapshot("second")
+    threads[0].join()
+
+    assert service.verify_snapshot("second")[0] is True
+
+
+def test_restore_refuses_incomplete_snapshot(backup_env):
+    service = IncrementalBackupService()
+    service.create_snapshot("first")
+    digest = service.load_manifest("first")['files'][0]['chunks'][0]
+    service.store.path_for(digest).unlink()
+
+    with pytest.raises(RuntimeError, match="missing"):
+        service.restore_snapshot("first")
+    assert _row_count(backup_env['db_path']) == 2000
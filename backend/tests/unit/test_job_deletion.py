@@ -10,16 +10,8 @@ from app.models.user import User
 class TestJobDeletion:
     """Test job deletion functionality"""
 
-    def test_delete_job_success(self, app, db, make_user):
-        """Test successful job deletion with cleanup"""
-        service = JobService()
-        
-        # Create a user
-        user = make_user()
-        user_id = user.id
-        
-        # Create a job
-        job_data = {
+    def _job_data(self):
+        return {
             "title": "Test Job",
             "description": "Test description",
             "salary_min": 50000,
@@ -28,22 +20,25 @@ class TestJobDeletion:
             "requirements": ["Python", "Flask"],
             "responsibilities": "Build APIs",
             "skills": ["Python", "Flask"],
-            "application_deadline": "2025-12-31",
+            "application_deadline": "2099-12-31",
         }
+
+    def test_delete_job_success(self, app, db, make_user):
+        """Deleting hides the job at once and hands the purge to the background"""
+        service = JobService()
+        
+        # Create a user
+        user = make_user()
+        user_id = user.id
         
-        job_result = service.create_job(user_id, job_data)
+        job_result = service.create_job(user_id, self._job_data())
         job_id = job_result["job"]["id"]
         
-        # Mock file cleanup service
-        with patch('app.services.job_service.FileCleanupService') as mock_cleanup_class:
-            mock_cleanup_service = MagicMock()
-            mock_cleanup_class.return_value = mock_cleanup_service
-            mock_cleanup_service.cleanup_job_files.return_value = {
-                'files_deleted': 2,
-                'folders_deleted': 1,
-                'errors': [],
-                'deleted_paths': ['/path/to/file1.pdf', '/path/to/file2.pdf']
-            }
+        # Mock the purge so the soft-deleted row can be inspected
+        with patch('app.services.job_service.JobPurgeService') as mock_purge_class:
+            mock_purge_service = MagicMock()
+            mock_purge_class.return_value = mock_purge_service
+            mock_purge_service.purge_job.__name__ = 'purge_job'
             
             # Delete the job
             deletion_summary = service.delete_job(user_id, job_id)
@@ -51,18 +46,28 @@ class TestJobDeletion:
             # Verify deletion summary
             assert deletion_summary['job_id'] == job_id
             assert deletion_summary['job_title'] == "Test Job"
-            assert deletion_summary['applications_deleted'] == 0  # No applications
-            assert deletion_summary['saved_jobs_deleted'] == 0  # No saved jobs
-            assert deletion_summary['file_cleanup']['files_deleted'] == 2
-            assert deletion_summary['file_cleanup']['folders_deleted'] == 1
+            assert deletion_summary['purge'] == 'scheduled'
+            assert deletion_summary['deleted_at'] is not None
             assert deletion_summary['errors'] == []
             
-            # Verify file cleanup was called
-            mock_cleanup_service.cleanup_job_files.assert_called_once_with(job_id)
+            # Verify the purge was started for this job
+            mock_purge_service.purge_job.assert_called_once_with(job_id)
             
-            # Verify job is deleted from database
+            # The row is kept until purged but hidden everywhere
             job = db.session.get(Job, job_id)
-            assert job is None
+            assert job is not None and job.deleted_at is not None
+            assert service.get_job(user_id, job_id) is None
+            assert service.get_public_job(job_id) is None
+            assert service.list_jobs(user_id)['total'] == 0
+            assert service.search_public_jobs("Test")['jobs'] == []
+            assert service.archive_job(user_id, job_id) is False
+            
+            # Deleting again is a not-found
+            with pytest.raises(ValueError, match="Job not found or access denied"):
+                service.delete_job(user_id, job_id)
+            
+            # The title is free again for a new posting
+            assert service.create_job(user_id, self._job_data())["status"] == "created"
 
     def test_delete_job_with_applications(self, app, db, make_user):
         """Test job deletion with applications"""
@@ -72,20 +77,7 @@ class TestJobDeletion:
         user = make_user()
         user_id = user.id
         
-        # Create a job
-        job_data = {
-            "title": "Test Job",
-            "description": "Test description",
-            "salary_min": 50000,
-            "salary_max": 70000,
-            "location": "Remote",
-            "requirements": ["Python"],
-            "responsibilities": "Build APIs",
-            "skills": ["Python"],
-            "application_deadline": "2025-12-31",
-        }
-        
-        job_result = service.create_job(user_id, job_data)
+        job_result = service.create_job(user_id, self._job_data())
         job_id = job_result["job"]["id"]
         
         # Create a candidate user
@@ -122,36 +114,25 @@ class TestJobDeletion:
         db.session.add(saved_job)
         db.session.commit()
         
-        # Mock file cleanup service
-        with patch('app.services.job_service.FileCleanupService') as mock_cleanup_class:
-            mock_cleanup_service = MagicMock()
-            mock_cleanup_class.return_value = mock_cleanup_service
-            mock_cleanup_service.cleanup_job_files.return_value = {
-                'files_deleted': 4,  # 2 resumes + 2 cover letters
-                'folders_deleted': 1,
-                'errors': [],
-                'deleted_paths': ['/path/to/file1.pdf', '/path/to/file2.pdf', '/path/to/file3.pdf', '/path/to/file4.pdf']
-            }
-            
-            # Delete the job
-            deletion_summary = service.delete_job(user_id, job_id)
-            
-            # Verify deletion summary
-            assert deletion_summary['applications_deleted'] == 2
-            assert deletion_summary['saved_jobs_deleted'] == 1
-            assert deletion_summary['file_cleanup']['files_deleted'] == 4
-            
-            # Verify applications are deleted (CASCADE)
-            applications = db.session.execute(
-                db.select(Application).where(Application.job_id == job_id)
-            ).scalars().all()
-            assert len(applications) == 0
-            
-            # Verify saved jobs are deleted (CASCADE)
-            saved_jobs = db.session.execute(
-                db.select(SavedJob).where(SavedJob.job_id == job_id)
-            ).scalars().all()
-            assert len(saved_jobs) == 0
+        # Background tasks run inline under TESTING, so the purge completes here
+        deletion_summary = service.delete_job(user_id, job_id)
+        assert deletion_summary['purge'] == 'scheduled'
+        
+        # Verify applications are deleted
+        applications = db.session.execute(
+            db.select(Application).where(Application.job_id == job_id)
+        ).scalars().all()
+        assert len(applications) == 0
+        
+        # Verify saved jobs are deleted
+        saved_jobs = db.session.execute(
+            db.select(SavedJob).where(SavedJob.job_id == job_id)
+        ).scalars().all()
+        assert len(saved_jobs) == 0
+        
+        # And finally the job row itself
+        db.session.expire_all()
+        assert db.session.get(Job, job_id) is None
 
     def test_delete_job_not_found(self, app, db, make_user):
         """Test deleting a job that doesn't exist"""
@@ -182,7 +163,7 @@ class TestJobDeletion:
             "requirements": ["Python"],
             "responsibilities": "Build APIs",
             "skills": ["Python"],
-            "application_deadline": "2025-12-31",
+            "application_deadline": "2099-12-31",
         }
         
         job_result = service.create_job(user1_id, job_data)
@@ -204,32 +185,12 @@ class TestJobDeletion:
         user = make_user()
         user_id = user.id
         
-        # Create a job
-        job_data = {
-            "title": "Test Job",
-            "description": "Test description",
-            "salary_min": 50000,
-            "salary_max": 70000,
-            "location": "Remote",
-            "requirements": ["Python"],
-            "responsibilities": "Build APIs",
-            "skills": ["Python"],
-            "application_deadline": "2025-12-31",
-        }
-        
-        job_result = service.create_job(user_id, job_data)
+        job_result = service.create_job(user_id, self._job_data())
         job_id = job_result["job"]["id"]
         
-        # Mock file cleanup service to succeed
-        with patch('app.services.job_service.FileCleanupService') as mock_cleanup_class:
-            mock_cleanup_service = MagicMock()
-            mock_cleanup_class.return_value = mock_cleanup_service
-            mock_cleanup_service.cleanup_job_files.return_value = {
-                'files_deleted': 0,
-                'folders_deleted': 0,
-                'errors': [],
-                'deleted_paths': []
-            }
+        with patch('app.services.job_service.JobPurgeService') as mock_purge_class:
+            mock_purge_service = MagicMock()
+            mock_purge_class.return_value = mock_purge_service
             
             # Mock database commit to raise an error
             with patch('app.services.job_service.db.session.commit') as mock_commit:
@@ -241,51 +202,36 @@ class TestJobDeletion:
                     
                     # Verify rollback was called
                     mock_rollback.assert_called()
+            
+            # Nothing is purged unless the soft delete committed
+            mock_purge_service.purge_job.assert_not_called()
 
-    def test_delete_job_file_cleanup_error(self, app, db, make_user):
-        """Test job deletion when file cleanup fails but job deletion succeeds"""
+    def test_delete_job_purge_error(self, app, db, make_user):
+        """A failing purge doesn't fail the deletion; the job stays hidden for a later retry"""
         service = JobService()
         
         # Create a user
         user = make_user()
         user_id = user.id
         
-        # Create a job
-        job_data = {
-            "title": "Test Job",
-            "description": "Test description",
-            "salary_min": 50000,
-            "salary_max": 70000,
-            "location": "Remote",
-            "requirements": ["Python"],
-            "responsibilities": "Build APIs",
-            "skills": ["Python"],
-            "application_deadline": "2025-12-31",
-        }
-        
-        job_result = service.create_job(user_id, job_data)
+        job_result = service.create_job(user_id, self._job_data())
         job_id = job_result["job"]["id"]
         
-        # Mock file cleanup service to return errors
-        with patch('app.services.job_service.FileCleanupService') as mock_cleanup_class:
-            mock_cleanup_service = MagicMock()
-            mock_cleanup_class.return_value = mock_cleanup_service
-            mock_cleanup_service.cleanup_job_files.return_value = {
-                'files_deleted': 0,
-                'folders_deleted': 0,
-                'errors': ['File not found', 'Permission denied'],
-                'deleted_paths': []
-            }
+        # Mock the purge to fail
+        with patch('app.services.job_service.JobPurgeService') as mock_purge_class:
+            mock_purge_service = MagicMock()
+            mock_purge_class.return_value = mock_purge_service
+            mock_purge_service.purge_job.side_effect = OSError("Permission denied")
+            mock_purge_service.purge_job.__name__ = 'purge_job'
             
             # Delete the job
             deletion_summary = service.delete_job(user_id, job_id)
             
-            # Verify deletion succeeded despite file cleanup errors
+            # Verify deletion succeeded despite the purge error
             assert deletion_summary['job_id'] == job_id
-            assert len(deletion_summary['file_cleanup']['errors']) == 2
-            assert 'File not found' in deletion_summary['file_cleanup']['errors']
-            assert 'Permission denied' in deletion_summary['file_cleanup']['errors']
+            assert deletion_summary['errors'] == []
+            mock_purge_service.purge_job.assert_called_once_with(job_id)
             
-            # Verify job is still deleted from database
-            job = db.session.get(Job, job_id)
-            assert job is None
+            # Verify job is hidden, awaiting `flask jobs purge-deleted`
+            assert service.get_job(user_id, job_id) is None
+            assert db.session.get(Job, job_id).deleted_at is not None
@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import pytest
+
+from app.models.application import Application
+from app.models.job import Job
+from app.models.saved_job import SavedJob
+from app.services.job_purge_service import JobPurgeService
+from app.services.storage_ledger_service import StorageLedger
+
+
+@pytest.fixture
+def static_root(app, tmp_path, monkeypatch):
+    """Send documents to a throwaway static/ folder"""
+    instance = tmp_path / "instance"
+    instance.mkdir()
+    monkeypatch.setattr(app, 'instance_path', str(instance))
+    return tmp_path / "static"
+
+
+def _soft_deleted_job(db, make_user, make_job, static_root, applicants=5):
+    owner = make_user()
+    job = make_job(owner.id)
+    ledger = StorageLedger()
+    for i in range(applicants):
+        candidate = make_user()
+        rel = f"users/{candidate.id}/applications/{i}/resume/r.pdf"
+        (static_root / rel).parent.mkdir(parents=True)
+        (static_root / rel).write_bytes(b"x" * 100)
+        ledger.record_upload(candidate.id, job.id, 'resume', 100)
+        db.session.add(Application(user_id=candidate.id, job_id=job.id, first_name="A", last_name="B",
+                                   email="a@b.com", resume_path=rel))
+        db.session.add(SavedJob(user_id=candidate.id, job_id=job.id))
+    job.deleted_at = datetime.utcnow()
+    db.session.commit()
+    return job.id
+
+
+def test_purge_job_removes_rows_and_documents_in_batches(app, db, make_user, make_job, static_root, monkeypatch):
+    job_id = _soft_deleted_job(db, make_user, make_job, static_root)
+    service = JobPurgeService(batch_size=2, pause_seconds=0.01)
+    sleeps = []
+    monkeypatch.setattr('app.services.job_purge_service.time.sleep', sleeps.append)
+
+    summary = service.purge_job(job_id)
+
+    assert summary['applications_deleted'] == 5
+    assert summary['saved_jobs_deleted'] == 5
+    assert summary['files_deleted'] == 5
+    assert summary['errors'] == []
+    # Paused after each full batch of two: 2 application + 2 saved-job batches
+    assert len(sleeps) == 4
+    db.session.expire_all()
+    assert db.session.get(Job, job_id) is None
+    assert db.session.query(Application).filter_by(job_id=job_id).count() == 0
+    assert StorageLedger().usage('job', job_id) == {'bytes': 0, 'files': 0}
+    assert not any((static_root / 'users').rglob('*.pdf'))
+
+
+def test_purge_job_ignores_live_jobs(app, db, make_user, make_job, static_root):
+    job = make_job(make_user().id)
+
+    summary = JobPurgeService(pause_seconds=0).purge_job(job.id)
+
+    assert summary['applications_deleted'] == 0
+    assert db.session.get(Job, job.id) is not None
+
+
+def test_purge_deleted_command_finishes_pending_purges(app, db, make_user, make_job, static_root):
+    first = _soft_deleted_job(db, make_user, make_job, static_root, applicants=2)
+    second = _soft_deleted_job(db, make_user, make_job, static_root, applicants=1)
+    live = make_job(make_user().id)
+
+    result = app.test_cli_runner().invoke(args=['jobs', 'purge-deleted', '--pause', '0'])
+
+    assert result.exit_code == 0
+    assert "Purged 2 jobs: 3 applications" in result.output
+    db.session.expire_all()
+    assert db.session.get(Job, first) is None
+    assert db.session.get(Job, second) is None
+    assert db.session.get(Job, live.id) is not None
@@ -126,3 +126,245 @@ def test_get_job_and_status_and_cleanup(app, db, user_id, monkeypatch):
         assert deleted >= 0
 
 
+
+
+def _job_payload(title, deadline):
+    return {
+        "title": title,
+        "description": "Build APIs",
+        "salary_min": 1,
+        "salary_max": 2,
+        "location": "Remote",
+        "requirements": ["X"],
+        "responsibilities": "R",
+        "skills": ["Y"],
+        "application_deadline": deadline,
+    }
+
+
+def test_status_column_follows_deadline(app, db, user_id):
+    from datetime import date
+
+    svc = JobService()
+    active_id = svc.create_job(user_id, _job_payload("Status active", "2099-01-01"))["job"]["id"]
+    old_id = svc.create_job(user_id, _job_payload("Status old", "2020-01-01"))["job"]["id"]
+    assert db.session.get(Job, active_id).status == "active"
+    assert db.session.get(Job, old_id).status == "deprecated"
+
+    assert svc.archive_job(user_id, active_id)
+    assert db.session.get(Job, active_id).status == "deprecated"
+    assert svc.unarchive_job(user_id, active_id)
+    assert db.session.get(Job, active_id).status == "active"
+    svc.update_job(user_id, old_id, {"application_deadline": "2099-06-01"})
+    assert svc.get_job(user_id, old_id)["status"] == "active"
+
+    data = svc.list_jobs(user_id, per_page=1, status="active")
+    assert data["total"] == 2
+    assert data["pages"] == 2
+    assert len(data["jobs"]) == 1
+    assert svc.count_active_jobs(user_id) == 2
+
+    # The daily transition catches deadlines that passed since they were set
+    assert svc.transition_job_statuses(today=date(2099, 3, 1)) == 1
+    db.session.expire_all()
+    assert db.session.get(Job, active_id).status == "deprecated"
+    assert db.session.get(Job, old_id).status == "active"
+
+
+def test_public_search_uses_active_partial_index(app, db):
+    stmt = "EXPLAIN QUERY PLAN SELECT id FROM jobs WHERE status = 'active' AND deleted_at IS NULL ORDER BY created_at DESC"
+    plan = " ".join(str(row) for row in db.session.execute(db.text(stmt)).all())
+    assert "idx_jobs_active_created" in plan
+
+
+def test_public_job_entry_cached_per_version(app, db, user_id):
+    from datetime import datetime
+
+    svc = JobService()
+    job_id = svc.create_job(user_id, _job_payload("Cached public", "2099-01-01"))["job"]["id"]
+
+    from app.common.cache import get_cache
+
+    first = svc.get_public_job_entry(job_id)
+    assert svc.get_public_job_entry(job_id) == first
+    assert get_cache().stats()["jobs"]["hits"] == 1
+
+    # A write from elsewhere bumps updated_at, which retires the cached payload
+    db.session.execute(db.update(Job).where(Job.id == job_id).values(
+        title="Renamed elsewhere", updated_at=datetime(2099, 1, 1)))
+    db.session.commit()
+    second = svc.get_public_job_entry(job_id)
+    assert second["payload"]["title"] == "Renamed elsewhere"
+    assert second["etag"] != first["etag"]
+
+
+def test_search_cache_serves_hot_queries_without_the_database(app, db, user_id):
+    from sqlalchemy import event
+
+    svc = JobService()
+    for i in range(3):
+        svc.create_job(user_id, _job_payload(f"Python role {i}", "2099-01-01"))
+    first = svc.search_public_jobs("python", page=1, per_page=2)
+    assert first["total"] == 3
+    assert first["pages"] == 2
+    assert len(first["jobs"]) == 2
+
+    statements = []
+    engine = db.engine
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        # Same query after normalization
+        again = svc.search_public_jobs("  PYTHON ", page=1, per_page=2)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert again == first
+    assert statements == []
+
+
+def test_search_cache_retired_by_job_writes(app, db, user_id):
+    svc = JobService()
+    job_id = svc.create_job(user_id, _job_payload("Remote Python", "2099-01-01"))["job"]["id"]
+    assert svc.search_public_jobs("remote")["total"] == 1
+
+    svc.create_job(user_id, _job_payload("Remote Go", "2099-01-01"))
+    assert svc.search_public_jobs("remote")["total"] == 2
+
+    svc.update_job(user_id, job_id, {"title": "Onsite Python"})
+    data = svc.search_public_jobs("python")
+    assert [job["title"] for job in data["jobs"]] == ["Onsite Python"]
+    assert svc.search_public_jobs("remote")["total"] == 1
+
+    svc.archive_job(user_id, job_id)
+    assert svc.search_public_jobs("python")["total"] == 0
+
+
+def test_search_cards_expire_soon_on_a_per_worker_cache(app, db, user_id, monkeypatch):
+    import time
+    from datetime import datetime
+    from sqlalchemy import update
+    import app.common.cache as cache_module
+
+    svc = JobService()
+    job_id = svc.create_job(user_id, _job_payload("Python role", "2099-01-01"))["job"]["id"]
+    assert [job["title"] for job in svc.search_public_jobs("python")["jobs"]] == ["Python role"]
+
+    # Written by another worker: this process's cached card isn't dropped
+    db.session.execute(update(Job).where(Job.id == job_id).values(title="Python lead"))
+    db.session.commit()
+    assert [job["title"] for job in svc.search_public_jobs("python")["jobs"]] == ["Python role"]
+
+    start = time.monotonic()
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: start + 6)
+    assert [job["title"] for job in svc.search_public_jobs("python")["jobs"]] == ["Python lead"]
+
+    db.session.execute(update(Job).where(Job.id == job_id).values(deleted_at=datetime.utcnow()))
+    db.session.commit()
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: start + 12)
+    # The cached page still lists the id, but a deleted job gets no card
+    assert svc.search_public_jobs("python")["jobs"] == []
+
+def test_search_filters_and_facet_counts(app, db, user_id):
+    svc = JobService()
+    rows = [
+        ("Backend A", "full_time", "senior", "remote", True, 100, 150, "Berlin"),
+        ("Backend B", "full_time", "mid", "onsite", False, 60, 90, "Sydney"),
+        ("Backend C", "contract", "senior", "remote", True, 120, 200, "Remote EU"),
+        ("Backend D", "part_time", "junior", "hybrid", False, 30, 50, "Berlin"),
+    ]
+    for title, employment, seniority, mode, visa, low, high, location in rows:
+        svc.create_job(user_id, {
+            **_job_payload(title, "2099-01-01"),
+            "employment_type": employment, "seniority": seniority, "work_mode": mode,
+            "visa_sponsorship": visa, "salary_min": low, "salary_max": high, "location": location,
+        })
+
+    def titles(**filters):
+        return sorted(job["title"] for job in svc.search_public_jobs(None, filters=filters)["jobs"])
+
+    assert titles(work_mode=["remote"]) == ["Backend A", "Backend C"]
+    assert titles(employment_type=["full_time", "contract"], seniority=["senior"]) == ["Backend A", "Backend C"]
+    assert titles(visa_sponsorship=False) == ["Backend B", "Backend D"]
+    assert titles(location="berlin") == ["Backend A", "Backend D"]
+    # Salary ranges that overlap 80..110
+    assert titles(salary_min=80, salary_max=110) == ["Backend A", "Backend B"]
+
+    data = svc.search_public_jobs(None, filters={"work_mode": ["remote"]}, facets=True)
+    assert data["total"] == 2
+    # work_mode ignores its own filter; the other facets count remote jobs only
+    assert data["facets"]["work_mode"] == {"remote": 2, "onsite": 1, "hybrid": 1}
+    assert data["facets"]["employment_type"] == {"full_time": 1, "contract": 1}
+    assert data["facets"]["visa_sponsorship"] == {"true": 2}
+
+
+def test_facet_filter_uses_composite_index(app, db):
+    stmt = ("EXPLAIN QUERY PLAN SELECT id FROM jobs WHERE status = 'active' AND deleted_at IS NULL "
+            "AND work_mode IN ('remote', 'hybrid') ORDER BY created_at DESC")
+    plan = " ".join(str(row) for row in db.session.execute(db.text(stmt)).all())
+    assert "idx_jobs_active_work_mode_created" in plan
+
+
+def test_search_falls_back_to_trigram_matches_for_typos(app, db, user_id):
+    svc = JobService()
+    python = svc.create_job(user_id, {**_job_payload("Python Developer", "2099-01-01"), "work_mode": "remote"})
+    misspelt = svc.create_job(user_id, {**_job_payload("Backend Engineer", "2099-01-01"),
+                                       "skills": ["Pyhton", "SQL"], "work_mode": "onsite"})
+    svc.create_job(user_id, _job_payload("Graphic Designer", "2099-01-01"))
+
+    data = svc.search_public_jobs("pyhton")
+    # The exact skill match comes first, then the similar title
+    assert [job["id"] for job in data["jobs"]] == [misspelt["job"]["id"], python["job"]["id"]]
+    assert data["total"] == 2 and data["fuzzy"] is True
+
+    # Filters still apply to the similar jobs
+    data = svc.search_public_jobs("pyhton", filters={"work_mode": ["remote"]})
+    assert [job["id"] for job in data["jobs"]] == [python["job"]["id"]]
+
+    assert svc.search_public_jobs("designer")["fuzzy"] is False
+    assert svc.search_public_jobs("zzzzzz")["total"] == 0
+
+
+def test_pg_similar_jobs_filters_both_branches_before_the_limit(app, db, monkeypatch):
+    from sqlalchemy.dialects import postgresql
+
+    statements = []
+
+    class _Result:
+        def all(self):
+            return []
+
+    def execute(stmt, *args, **kwargs):
+        statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return _Result()
+
+    monkeypatch.setattr(db.session, "execute", execute)
+    conditions = JobService._search_conditions(None, {"work_mode": "remote"})
+    JobService._pg_similar_jobs("pyhton", 0.25, 50, conditions)
+
+    inner = statements[0].split("GROUP BY")[0]
+    title_branch, skill_branch = inner.split("UNION ALL")
+    for branch in (title_branch, skill_branch):
+        assert "jobs.deleted_at IS NULL" in branch and "jobs.work_mode" in branch
+    assert "JOIN jobs" in skill_branch
+
+
+def test_status_refresh_runs_outside_the_request_session(app, db, user_id, monkeypatch):
+    from datetime import date
+    from sqlalchemy import update
+    from app.services import job_service
+
+    svc = JobService()
+    job_id = svc.create_job(user_id, _job_payload("Refresh lapsed", "2099-01-01"))["job"]["id"]
+    db.session.execute(update(Job).where(Job.id == job_id).values(application_deadline=date(2020, 1, 1)))
+    db.session.commit()
+
+    def no_commit():
+        raise AssertionError("read path committed the request session")
+
+    monkeypatch.setattr(job_service, "_status_transition_day", None)
+    monkeypatch.setattr(db.session(), "commit", no_commit)
+    svc.search_public_jobs(None)
+    monkeypatch.undo()
+
+    db.session.expire_all()
+    assert db.session.get(Job, job_id).status == "deprecated"
@@ -0,0 +1,119 @@
+import numpy as np
+from sqlalchemy import event, update
+
+from app.extensions import db as _db
+from app.models.application import Application
+from app.models.job import Job, JOB_STATUS_DEPRECATED
+from app.services import matching_service
+from app.services.job_service import JobService
+from app.services.matching_service import MatchingIndex, job_terms, tokenize
+
+
+def _apply(user_id, job_id, skills):
+    _db.session.add(Application(user_id=user_id, job_id=job_id, first_name="A", last_name="B",
+                                email="a@example.com", skills=skills))
+    _db.session.commit()
+
+
+def test_tokenize_drops_stopwords_and_trailing_dots():
+    assert tokenize("Experience with Node.js, C++ and SQL.") == ["node.js", "c++", "sql"]
+    assert tokenize(None) == []
+
+
+def test_scores_are_cosine_similarities_of_tfidf_vectors():
+    index = MatchingIndex()
+    jobs = {1: {"python": 2.0, "django": 1.0}, 2: {"python": 1.0, "react": 1.0}, 3: {"go": 1.0}}
+    for job_id, terms in jobs.items():
+        index.add_job(job_id, terms)
+    query = {"python": 1.0, "react": 1.0}
+
+    vocabulary = ["python", "django", "react", "go"]
+    idf = np.array([np.log(4 / (1 + sum(t in terms for terms in jobs.values()))) + 1 for t in vocabulary])
+    dense = np.array([[terms.get(t, 0.0) for t in vocabulary] for terms in jobs.values()]) * idf
+    q = np.array([query.get(t, 0.0) for t in vocabulary]) * idf
+    expected = dense @ q / (np.linalg.norm(dense, axis=1) * np.linalg.norm(q))
+
+    job_ids, scores = index.scores(query)
+    assert list(job_ids) == [1, 2, 3]
+    assert np.allclose(scores, expected)
+    assert [job_id for job_id, _ in index.recommend(query)] == [2, 1]
+    assert index.recommend(query, exclude={2}) == [(1, round(float(expected[0]), 4))]
+    assert index.recommend(query, limit=1)[0][0] == 2
+
+    index.remove_job(2)
+    assert [job_id for job_id, _ in index.recommend(query)] == [1]
+    assert index.recommend({"unknown": 1.0}) == []
+
+
+def test_recommendations_follow_local_writes(app, db, make_job):
+    svc = JobService()
+    backend = make_job(1, title="Backend", skills=["Python", "Django", "PostgreSQL"]).id
+    frontend = make_job(1, title="Frontend", skills=["React", "TypeScript"]).id
+    data = make_job(1, title="Data", skills=["Python", "Pandas"]).id
+    _apply(7, backend, "Python, Pandas, SQL")
+
+    ranked = matching_service.recommend_for_candidate(7)
+    # The job applied to is left out and React has nothing in common with the candidate
+    assert [job_id for job_id, _ in ranked] == [data]
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        svc.update_job(1, frontend, {"skills": ["React", "Pandas"]})
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    # Only the changed job is read back into the matrix, not every active job
+    reads = [s for s in statements if "jobs.description" in s]
+    assert reads and all("jobs.id =" in s for s in reads)
+    assert {job_id for job_id, _ in matching_service.recommend_for_candidate(7)} == {data, frontend}
+
+    svc.archive_job(1, data)
+    assert [job_id for job_id, _ in matching_service.recommend_for_candidate(7)] == [frontend]
+    assert matching_service.recommend_for_candidate(8) == []
+
+
+def test_patched_index_matches_a_rebuild(app, db, make_job):
+    first = make_job(1, title="One", skills=["Python"], description="APIs in Flask").id
+    _apply(7, first, "Flask, Python")
+    matching_service.recommend_for_candidate(7)
+    for title, skills in (("Two", ["Flask"]), ("Three", ["Python", "AWS"]), ("Four", ["Go"])):
+        make_job(1, title=title, skills=skills, description="Services on AWS")
+
+    patched = matching_service._live._index
+    rebuilt = MatchingIndex()
+    for row in db.session.execute(matching_service._live._select(Job.status == "active")).all():
+        matching_service._add_job(rebuilt, row)
+    terms = matching_service.candidate_terms(["Flask, Python, AWS"])
+    assert patched.recommend(terms) == rebuilt.recommend(terms)
+    assert len(patched) == len(rebuilt) == 4
+    assert job_terms(["Go"], [], None) == {"go": 1 + np.log(matching_service.SKILL_WEIGHT)}
+
+
+def test_recommendations_sync_other_workers_writes(app, db, monkeypatch, make_job):
+    applied = make_job(1, title="Backend", skills=["Python"]).id
+    data = make_job(1, title="Data", skills=["Python", "Pandas"]).id
+    _apply(7, applied, "Python, Pandas")
+    assert [job_id for job_id, _ in matching_service.recommend_for_candidate(7)] == [data]
+
+    # Expired by the transition cron in another process
+    db.session.execute(update(Job).where(Job.id == data).values(status=JOB_STATUS_DEPRECATED))
+    db.session.commit()
+    monkeypatch.setitem(app.config, "SEARCH_INDEX_SYNC_SECONDS", 0)
+    assert matching_service.recommend_for_candidate(7) == []
+
+
+def test_job_without_terms_does_not_force_rebuilds(app, db, monkeypatch, make_job):
+    applied = make_job(1, title="Backend", skills=["Python"]).id
+    make_job(1, title="Vague", skills=["The"], requirements=["with"], description="You will work with our team")
+    _apply(7, applied, "Python")
+    monkeypatch.setitem(app.config, "SEARCH_INDEX_SYNC_SECONDS", 0)
+    builds = []
+    factory = matching_service._live._factory
+    monkeypatch.setattr(matching_service._live, "_factory", lambda: builds.append(1) or factory())
+
+    for _ in range(3):
+        assert matching_service.recommend_for_candidate(7) == []
+    # The all-stopword job still counts towards the index size, so syncs agree with the table
+    assert len(builds) == 1
+    assert len(matching_service._live._index) == 2
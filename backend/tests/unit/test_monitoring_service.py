@@ -0,0 +1,87 @@
+from app.services.monitoring_service import DatabaseMonitor
+
+
+def test_sqlite_database_size_uses_page_count(app):
+    result = DatabaseMonitor()._check_database_size()
+    assert result['status'] is True
+    assert result['size_bytes'] > 0
+
+
+def test_postgres_only_checks_report_unsupported_on_sqlite(app):
+    monitor = DatabaseMonitor()
+    assert monitor._check_long_running_queries()['status'] is True
+    assert 'not supported' in monitor._check_locks()['message']
+    assert monitor.get_database_activity()['supported'] is False
+
+
+def test_cached_results_are_reused_until_cleared(app):
+    monitor = DatabaseMonitor()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert monitor._cached('probe', compute) == 1
+    assert monitor._cached('probe', compute) == 1
+    monitor.clear_cache()
+    assert monitor._cached('probe', compute) == 2
+
+
+def test_health_check_includes_lock_and_cache_checks(app):
+    status = DatabaseMonitor().check_database_health()
+    assert {'locks', 'cache_hit_ratio', 'long_queries'} <= set(status['checks'])
+
+
+def _status(overall):
+    return {'timestamp': 'x', 'overall_status': overall, 'checks': {}}
+
+
+def test_health_history_is_shared_between_monitor_instances(app):
+    # Two monitors stand in for two gunicorn workers
+    worker_a, worker_b = DatabaseMonitor(), DatabaseMonitor()
+    worker_a.history_store.record(_status('healthy'))
+    worker_b.history_store.record(_status('unhealthy'))
+
+    for monitor in (worker_a, worker_b):
+        summary = monitor.get_health_summary()
+        assert summary['total_checks'] == 2
+        assert summary['healthy_checks'] == 1
+        assert summary['status'] == 'unhealthy'
+
+
+def test_health_history_ring_buffer_reuses_slots(app):
+    from datetime import datetime, timedelta
+    from app.models.health_check_sample import HealthCheckSample
+
+    app.config['HEALTH_HISTORY_CAPACITY'] = 3
+    try:
+        store = DatabaseMonitor().history_store
+        start = datetime.utcnow() - timedelta(minutes=10)
+        for minute in range(5):
+            store.record(_status('healthy'), now=start + timedelta(minutes=minute))
+
+        assert HealthCheckSample.query.count() == 3
+        history = store.history(hours=1)
+        assert len(history) == 3
+        assert [p['total_checks'] for p in history] == [1, 1, 1]
+    finally:
+        app.config.pop('HEALTH_HISTORY_CAPACITY')
+
+
+def test_health_history_downsamples_to_max_points(app):
+    from datetime import datetime, timedelta
+
+    store = DatabaseMonitor().history_store
+    start = datetime.utcnow() - timedelta(minutes=50)
+    for minute in range(40):
+        store.record(_status('healthy' if minute % 2 else 'unhealthy'), now=start + timedelta(minutes=minute))
+
+    history = store.history(hours=1, max_points=6)
+    assert len(history) <= 7
+    assert sum(p['total_checks'] for p in history) == 40
+    assert all(p['bucket_seconds'] == 600 for p in history)
+
+
+def test_summary_without_samples_reports_no_data(app):
+    assert DatabaseMonitor().get_health_summary()['status'] == 'no_data'
@@ -0,0 +1,100 @@
+import logging
+import os
+import sys
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app
+from app.extensions import db
+from app.common.query_instrumentation import (
+    RequestQueryStats,
+    normalize_statement,
+    get_request_query_stats,
+)
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from conftest import TestConfig
+
+
+class InstrumentedConfig(TestConfig):
+    SQL_SLOW_QUERY_MS = 0
+    SQL_N_PLUS_ONE_THRESHOLD = 3
+
+
+@pytest.fixture
+def instrumented_app():
+    app = create_app(InstrumentedConfig)
+
+    @app.get("/_test/n-plus-one")
+    def _n_plus_one():
+        for i in range(5):
+            db.session.execute(text("SELECT :i"), {"i": i})
+        stats = get_request_query_stats()
+        return {"count": stats.count}
+
+    @app.get("/_test/failing-statement")
+    def _failing_statement():
+        for _ in range(3):
+            try:
+                db.session.execute(text("SELECT * FROM missing_table"))
+            except Exception:
+                db.session.rollback()
+        db.session.execute(text("SELECT 1"))
+        stats = get_request_query_stats()
+        return {"count": stats.count, "leftover": bool(db.session.connection().info.get("_query_start_time"))}
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+def test_normalize_statement_collapses_literals_and_in_lists():
+    a = normalize_statement("SELECT * FROM users WHERE id IN (?, ?, ?) AND name = 'bob'")
+    b = normalize_statement("SELECT *  FROM users\nWHERE id IN (?) AND name = 'alice'")
+    assert a == b
+    assert normalize_statement("SELECT 1 LIMIT 20") == normalize_statement("SELECT 1 LIMIT 5")
+
+
+def test_request_query_stats_tracks_slowest_and_repeats():
+    stats = RequestQueryStats(top_n=2)
+    stats.record("SELECT a FROM t WHERE id = ?", 1.0)
+    stats.record("SELECT a FROM t WHERE id = ?", 5.0)
+    stats.record("SELECT b FROM u", 3.0)
+
+    data = stats.to_dict()
+    assert data["query_count"] == 3
+    assert data["total_db_ms"] == 9.0
+    assert [s["duration_ms"] for s in data["slowest"]] == [5.0, 3.0]
+    assert stats.repeated_shapes(1) == [{"statement": "SELECT a FROM t WHERE id = ?", "count": 2}]
+    assert stats.repeated_shapes(2) == []
+
+
+def test_server_timing_header_and_n_plus_one_warning(instrumented_app, caplog):
+    client = instrumented_app.test_client()
+    with caplog.at_level(logging.WARNING):
+        resp = client.get("/_test/n-plus-one")
+
+    assert resp.status_code == 200
+    assert resp.get_json()["count"] == 5
+    assert resp.headers["Server-Timing"].startswith("db;dur=")
+    assert 'desc="5 queries"' in resp.headers["Server-Timing"]
+    assert any("possible_n_plus_one" in r.getMessage() for r in caplog.records)
+    assert any(r.name == "app.sql.slow" and "slow_query" in r.getMessage() for r in caplog.records)
+
+
+def test_failing_statements_leave_no_start_times_behind(instrumented_app):
+    resp = instrumented_app.test_client().get("/_test/failing-statement")
+
+    assert resp.status_code == 200
+    assert resp.get_json() == {"count": 1, "leftover": False}
+
+
+def test_instrumentation_can_be_disabled():
+    class DisabledConfig(TestConfig):
+        SQL_INSTRUMENTATION_ENABLED = False
+
+    app = create_app(DisabledConfig)
+    resp = app.test_client().get("/health")
+    assert "Server-Timing" not in resp.headers
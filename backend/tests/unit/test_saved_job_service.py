@@ -14,3 +14,40 @@ def test_save_and_unsave_flow(app, make_user, make_job):
         assert svc.is_saved(user.id, job.id) is False
 
 
+def test_list_counts_orders_and_pages_with_cursor(app, db, make_user, make_job):
+    from datetime import datetime, timedelta
+    from app.models.saved_job import SavedJob
+
+    svc = SavedJobService()
+    user = make_user(is_verified=True)
+    jobs = [make_job(user_id=make_user().id) for _ in range(5)]
+    base = datetime(2026, 1, 1)
+    # Two saves share a timestamp, so the id breaks the tie
+    stamps = [base, base + timedelta(hours=1), base + timedelta(hours=1), base + timedelta(hours=2), base + timedelta(hours=3)]
+    for job, stamp in zip(jobs, stamps):
+        db.session.add(SavedJob(user_id=user.id, job_id=job.id, created_at=stamp))
+    db.session.commit()
+    expected = [jobs[4].id, jobs[3].id, jobs[2].id, jobs[1].id, jobs[0].id]
+
+    first = svc.list(user.id, per_page=2)
+    assert first["total"] == 5
+    assert first["pages"] == 3
+    assert [i["job_id"] for i in first["items"]] == expected[:2]
+
+    # Offset pages and cursor pages agree
+    assert [i["job_id"] for i in svc.list(user.id, page=2, per_page=2)["items"]] == expected[2:4]
+    seen, cursor = [], None
+    while True:
+        page = svc.list(user.id, per_page=2, cursor=cursor)
+        seen += [i["job_id"] for i in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == expected
+
+
+def test_list_rejects_malformed_cursor(app, db, make_user):
+    import pytest
+
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        SavedJobService().list(make_user().id, cursor="not-a-cursor")
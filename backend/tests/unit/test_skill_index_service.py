@@ -0,0 +1,86 @@
+from datetime import date
+
+from sqlalchemy import select
+
+from app.models.job import Job
+from app.models.job_skill import JobSkill
+from app.services.job_service import JobService
+from app.services.skill_index_service import SkillIndexService, normalize_skill
+
+
+def _skill_rows(db, job_id):
+    return sorted(db.session.execute(select(JobSkill.skill_norm).where(JobSkill.job_id == job_id)).scalars())
+
+
+def test_index_follows_create_and_update(app, db, make_job):
+    svc = JobService()
+    job_id = make_job(1, title="Frontend", skills=["React", " react ", "Type  Script"]).id
+    assert _skill_rows(db, job_id) == ["react", "type script"]
+
+    svc.update_job(1, job_id, {"skills": ["Vue"]})
+    assert _skill_rows(db, job_id) == ["vue"]
+    # Updates that leave skills alone keep the rows
+    svc.update_job(1, job_id, {"title": "Frontend Engineer"})
+    assert _skill_rows(db, job_id) == ["vue"]
+
+
+def test_exact_prefix_and_multi_skill_queries(app, db, monkeypatch, make_job):
+    # Exact matching only; the typo fallback would add "Preact" to a search for "react"
+    monkeypatch.setitem(app.config, "JOB_SEARCH_FUZZY_MIN_HITS", 0)
+    svc = JobService()
+    react = make_job(1, title="React dev", skills=["React", "Redux"]).id
+    preact = make_job(1, title="Widget dev", skills=["Preact"]).id
+    python = make_job(1, title="Data dev", skills=["Python", "React"]).id
+
+    def titles(q=None, **filters):
+        return sorted(job["id"] for job in svc.search_public_jobs(q, filters=filters)["jobs"])
+
+    assert titles(skills=["react"]) == [react, python]
+    assert titles(skills=["REACT", "redux"]) == [react]
+    assert titles(skills=["redux", "python"], skills_match="any") == [react, python]
+    # q matches the start of a skill, so "react" no longer finds "Preact"
+    assert titles("react") == [react, python]
+    assert titles("pre") == [preact]
+    assert titles("py") == [python]
+
+
+def test_skill_prefix_treats_like_wildcards_literally(app, db, make_job):
+    c_sharp = make_job(1, title="Dotnet dev", skills=["C#"]).id
+    make_job(1, title="C dev", skills=["Cx"])
+    snake = make_job(1, title="Snake dev", skills=["snake_case"]).id
+
+    def jobs(prefix):
+        return sorted(db.session.execute(SkillIndexService.jobs_with_skill_prefix(prefix)).scalars())
+
+    assert jobs("c#") == [c_sharp]
+    assert jobs("c_") == []
+    assert jobs("snake_") == [snake]
+    assert jobs("%") == []
+
+def test_skill_lookup_is_an_index_scan(app, db):
+    stmt = select(JobSkill.job_id).where(JobSkill.skill_norm.in_(["react", "redux"]))
+    plan = " ".join(str(row) for row in db.session.execute(
+        db.text("EXPLAIN QUERY PLAN " + str(stmt.compile(compile_kwargs={"literal_binds": True})))
+    ).all())
+    assert "idx_job_skills_skill_job" in plan
+
+
+def test_reindex_command_rebuilds_rows(app, db):
+    db.session.add(Job(user_id=1, title="Imported", description="d", salary_min=1, salary_max=2, location="x",
+                       requirements=[], responsibilities="r", skills=["Go", "gRPC"],
+                       application_deadline=date(2099, 1, 1)))
+    db.session.commit()
+    job_id = db.session.execute(select(Job.id)).scalar_one()
+    assert _skill_rows(db, job_id) == []
+
+    result = app.test_cli_runner().invoke(args=['jobs', 'reindex-skills', '--batch-size', '1'])
+
+    assert result.exit_code == 0
+    assert "Indexed skills of 1 jobs" in result.output
+    assert _skill_rows(db, job_id) == ["go", "grpc"]
+
+
+def test_normalize_skill():
+    assert normalize_skill("  Machine   Learning ") == "machine learning"
+    assert normalize_skill(None) == ""
+    assert SkillIndexService.normalized(["A", "a", "", "B"]) == ["a", "b"]
@@ -0,0 +1,141 @@
+from io import BytesIO
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from app.services.application_service import ApplicationService
+from app.services.job_service import JobService
+from app.common.exceptions import QuotaExceededError
+from app.services.storage_ledger_service import StorageLedger
+
+
+@pytest.fixture
+def static_root(app, tmp_path, monkeypatch):
+    """Send uploads to a throwaway static/ folder"""
+    instance = tmp_path / "instance"
+    instance.mkdir()
+    monkeypatch.setattr(app, 'instance_path', str(instance))
+    return tmp_path / "static"
+
+
+def _pdf(name, size):
+    return FileStorage(stream=BytesIO(b"%PDF-1.4" + b"x" * (size - 8)), filename=name,
+                       content_type='application/pdf')
+
+
+def _apply(user_id, job_id, resume_size=100, cover_size=None):
+    data = {'firstName': 'Ada', 'lastName': 'Lovelace', 'email': 'ada@example.com'}
+    cover = _pdf('cover.pdf', cover_size) if cover_size else None
+    return ApplicationService().create_application(user_id, job_id, data, _pdf('resume.pdf', resume_size), cover)
+
+
+def test_record_upload_and_delete_adjust_every_scope(app, db):
+    ledger = StorageLedger()
+    ledger.record_upload(1, 10, 'resume', 300)
+    ledger.record_upload(1, 11, 'cover_letter', 200)
+    ledger.record_upload(2, 10, 'resume', 50)
+    db.session.commit()
+
+    assert ledger.usage('user', 1) == {'bytes': 500, 'files': 2}
+    assert ledger.usage('job', 10) == {'bytes': 350, 'files': 2}
+    assert ledger.usage('doc_type', 'resume') == {'bytes': 350, 'files': 2}
+
+    ledger.record_delete(1, 10, 'resume', 300)
+    db.session.commit()
+    stats = ledger.stats()
+    assert stats['total_files'] == 2
+    assert stats['total_size_bytes'] == 250
+    assert ledger.usage('user', 1) == {'bytes': 200, 'files': 1}
+    assert ledger.usage('user', 99) == {'bytes': 0, 'files': 0}
+
+
+def test_upload_counts_are_rolled_back_with_the_application(app, db, make_user, make_job, static_root):
+    owner, candidate = make_user(), make_user()
+    job = make_job(owner.id)
+    _apply(candidate.id, job.id, resume_size=1000, cover_size=400)
+
+    ledger = StorageLedger()
+    assert ledger.usage('user', candidate.id) == {'bytes': 1400, 'files': 2}
+    assert ledger.usage('job', job.id) == {'bytes': 1400, 'files': 2}
+
+    # A duplicate application fails before anything is counted
+    with pytest.raises(Exception):
+        _apply(candidate.id, job.id)
+    assert ledger.usage('user', candidate.id) == {'bytes': 1400, 'files': 2}
+
+
+def test_job_deletion_uncounts_documents(app, db, make_user, make_job, static_root):
+    owner, candidate = make_user(), make_user()
+    job = make_job(owner.id)
+    _apply(candidate.id, job.id, resume_size=1000)
+
+    JobService().delete_job(owner.id, job.id)
+
+    ledger = StorageLedger()
+    assert ledger.usage('user', candidate.id) == {'bytes': 0, 'files': 0}
+    assert ledger.stats()['total_files'] == 0
+
+
+def test_reconcile_rebuilds_counters_from_disk(app, db, make_user, make_job, static_root):
+    owner, candidate = make_user(), make_user()
+    job = make_job(owner.id)
+    result = _apply(candidate.id, job.id, resume_size=1000)
+    stray = static_root / 'users' / str(candidate.id) / 'stray.pdf'
+    stray.write_bytes(b'x' * 70)
+
+    # Simulate drift: the counters claim far more than is stored
+    ledger = StorageLedger()
+    ledger.record_upload(candidate.id, job.id, 'resume', 10_000)
+    db.session.commit()
+
+    stats = ledger.reconcile()
+
+    assert stats['total_files'] == 1
+    assert stats['total_size_bytes'] == 1000
+    assert stats['unreferenced_files'] == 1
+    assert stats['unreferenced_size_bytes'] == 70
+    assert ledger.usage('user', candidate.id) == {'bytes': 1000, 'files': 1}
+    assert result['application']['resume_path'].startswith(f"users/{candidate.id}/")
+
+
+def test_check_quota_per_user_and_job(app, db, monkeypatch):
+    monkeypatch.setitem(app.config, 'STORAGE_QUOTA_PER_USER_BYTES', 1000)
+    monkeypatch.setitem(app.config, 'STORAGE_QUOTA_PER_JOB_BYTES', 1500)
+    ledger = StorageLedger()
+    ledger.record_upload(1, 10, 'resume', 900)
+    ledger.record_upload(2, 10, 'resume', 500)
+    db.session.commit()
+
+    ledger.check_quota(1, 11, 100)
+    with pytest.raises(QuotaExceededError, match="your documents"):
+        ledger.check_quota(1, 11, 101)
+    with pytest.raises(QuotaExceededError, match="This job"):
+        ledger.check_quota(3, 10, 101)
+
+    monkeypatch.setitem(app.config, 'STORAGE_QUOTA_PER_USER_BYTES', 0)
+    ledger.check_quota(1, 11, 1400)
+
+
+def test_upload_racing_past_quota_is_rolled_back(app, db, make_user, make_job, static_root, monkeypatch):
+    owner, candidate = make_user(), make_user()
+    job = make_job(owner.id)
+    monkeypatch.setitem(app.config, 'STORAGE_QUOTA_PER_USER_BYTES', 500)
+
+    # Passes any pre-check done with a stale counter, but not the in-transaction one
+    with pytest.raises(QuotaExceededError):
+        _apply(candidate.id, job.id, resume_size=600)
+
+    assert StorageLedger().usage('user', candidate.id) == {'bytes': 0, 'files': 0}
+    assert not any(p.is_file() for p in static_root.rglob('*'))
+
+
+def test_top_consumers_orders_by_bytes(app, db, monkeypatch):
+    monkeypatch.setitem(app.config, 'STORAGE_QUOTA_PER_USER_BYTES', 1000)
+    ledger = StorageLedger()
+    for user_id, size in ((1, 100), (2, 700), (3, 300)):
+        ledger.record_upload(user_id, 10, 'resume', size)
+    db.session.commit()
+
+    top = ledger.top_consumers('user', limit=2)
+    assert [(c['id'], c['bytes']) for c in top] == [(2, 700), (3, 300)]
+    assert top[0]['quota_used_percent'] == 70.0
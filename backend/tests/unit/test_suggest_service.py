@@ -0,0 +1,118 @@
+from sqlalchemy import delete, event, update
+
+from app.common.cache import get_cache
+from app.models.job import Job, JOB_STATUS_DEPRECATED
+from app.services import suggest_service
+from app.services.job_service import JobService
+from app.services.suggest_service import SuggestIndex
+
+
+def _count_statements(db, func):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    return result, statements
+
+
+def test_index_ranks_by_job_count_and_drops_unused_terms():
+    index = SuggestIndex()
+    index.add_job(1, {("python", "skill", "Python"), ("paris", "location", "Paris")})
+    index.add_job(2, {("python", "skill", "Python"), ("pyspark", "skill", "PySpark")})
+
+    assert index.lookup("py") == [
+        {"text": "Python", "kind": "skill", "jobs": 2},
+        {"text": "PySpark", "kind": "skill", "jobs": 1},
+    ]
+    assert index.lookup("p", kinds=("location",)) == [{"text": "Paris", "kind": "location", "jobs": 1}]
+
+    index.remove_job(2)
+    assert index.lookup("py") == [{"text": "Python", "kind": "skill", "jobs": 1}]
+    assert index.lookup("") == []
+
+
+def test_suggest_answers_from_memory_and_follows_local_writes(app, db, make_job):
+    svc = JobService()
+    make_job(1, title="Python Engineer", skills=["Python", "Django"], location="Berlin")
+    assert suggest_service.suggest("pyth")[0]["text"] in ("Python", "Python Engineer")
+
+    # Patched in place by the write, no rebuild or query on lookup
+    job_id = make_job(1, title="Data Scientist", skills=["Python", "Pandas"], location="Paris").id
+    suggestions, statements = _count_statements(db, lambda: suggest_service.suggest("p", kinds=("skill", "location")))
+    assert statements == []
+    assert suggestions[0] == {"text": "Python", "kind": "skill", "jobs": 2}
+    assert {"text": "Paris", "kind": "location", "jobs": 1} in suggestions
+
+    svc.archive_job(1, job_id)
+    suggestions, statements = _count_statements(db, lambda: suggest_service.suggest("pa"))
+    assert statements == []
+    assert suggestions == []
+
+
+def _write_elsewhere(db, job_id, **values):
+    """Change a job the way another worker or the cron would: nothing in this process hears of it"""
+    db.session.execute(update(Job).where(Job.id == job_id).values(**values))
+    db.session.commit()
+
+
+def test_suggest_syncs_other_workers_writes(app, db, monkeypatch, make_job):
+    go = make_job(1, title="Go Developer", skills=["Go"]).id
+    rust = make_job(1, title="Rust Developer", skills=["Rust"]).id
+    assert suggest_service.suggest("go")
+
+    # Expired by another process, and this worker's cache never sees a generation bump
+    _write_elsewhere(db, go, status=JOB_STATUS_DEPRECATED)
+    _write_elsewhere(db, rust, title="Rust Engineer")
+    # Within SEARCH_INDEX_SYNC_SECONDS the index answers as it was
+    assert suggest_service.suggest("go")
+
+    monkeypatch.setitem(app.config, "SEARCH_INDEX_SYNC_SECONDS", 0)
+    _, statements = _count_statements(db, lambda: suggest_service.suggest("go"))
+    assert suggest_service.suggest("go") == []
+    assert suggest_service.suggest("rust e")[0]["text"] == "Rust Engineer"
+    # A range scan of changed jobs and an active count, not a rebuild
+    assert len(statements) == 2
+    assert "jobs.updated_at >=" in statements[0]
+
+
+def test_suggest_rebuilds_when_active_count_disagrees(app, db, monkeypatch, make_job):
+    first = make_job(1, title="Go Developer", skills=["Go"]).id
+    make_job(1, title="Go Engineer", skills=["Go"])
+    assert suggest_service.suggest("go", kinds=("skill",))[0]["jobs"] == 2
+
+    # Removed without touching updated_at, so only the count gives it away
+    db.session.execute(delete(Job).where(Job.id == first))
+    db.session.commit()
+    monkeypatch.setitem(app.config, "SEARCH_INDEX_SYNC_SECONDS", 0)
+    assert suggest_service.suggest("go", kinds=("skill",))[0]["jobs"] == 1
+
+
+def test_suggest_does_not_read_the_cache_generation(app, db, make_job):
+    make_job(1, title="Go Developer", skills=["Go"])
+    assert suggest_service.suggest("go")
+    # A failing cache used to force a rebuild on every keystroke
+    get_cache().clear()
+    _, statements = _count_statements(db, lambda: suggest_service.suggest("go"))
+    assert statements == []
+
+
+def test_similar_jobs_ranks_by_trigram_similarity():
+    index = SuggestIndex()
+    index.add_job(1, {("python engineer", "title", "Python Engineer")})
+    index.add_job(2, {("javascript", "skill", "JavaScript"), ("python", "skill", "Python")})
+    index.add_job(3, {("go", "skill", "Go"), ("paris", "location", "Paris")})
+
+    ranked = index.similar_jobs("pyhton")
+    assert [job_id for job_id, _ in ranked] == [1, 2]
+    assert 0.25 <= ranked[0][1] < 1
+    assert [job_id for job_id, _ in index.similar_jobs("javscript")] == [2]
+    # Locations and words under three letters aren't indexed
+    assert index.similar_jobs("pariss") == []
+    assert index.similar_jobs("go") == []
+
+    index.remove_job(2)
+    assert index.similar_jobs("javscript") == []
+    assert index._grams.keys() == {gram for word in index._words for gram in suggest_service.trigrams(word)}
@@ -28,7 +28,7 @@ const CandidateDashboard = () => {
       
       // Load saved jobs count
       const savedJobsResponse = await savedJobsService.list(1, 1);
-      const savedJobsCount = savedJobsResponse.pagination?.total || 0;
+      const savedJobsCount = savedJobsResponse.data?.total || 0;
       
       // Count interviews (applications with 'reviewed' or 'accepted' status)
       const allApplicationsResponse = await applicationService.getMyApplications(1, 100);
@@ -6,6 +6,8 @@ const CandidateSavedJobs = () => {
   const [items, setItems] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [selected, setSelected] = useState([]);
+  const [removing, setRemoving] = useState(false);
   const navigate = useNavigate();
 
   useEffect(() => {
@@ -21,30 +23,65 @@ const CandidateSavedJobs = () => {
     })();
   }, []);
 
+  const toggleSelected = (jobId) => {
+    setSelected((prev) => (prev.includes(jobId) ? prev.filter((id) => id !== jobId) : [...prev, jobId]));
+  };
+
+  // One request unsaves every selected job
+  const removeSelected = async () => {
+    setRemoving(true);
+    try {
+      await savedJobsService.bulkUpdate({ unsave: selected });
+      setItems((prev) => prev.filter((it) => !selected.includes(it.job_id)));
+      setSelected([]);
+    } catch (e) {
+      setError('Failed to remove saved jobs');
+    } finally {
+      setRemoving(false);
+    }
+  };
+
   if (loading) return <div className="text-gray-500">Loading...</div>;
   if (error) return <div className="text-red-600">{error}</div>;
 
   return (
     <div className="max-w-7xl mx-auto">
-      <h1 className="text-3xl font-bold text-gray-900 mb-6">My Saved Jobs</h1>
+      <div className="flex items-center justify-between mb-6">
+        <h1 className="text-3xl font-bold text-gray-900">My Saved Jobs</h1>
+        {selected.length > 0 && (
+          <button type="button" onClick={removeSelected} disabled={removing} className="btn-secondary disabled:opacity-50">
+            Remove selected ({selected.length})
+          </button>
+        )}
+      </div>
       {items.length === 0 ? (
         <div className="text-gray-500">You have no saved jobs yet.</div>
       ) : (
         <div className="space-y-3">
-          {items.map((it, idx) => (
-            <div key={idx} className="card cursor-pointer transition-shadow hover:shadow-md hover:border-primary-200" onClick={() => navigate(`/jobs/${it.job_id}`)}>
+          {items.map((it) => (
+            <div key={it.job_id} className="card cursor-pointer transition-shadow hover:shadow-md hover:border-primary-200" onClick={() => navigate(`/jobs/${it.job_id}`)}>
               <div className="flex items-center justify-between">
-                <div>
-                  <h3 className="text-lg font-semibold">{it.title}</h3>
-                  <p className="text-gray-600 text-sm">{it.location} {it.work_mode ? `• ${it.work_mode}` : ''}</p>
-                  {Array.isArray(it.skills) && it.skills.length > 0 && (
-                    <div className="mt-2 flex flex-wrap gap-2">
-                      {it.skills.slice(0,6).map((s, idx) => (
-                        <span key={idx} className="px-2 py-0.5 rounded bg-gray-100 text-gray-700 text-xs">{s}</span>
-                      ))}
-                    </div>
-                  )}
-                  <div className="text-sm text-gray-500 mt-2">Saved on {new Date(it.saved_at).toLocaleDateString()}</div>
+                <div className="flex items-start gap-3">
+                  <input
+                    type="checkbox"
+                    aria-label={`Select ${it.title}`}
+                    checked={selected.includes(it.job_id)}
+                    onClick={(e) => e.stopPropagation()}
+                    onChange={() => toggleSelected(it.job_id)}
+                    className="mt-1.5"
+                  />
+                  <div>
+                    <h3 className="text-lg font-semibold">{it.title}</h3>
+                    <p className="text-gray-600 text-sm">{it.location} {it.work_mode ? `• ${it.work_mode}` : ''}</p>
+                    {Array.isArray(it.skills) && it.skills.length > 0 && (
+                      <div className="mt-2 flex flex-wrap gap-2">
+                        {it.skills.slice(0,6).map((s, idx) => (
+                          <span key={idx} className="px-2 py-0.5 rounded bg-gray-100 text-gray-700 text-xs">{s}</span>
+                        ))}
+                      </div>
+                    )}
+                    <div className="text-sm text-gray-500 mt-2">Saved on {new Date(it.saved_at).toLocaleDateString()}</div>
+                  </div>
                 </div>
               </div>
             </div>
@@ -0,0 +1,27 @@
+import { render, screen, waitFor, fireEvent } from '@testing-library/react';
+import { BrowserRouter } from 'react-router-dom';
+import CandidateSavedJobs from './CandidateSavedJobs';
+import { savedJobsService } from '../../services/savedJobsService';
+
+vi.mock('../../services/savedJobsService', () => ({
+  savedJobsService: { list: vi.fn(), bulkUpdate: vi.fn() },
+}));
+
+const items = [
+  { job_id: 1, title: 'Backend Engineer', location: 'Remote', saved_at: '2025-01-01T00:00:00' },
+  { job_id: 2, title: 'Data Analyst', location: 'Paris', saved_at: '2025-01-02T00:00:00' },
+];
+
+it('removes the selected jobs with one bulk request', async () => {
+  savedJobsService.list.mockResolvedValue({ data: { items } });
+  savedJobsService.bulkUpdate.mockResolvedValue({ data: { saved: { 1: false } } });
+  render(<BrowserRouter><CandidateSavedJobs /></BrowserRouter>);
+  await waitFor(() => screen.getByText('Backend Engineer'));
+
+  fireEvent.click(screen.getByLabelText('Select Backend Engineer'));
+  fireEvent.click(screen.getByRole('button', { name: /remove selected \(1\)/i }));
+
+  await waitFor(() => expect(screen.queryByText('Backend Engineer')).not.toBeInTheDocument());
+  expect(savedJobsService.bulkUpdate).toHaveBeenCalledWith({ unsave: [1] });
+  expect(screen.getByText('Data Analyst')).toBeInTheDocument();
+});
@@ -3,23 +3,41 @@ import api from '../../services/api';
 import { useNavigate } from 'react-router-dom';
 import useDebouncedValue from '../../hooks/useDebouncedValue';
 
-const defaultFetcher = async ({ q, page, perPage, signal }) => {
-  const resp = await api.get('/recruiter/jobs', { params: { q: q || undefined, page, per_page: perPage }, signal });
+const FILTERS = [
+  { name: 'employment_type', label: 'Employment type', options: ['full_time', 'part_time', 'contract', 'internship', 'temporary'] },
+  { name: 'seniority', label: 'Seniority', options: ['intern', 'junior', 'mid', 'senior', 'lead'] },
+  { name: 'work_mode', label: 'Work mode', options: ['onsite', 'remote', 'hybrid'] },
+  { name: 'visa_sponsorship', label: 'Visa sponsorship', options: ['true', 'false'] },
+];
+
+const optionLabel = (value) => ({ true: 'Yes', false: 'No' }[value] || value.replace('_', ' '));
+
+const defaultFetcher = async ({ q, page, perPage, filters = {}, signal }) => {
+  // include=saved flags the signed-in user's saved jobs; include=facets returns counts per filter value
+  const active = Object.fromEntries(Object.entries(filters).filter(([, v]) => v !== '' && v !== undefined));
+  const resp = await api.get('/recruiter/jobs', { params: { q: q || undefined, page, per_page: perPage, include: 'saved,facets', ...active }, signal });
   return resp?.data || { jobs: [], pages: 1, current_page: 1, total: 0 };
 };
 
-const Jobs = ({ fetcher = defaultFetcher }) => {
+const defaultSuggester = async ({ prefix, signal }) => {
+  const resp = await api.get('/recruiter/jobs/suggest', { params: { prefix, limit: 8 }, signal });
+  return resp?.data?.suggestions || [];
+};
+
+const Jobs = ({ fetcher = defaultFetcher, suggester = defaultSuggester }) => {
   const [q, setQ] = useState('');
   const [page, setPage] = useState(1);
   const navigate = useNavigate();
   const [perPage] = useState(10);
   const [data, setData] = useState({ jobs: [], pages: 1, current_page: 1, total: 0 });
   const [loading, setLoading] = useState(false);
+  const [filters, setFilters] = useState({});
+  const [suggestions, setSuggestions] = useState([]);
 
-  const fetchJobs = async (query, pageNum, signal) => {
+  const fetchJobs = async (query, pageNum, signal, activeFilters = filters) => {
     setLoading(true);
     try {
-      const result = await fetcher({ q: query, page: pageNum, perPage, signal });
+      const result = await fetcher({ q: query, page: pageNum, perPage, filters: activeFilters, signal });
       setData(result || { jobs: [], pages: 1, current_page: 1, total: 0 });
     } catch (err) {
       if (err?.name !== 'CanceledError' && err?.code !== 'ERR_CANCELED') {
@@ -54,6 +72,29 @@ const Jobs = ({ fetcher = defaultFetcher }) => {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [dq]);
 
+  // Typeahead: served from the API's in-memory index, so it can follow every keystroke
+  useEffect(() => {
+    const prefix = q.trim();
+    if (prefix.length < 2) {
+      setSuggestions([]);
+      return undefined;
+    }
+    const controller = new AbortController();
+    suggester({ prefix, signal: controller.signal })
+      .then((items) => setSuggestions(items || []))
+      .catch(() => {});
+    return () => controller.abort();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [q]);
+
+  const onFilterChange = (name, value) => {
+    const next = { ...filters, [name]: value };
+    setFilters(next);
+    setPage(1);
+    const controller = new AbortController();
+    fetchJobs(q, 1, controller.signal, next);
+  };
+
   const onSearch = (e) => {
     e.preventDefault();
     setPage(1);
@@ -72,10 +113,16 @@ const Jobs = ({ fetcher = defaultFetcher }) => {
             <input
               value={q}
               onChange={(e) => setQ(e.target.value)}
+              list="job-suggestions"
               placeholder="Search by job title or skills (e.g. React, Python)"
               aria-label="Search jobs by title or skills"
               className="w-full px-4 py-3 rounded-lg border border-gray-200 focus:outline-none focus:ring-2 focus:ring-primary-500 focus:border-primary-500"
             />
+            <datalist id="job-suggestions">
+              {suggestions.map((s) => (
+                <option key={`${s.kind}:${s.text}`} value={s.text}>{s.kind}</option>
+              ))}
+            </datalist>
           </div>
           {q && (
             <button type="button" onClick={() => { setQ(''); setPage(1); const c=new AbortController(); fetchJobs('', 1, c.signal); }} className="btn-secondary w-full sm:w-auto">Clear</button>
@@ -83,8 +130,32 @@ const Jobs = ({ fetcher = defaultFetcher }) => {
           <button className="btn-primary w-full sm:w-auto" type="submit">Search</button>
         </form>
         <p className="text-gray-500 text-sm mt-2">Tip: Try keywords like “Senior”, “Remote”, or a skill.</p>
+        <div className="mt-4 grid grid-cols-2 md:grid-cols-4 gap-3">
+          {FILTERS.map(({ name, label, options }) => (
+            <select
+              key={name}
+              aria-label={label}
+              value={filters[name] || ''}
+              onChange={(e) => onFilterChange(name, e.target.value)}
+              className="px-3 py-2 rounded-lg border border-gray-200 bg-white text-sm"
+            >
+              <option value="">{label}: any</option>
+              {options.map((value) => {
+                const count = data.facets?.[name]?.[value];
+                return (
+                  <option key={value} value={value}>
+                    {optionLabel(value)}{count !== undefined ? ` (${count})` : ''}
+                  </option>
+                );
+              })}
+            </select>
+          ))}
+        </div>
       </div>
 
+      {!loading && data.fuzzy && (
+        <p className="text-gray-500 text-sm mb-3">Few exact matches; also showing jobs with similar titles or skills.</p>
+      )}
       <div className="space-y-3">
         {loading ? (
           <div className="text-gray-500">Loading...</div>
@@ -99,7 +170,10 @@ const Jobs = ({ fetcher = defaultFetcher }) => {
             >
               <div className="flex items-center justify-between">
                 <div>
-                  <h3 className="text-lg font-semibold">{job.title}</h3>
+                  <h3 className="text-lg font-semibold">
+                    {job.title}
+                    {job.saved && <span className="ml-2 text-sm text-yellow-600" title="Saved">⭐</span>}
+                  </h3>
                   <p className="text-gray-600 text-sm">{job.location} {job.work_mode ? `• ${job.work_mode}` : ''}</p>
                   {Array.isArray(job.skills) && job.skills.length > 0 && (
                     <div className="mt-2 flex flex-wrap gap-2">
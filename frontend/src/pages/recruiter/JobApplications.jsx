@@ -11,6 +11,7 @@ const JobApplications = () => {
   const [error, setError] = useState('');
   const [statusFilter, setStatusFilter] = useState('all');
   const [updatingStatus, setUpdatingStatus] = useState(null);
+  const [order, setOrder] = useState('created');
 
   const statusOptions = [
     { value: 'all', label: 'All Applications', count: 0 },
@@ -22,7 +23,7 @@ const JobApplications = () => {
 
   useEffect(() => {
     fetchJobAndApplications();
-  }, [jobId]);
+  }, [jobId, order]);
 
   const fetchJobAndApplications = async () => {
     try {
@@ -33,7 +34,7 @@ const JobApplications = () => {
       setJob(jobResponse.data);
       
       // Fetch applications for this job
-      const applicationsResponse = await api.get(`/applications/jobs/${jobId}/applications`);
+      const applicationsResponse = await api.get(`/applications/jobs/${jobId}/applications?order=${order}`);
       setApplications(applicationsResponse.data.applications || []);
       
     } catch (err) {
@@ -173,6 +174,17 @@ const JobApplications = () => {
 
       {/* Status Filter Tabs */}
       <div className="mb-6">
+        <div className="flex justify-end mb-2">
+          <select
+            aria-label="Sort applications"
+            value={order}
+            onChange={(e) => setOrder(e.target.value)}
+            className="px-3 py-2 rounded-lg border border-gray-200 bg-white text-sm"
+          >
+            <option value="created">Newest first</option>
+            <option value="score">Best match first</option>
+          </select>
+        </div>
         <div className="border-b border-gray-200">
           <nav className="-mb-px flex space-x-8">
             {statusCounts.map((option) => (
@@ -228,6 +240,11 @@ const JobApplications = () => {
                     <span className={`inline-flex items-center px-3 py-1 rounded-full text-sm font-medium ${getStatusColor(application.status)}`}>
                       {application.status}
                     </span>
+                    {application.match_score != null && (
+                      <span className="text-sm text-gray-600" title="Match with the job's skills, seniority and requirements">
+                        {Math.round(application.match_score * 100)}% match
+                      </span>
+                    )}
                   </div>
                   
                   <div className="grid grid-cols-1 md:grid-cols-2 gap-4 mb-4">
@@ -32,7 +32,7 @@ const JobDetail = () => {
       console.log('Job deletion summary:', response.data.deletion_summary);
       
       // Show success message and navigate
-      alert(`Job "${job.title}" has been permanently deleted.\n\nDeletion Summary:\n- Applications deleted: ${response.data.deletion_summary.applications_deleted}\n- Files deleted: ${response.data.deletion_summary.file_cleanup.files_deleted}\n- Folders deleted: ${response.data.deletion_summary.file_cleanup.folders_deleted}`);
+      alert(`Job "${job.title}" has been deleted.\n\nIts applications and uploaded documents are being removed in the background.`);
       
       navigate('/recruiter/my-jobs');
     } catch (e) {
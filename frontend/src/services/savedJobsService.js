@@ -4,7 +4,9 @@ export const savedJobsService = {
   getStatus: (jobId) => api.get(`/candidate/saved-jobs/status/${jobId}`),
   save: (jobId) => api.post(`/candidate/saved-jobs/${jobId}`),
   unsave: (jobId) => api.delete(`/candidate/saved-jobs/${jobId}`),
-  list: (page = 1, per_page = 20) => api.get('/candidate/saved-jobs', { params: { page, per_page } }),
+  bulkUpdate: ({ save = [], unsave = [] }) => api.post('/candidate/saved-jobs/bulk', { save, unsave }),
+  // Pass the previous response's next_cursor to continue past page 1 without OFFSET
+  list: (page = 1, per_page = 20, cursor) => api.get('/candidate/saved-jobs', { params: { page, per_page, cursor } }),
 };
 
 